@@ -3,62 +3,510 @@ Unified Test Suite Runner
 Runs all data-driven tests together
 """
 
+import argparse
+import importlib
+import json
+import socket
+import time
 import unittest
 import sys
 import os
 
+STARTED = time.perf_counter()
+
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from TestSuite.CustomerManage.SearchDataDriven import SearchDataDrivenTest
-from TestSuite.CustomerManage.SortDataDriven import SortDataDrivenTest
-from TestSuite.CustomerManage.DeleteDataDriven import DeleteDataDrivenTest
+# The parallel, distributed and stand-in runners are imported by the
+# code paths that use them, so a plain run does not pay for them
+from startup_profile import get_startup_profile
+
+get_startup_profile().record('import', time.perf_counter() - STARTED, 'CustomerManage')
+
+# Test classes as 'module:Class' paths; a test module (and selenium with
+# it) is only imported once its suite is selected
+TEST_CLASS_PATHS = [
+    'TestSuite.CustomerManage.SearchDataDriven:SearchDataDrivenTest',
+    'TestSuite.CustomerManage.SortDataDriven:SortDataDrivenTest',
+    'TestSuite.CustomerManage.DeleteDataDriven:DeleteDataDrivenTest',
+]
+
+# The same rows, run by the keyword-driven executor in one page session
+KEYWORD_TEST_CLASS_PATHS = ['TestSuite.CustomerManage.KeywordDriven:KeywordDrivenTest']
+
+TEST_DESCRIPTIONS = {
+    'SearchDataDrivenTest': 'Tests search functionality',
+    'SortDataDrivenTest': 'Tests sort functionality',
+    'DeleteDataDrivenTest': 'Tests delete functionality',
+    'KeywordDrivenTest': 'Search, sort and delete rows from step definitions',
+}
+
+
+def class_name(test_class):
+    """Name of a test class or of a 'module:Class' path"""
+    return test_class.rpartition(':')[2] if isinstance(test_class, str) else test_class.__name__
+
+
+def load_test_classes(test_classes=None):
+    """
+    Import test classes given as 'module:Class' paths
+    
+    Each module import is timed for --startup-profile.
+    
+    Args:
+        test_classes (list): Paths or already imported classes (defaults to TEST_CLASS_PATHS)
+        
+    Returns:
+        list: Test classes
+    """
+    classes = []
+    for test_class in TEST_CLASS_PATHS if test_classes is None else test_classes:
+        if isinstance(test_class, str):
+            module_name, _, name = test_class.partition(':')
+            with get_startup_profile().phase('import', module_name):
+                test_class = getattr(importlib.import_module(module_name), name)
+        classes.append(test_class)
+    return classes
+
+
+def select_suites(paths, suites):
+    """
+    Keep the entries whose name starts with one of the selected suite prefixes
+    
+    Args:
+        paths (list): Class paths or step definition files
+        suites (str): Comma-separated prefixes, e.g. 'search,sort' (empty keeps all)
+        
+    Returns:
+        list: Selected entries
+    """
+    prefixes = [prefix.strip().lower() for prefix in (suites or '').split(',') if prefix.strip()]
+    names = [os.path.basename(class_name(path)).lower() for path in paths]
+    return [path for path, name in zip(paths, names)
+            if not prefixes or any(name.startswith(prefix) for prefix in prefixes)]
 
 
-def create_test_suite():
+def __getattr__(name):
+    # TEST_CLASSES and KEYWORD_TEST_CLASSES import their modules on first use
+    if name == 'TEST_CLASSES':
+        return load_test_classes(TEST_CLASS_PATHS)
+    if name == 'KEYWORD_TEST_CLASSES':
+        return load_test_classes(KEYWORD_TEST_CLASS_PATHS)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def create_test_suite(test_classes=None):
     """Create a test suite with all data-driven tests"""
     test_suite = unittest.TestSuite()
     
     # Add all test classes
-    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(SearchDataDrivenTest))
-    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(SortDataDrivenTest))
-    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(DeleteDataDrivenTest))
+    for test_class in load_test_classes(test_classes):
+        test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(test_class))
     
     return test_suite
 
 
-def run_tests():
-    """Run all tests with detailed reporting"""
+def configure_test_classes(class_config, test_classes=None):
+    """
+    Set class attributes (e.g. site_url_base) on every test class
+    
+    Args:
+        class_config (dict): Attribute names and values
+        test_classes (list): Classes (or class paths) to configure
+    """
+    for test_class in load_test_classes(test_classes):
+        for name, value in class_config.items():
+            setattr(test_class, name, value)
+
+
+def print_summary(reporter, tests_run, errors, workers=1):
+    """
+    Print the execution summary from the reporter's row results
+    
+    Args:
+        reporter (Reporter): Reporter holding the row results
+        tests_run (int): Number of test methods run
+        errors (int): Errors outside any row (e.g. browser failed to start)
+        workers (int): Number of worker processes used
+    """
+    summary = reporter.summary()
+    print("\n" + "=" * 70)
+    print("TEST EXECUTION SUMMARY")
+    print("=" * 70)
+    if workers > 1:
+        print(f"Workers: {workers}")
+    print(f"Tests Run: {tests_run}")
+    print(f"Rows Run: {summary['total']}")
+    for suite, counts in summary['suites'].items():
+        cached = f", {counts['cached']} cached" if counts['cached'] else ""
+        print(f"  {suite}: {counts['passed']} passed, {counts['failed']} failed{cached}")
+    print(f"Successes: {summary['passed']}")
+    print(f"Failures: {summary['failed']}")
+    if summary['cached']:
+        print(f"Skipped (cached pass): {summary['cached']}")
+    print(f"Errors: {errors}")
+    print("=" * 70 + "\n")
+
+
+def run_tests_parallel(workers, reporter, class_config=None, test_classes=None):
+    """
+    Run all tests with CSV rows split across worker processes
+    
+    Args:
+        workers (int): Number of worker processes (one headless Chrome each)
+        reporter (Reporter): Reporter that collects the merged row results
+        class_config (dict): Extra class attributes to set in every worker
+        test_classes (list): Classes (or class paths) to run
+        
+    Returns:
+        bool: True if every row passed
+    """
+    print(f"\nStarting parallel execution with {workers} workers...\n")
+    
+    with get_startup_profile().phase('import', 'parallel_runner'):
+        from parallel_runner import run_parallel
+    test_classes = load_test_classes(test_classes)
+    records = run_parallel(test_classes, workers, class_config)
+    errors = merge_records(reporter, records)
+    
+    print_summary(reporter, len(test_classes), errors, workers)
+    summary = reporter.summary()
+    return summary['failed'] == 0 and errors == 0
+
+
+def merge_records(reporter, records):
+    """
+    Merge worker or node result records into the reporter and report failed rows
+    
+    Args:
+        reporter (Reporter): Reporter that collects the row results
+        records (list): Result records (see parallel_runner.RowResultCollector)
+        
+    Returns:
+        int: Number of errors outside any row
+    """
+    errors = 0
+    for record in records:
+        if record['test_case'] is None:
+            if record['outcome'] != 'passed':
+                errors += 1
+                reporter.echo(f"✗ {record['suite']} {record['test']} [ERROR] {record['message']}")
+            continue
+        if record['outcome'] == 'cached':
+            reporter.row_cached(record['suite'], record['test_case'])
+            continue
+        passed = record['outcome'] == 'passed'
+        reporter.record_row(record['suite'], record['test_case'], passed, record['message'])
+        if not passed or reporter.verbose:
+            params = ", ".join(f"{key}={value}" for key, value in record['params'].items())
+            mark = "✓" if passed else "✗"
+            reporter.echo(f"{mark} {record['suite']} row {record['test_case']} "
+                          f"[{record['outcome'].upper()}] {params}")
+            if not passed:
+                reporter.echo(f"    Error: {record['message']}")
+    return errors
+
+
+def run_tests_distributed(reporter, class_config=None, test_classes=None, host='0.0.0.0',
+                          port=0, shards=8, local_nodes=0):
+    """
+    Serve CSV-row shards to worker nodes and merge their results
+    
+    Args:
+        reporter (Reporter): Reporter that collects the merged row results
+        class_config (dict): Class attributes sent to every node
+        test_classes (list): Classes (or class paths) to run; the coordinator never imports them
+        host (str): Interface the coordinator binds
+        port (int): Port the coordinator binds (0 picks a free port)
+        shards (int): Shards each class's rows are split into
+        local_nodes (int): Node processes to start on this machine
+        
+    Returns:
+        bool: True if every row passed
+    """
+    with get_startup_profile().phase('import', 'distributed_runner'):
+        from distributed_runner import Coordinator, start_nodes
+    test_classes = TEST_CLASS_PATHS if test_classes is None else test_classes
+    coordinator = Coordinator(test_classes, shard_count=shards, class_config=class_config,
+                              host=host, port=port).start()
+    if host in ('127.0.0.1', 'localhost'):
+        print(f"\nCoordinator serving {len(coordinator.units)} shards at {coordinator.url}")
+    else:
+        url = f"http://{socket.getfqdn() if host in ('0.0.0.0', '') else host}:{coordinator.server_address[1]}"
+        print(f"\nCoordinator serving {len(coordinator.units)} shards at {url}")
+        print(f"Start nodes with: python CustomerManage.py --worker {url} --workers N")
+    nodes = start_nodes(coordinator.url, local_nodes, name=f"{socket.gethostname()}-local") if local_nodes else []
+    try:
+        records = coordinator.wait()
+    finally:
+        coordinator.stop()
+        for node in nodes:
+            node.join()
+    errors = merge_records(reporter, records)
+    
+    print(f"Coordinator: {coordinator.describe()}")
+    print_summary(reporter, len(test_classes), errors, len(coordinator.nodes))
+    summary = reporter.summary()
+    return summary['failed'] == 0 and errors == 0
+
+
+def run_tests(workers=1, class_config=None, test_classes=None, distributed=None):
+    """
+    Run all tests with detailed reporting
+    
+    Args:
+        workers (int): Number of worker processes; 1 runs in-process
+        class_config (dict): Extra class attributes for the test classes
+        test_classes (list): Classes or 'module:Class' paths to run (defaults to TEST_CLASS_PATHS)
+        distributed (dict): Coordinator options (see run_tests_distributed); None runs locally
+        
+    Returns:
+        bool: True if all tests passed
+    """
+    class_config = class_config or {}
     print("\n" + "=" * 70)
     print("DATA-DRIVEN TEST SUITE RUNNER")
     print("=" * 70)
+    test_classes = TEST_CLASS_PATHS if test_classes is None else test_classes
     print("\nAvailable Tests:")
-    print("  1. SearchDataDrivenTest - Tests search functionality")
-    print("  2. SortDataDrivenTest   - Tests sort functionality")
-    print("  3. DeleteDataDrivenTest - Tests delete functionality")
+    for number, test_class in enumerate(test_classes, 1):
+        name = class_name(test_class)
+        print(f"  {number}. {name:<20} - {TEST_DESCRIPTIONS.get(name, '')}")
     print("\n" + "=" * 70)
+    
+    from reporter import get_reporter
+    reporter = get_reporter(report_dir=class_config.get('report_dir'),
+                            verbose=class_config.get('verbose_console', False))
+    
+    if distributed is not None:
+        return run_tests_distributed(reporter, class_config, test_classes, **distributed)
+    if workers > 1:
+        return run_tests_parallel(workers, reporter, class_config, test_classes)
+    
+    test_classes = load_test_classes(test_classes)
+    configure_test_classes(class_config, test_classes)
+    
     print("\nStarting test execution...\n")
     
     # Create test suite
-    suite = create_test_suite()
+    suite = create_test_suite(test_classes)
     
     # Run tests with verbosity
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
     
-    # Print summary
-    print("\n" + "=" * 70)
-    print("TEST EXECUTION SUMMARY")
-    print("=" * 70)
-    print(f"Tests Run: {result.testsRun}")
-    print(f"Successes: {result.testsRun - len(result.failures) - len(result.errors)}")
-    print(f"Failures: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    print("=" * 70 + "\n")
+    # Print summary from the reporter's row results
+    print_summary(reporter, result.testsRun, len(result.errors))
+    
+    return result.wasSuccessful() and reporter.summary()['failed'] == 0
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Run the CustomerManage data-driven test suites")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Split CSV rows across N worker processes, each with its own headless Chrome")
+    parser.add_argument("--site-url",
+                        help="Rewrite every CSV siteUrl to this origin (e.g. http://127.0.0.1:8765)")
+    parser.add_argument("--local-app", action="store_true",
+                        help="Start the bundled offline Banking Project stand-in and run against it")
+    parser.add_argument("--local-rows", type=int, default=5,
+                        help="Number of customers served by --local-app")
+    parser.add_argument("--local-seed", type=int, default=0,
+                        help="Seed for customers generated by --local-app")
+    parser.add_argument("--local-latency", type=float, default=0.0,
+                        help="Milliseconds of latency added to every --local-app response")
+    parser.add_argument("--trace", metavar="DIR",
+                        help="Write per-command Chrome trace JSON and per-step latency summaries to DIR")
+    parser.add_argument("--report-dir", metavar="DIR",
+                        help="Write step events as JSON Lines and row results as JUnit XML to DIR")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Print every test step instead of a compact progress line")
+    parser.add_argument("--driver", choices=["selenium", "cdp"], default="selenium",
+                        help="Driver backend: chromedriver (selenium) or DevTools websocket with asyncio (cdp)")
+    parser.add_argument("--grid", metavar="URL",
+                        help="Start browsers on a Selenium Grid (or other remote WebDriver) endpoint, "
+                             "e.g. http://grid:4444")
+    parser.add_argument("--lean", action="store_true",
+                        help="Headless Chrome with images disabled and ads, trackers and heavy assets blocked")
+    parser.add_argument("--page-weight", metavar="FILE",
+                        help="Full runs record per-page requests and bytes to FILE; "
+                             "--lean runs report the savings against it")
+    parser.add_argument("--browser-cache", metavar="DIR",
+                        help="Seed every browser from a shared profile/cache directory (copied on start)")
+    parser.add_argument("--browser-cache-size", type=float, default=500, metavar="MB",
+                        help="Size cap for --browser-cache; oldest cache files are evicted beyond it")
+    parser.add_argument("--browser-cache-readonly", action="store_true",
+                        help="Use --browser-cache as a pre-warmed template and never write back to it")
+    parser.add_argument("--timeout-history", metavar="FILE",
+                        help="Per-step wait latency history used to learn timeouts "
+                             "(default .timeout_history.json)")
+    parser.add_argument("--fixed-timeouts", action="store_true",
+                        help="Use a fixed 10s deadline for every wait instead of learned ones")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Skip rows whose last passing result is still valid; run changed and failed rows")
+    parser.add_argument("--app-version", default=os.environ.get("APP_VERSION", ""),
+                        help="Fingerprint of the app under test; a new value invalidates --incremental results "
+                             "(default $APP_VERSION)")
+    parser.add_argument("--fast-path", action="store_true",
+                        help="Run each supported row as one injected script, falling back to "
+                             "step-by-step when a step needs real user input")
+    parser.add_argument("--keyword-driven", action="store_true",
+                        help="Run every CSV through its step definition in one planned page session "
+                             "(read-only rows before deletes)")
+    parser.add_argument("--isolate-fixtures", action="store_true",
+                        help="Restore the app's customer store (localStorage) before every Delete row, "
+                             "so rows are independent and can share a session with Search and Sort")
+    parser.add_argument("--health-every", type=int, default=25, metavar="N",
+                        help="Sample browser memory and command latency every N rows and recycle the "
+                             "browser past the limits (0 disables)")
+    parser.add_argument("--recycle-heap-mb", type=float, default=512, metavar="MB",
+                        help="Recycle a browser whose JS heap grows past MB")
+    parser.add_argument("--artifacts", metavar="DIR",
+                        help="Save a screenshot, page source and console log of every failed row "
+                             "under DIR (written in the background)")
+    parser.add_argument("--artifacts-size", type=int, default=200, metavar="MB",
+                        help="Size cap for --artifacts; the oldest rows are evicted beyond it")
+    parser.add_argument("--suites", default="",
+                        help="Comma-separated suite name prefixes to run (e.g. search,sort); "
+                             "only their test modules are imported")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Print how long imports, driver resolution and browser launches took")
+    parser.add_argument("--no-driver-cache", action="store_true",
+                        help="Run Selenium Manager's driver and browser discovery on every launch "
+                             "instead of using the cached paths")
+    parser.add_argument("--coordinator", metavar="[HOST:]PORT",
+                        help="Serve CSV-row shards to worker nodes on other machines and merge their results")
+    parser.add_argument("--local-nodes", type=int, default=0, metavar="N",
+                        help="Start N worker node processes on this machine (implies --coordinator "
+                             "on a free local port)")
+    parser.add_argument("--shards", type=int, default=8, metavar="N",
+                        help="Shards each suite's rows are split into for --coordinator (default 8)")
+    parser.add_argument("--worker", metavar="URL",
+                        help="Run as a worker node of the coordinator at URL (with --workers node processes); "
+                             "every other option comes from the coordinator")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.grid and args.driver == "cdp":
+        parser.error("--grid and --driver cdp cannot be combined")
+    if args.worker and (args.coordinator or args.local_nodes):
+        parser.error("--worker cannot be combined with --coordinator or --local-nodes")
+    if args.local_nodes < 0 or args.shards < 1:
+        parser.error("--local-nodes must be at least 0 and --shards at least 1")
+    if args.coordinator:
+        host, _, port = args.coordinator.rpartition(':')
+        if not port.isdigit():
+            parser.error("--coordinator expects [HOST:]PORT")
+        args.coordinator = (host or '0.0.0.0', int(port))
+    elif args.local_nodes:
+        args.coordinator = ('127.0.0.1', 0)
+    if args.local_app and args.site_url:
+        parser.error("--local-app and --site-url cannot be combined")
+    return args
+
+
+def main(argv=None):
+    """Command line entry point"""
+    args = parse_args(argv)
+    class_config = {}
+    server = None
+    
+    if args.worker:
+        print(f"✓ Running {args.workers} node process(es) for the coordinator at {args.worker}")
+        from distributed_runner import run_nodes
+        return run_nodes(args.worker, args.workers)
+    
+    if args.local_app:
+        with get_startup_profile().phase('import', 'local_server'):
+            from local_server import LocalBankingServer
+        server = LocalBankingServer(rows=args.local_rows, seed=args.local_seed,
+                                    latency=args.local_latency / 1000.0).start()
+        print(f"✓ Local Banking Project stand-in running at {server.base_url}")
+        class_config['site_url_base'] = server.base_url
+    elif args.site_url:
+        class_config['site_url_base'] = args.site_url
+    if args.trace:
+        class_config['trace_dir'] = os.path.abspath(args.trace)
+    if args.report_dir:
+        class_config['report_dir'] = os.path.abspath(args.report_dir)
+    class_config['verbose_console'] = args.verbose
+    class_config['driver_backend'] = args.driver
+    if args.grid:
+        class_config['driver_backend'] = 'grid'
+        class_config['grid_url'] = args.grid
+    if args.lean:
+        class_config['lean_mode'] = True
+    if args.page_weight:
+        class_config['page_weight_file'] = os.path.abspath(args.page_weight)
+    if args.browser_cache:
+        class_config['browser_cache_dir'] = os.path.abspath(args.browser_cache)
+        class_config['browser_cache_max_mb'] = args.browser_cache_size
+        class_config['browser_cache_write_back'] = not args.browser_cache_readonly
+    if args.timeout_history:
+        class_config['timeout_history_file'] = os.path.abspath(args.timeout_history)
+    if args.fixed_timeouts:
+        class_config['adaptive_timeouts'] = False
+    if args.incremental:
+        class_config['incremental'] = True
+        class_config['app_version'] = args.app_version
+        if server and not args.app_version:
+            # The stand-in's page and fixture data are its version
+            class_config['app_version'] = server.fingerprint
+        elif args.site_url and not args.app_version:
+            # Rows are keyed before the siteUrl rewrite; keep targets apart
+            class_config['app_version'] = args.site_url
+    if args.fast_path:
+        class_config['fast_path'] = True
+    if args.no_driver_cache:
+        class_config['driver_cache_file'] = None
+    class_config['health_check_every'] = args.health_every
+    class_config['recycle_heap_mb'] = args.recycle_heap_mb
+    if args.artifacts:
+        class_config['artifact_dir'] = os.path.abspath(args.artifacts)
+        class_config['artifact_max_mb'] = args.artifacts_size
+    if args.isolate_fixtures:
+        class_config['isolate_fixture_state'] = True
+        if server:
+            # Seed from the stand-in's fixture rather than the first store seen
+            from fixture_state import FixtureState
+            class_config['fixture_seed'] = FixtureState.seed_from_fixture(json.loads(server.fixture_json))
     
-    return result.wasSuccessful()
+    try:
+        if args.keyword_driven:
+            test_classes = KEYWORD_TEST_CLASS_PATHS
+            if args.suites:
+                # Keyword mode runs one class; the suites are its step definitions
+                definitions = load_test_classes(test_classes)[0].STEP_DEFINITIONS
+                class_config['STEP_DEFINITIONS'] = select_suites(definitions, args.suites)
+                if not class_config['STEP_DEFINITIONS']:
+                    print(f"✗ No step definitions match --suites {args.suites}")
+                    return False
+        else:
+            test_classes = select_suites(TEST_CLASS_PATHS, args.suites)
+            if not test_classes:
+                print(f"✗ No test suites match --suites {args.suites}")
+                return False
+        distributed = None
+        if args.coordinator:
+            host, port = args.coordinator
+            distributed = {'host': host, 'port': port, 'shards': args.shards,
+                           'local_nodes': args.local_nodes}
+        return run_tests(workers=args.workers, class_config=class_config, test_classes=test_classes,
+                         distributed=distributed)
+    finally:
+        from reporter import close_reporter
+        close_reporter()
+        if args.startup_profile:
+            print(get_startup_profile().format())
+            if args.workers > 1 or args.coordinator:
+                print("  (browsers were launched by worker processes and are not included)")
+        if args.report_dir:
+            print(f"✓ Reports written to {class_config['report_dir']}")
+        if server:
+            server.stop()
 
 
 if __name__ == "__main__":
-    success = run_tests()
+    success = main()
     sys.exit(0 if success else 1)
@@ -0,0 +1,28 @@
+import unittest
+from base_test import BaseDataDrivenTest
+from keyword_executor import KeywordExecutor, StepDefinition
+
+class KeywordDrivenTest(BaseDataDrivenTest):
+    """Search, sort and delete rows run from step definitions in one page session"""
+    
+    # Read-only definitions run first regardless of their order here
+    STEP_DEFINITIONS = [
+        'TestFile/CustomerManage/SearchDataDriven.steps.json',
+        'TestFile/CustomerManage/SortDataDriven.steps.json',
+        'TestFile/CustomerManage/DeleteDataDriven.steps.json',
+    ]
+    
+    # Cached row results are invalidated when a definition or keyword changes
+    CACHE_SOURCES = STEP_DEFINITIONS + ['keyword_executor.py']
+    
+    def test_keyword_driven_rows(self):
+        """Test every CSV row through its step definition, in planned order"""
+        definitions = [StepDefinition.load(path) for path in self.STEP_DEFINITIONS]
+        KeywordExecutor(self).run(definitions)
+
+
+if __name__ == "__main__":
+    print("\n" + "="*60)
+    print("Starting Keyword-Driven Test Suite")
+    print("="*60 + "\n")
+    unittest.main(verbosity=2)
@@ -1,93 +1,110 @@
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import unittest
-from time import sleep
-from base_test import BaseDataDrivenTest
+from base_test import BaseDataDrivenTest, RowProgram
 
 class SearchDataDrivenTest(BaseDataDrivenTest):
     """Data-driven test class for search functionality"""
     
+    # Required CSV columns and their types
+    CSV_SCHEMA = {'siteUrl': str, 'searchInput': str, 'searchText': str}
+    
     def test_search_with_csv_data(self):
         """Test search functionality with multiple search terms from CSV"""
-        test_data = self.read_csv_data('TestFile/CustomerManage/SearchDataDriven.csv')
-        
-        for index, data in enumerate(test_data, start=1):
+        for index, data in self.iter_csv_rows('TestFile/CustomerManage/SearchDataDriven.csv', schema=self.CSV_SCHEMA):
             # Parse the search input locator
             search_by_type, search_value = self.parse_locator(data['searchInput'])
             
             with self.subTest(test_case=index, search_text=data['searchText']):
                 try:
                     self.print_test_header(index)
-                    print(f"Site URL: {data['siteUrl']}")
-                    print(f"Search Text: '{data['searchText']}'")
-                    print(f"Search Input Locator: {search_by_type} = {search_value}")
-                    
-                    # Navigate to the banking project
-                    self.driver.get(data['siteUrl'])
-                    
-                    # Wait for page to load and table to be present
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.TAG_NAME, 'table'))
-                    )
-                    print(f"✓ Page loaded successfully")
-                    
-                    # Get initial row count
-                    initial_rows = self.get_table_rows_count()
-                    print(f"✓ Initial table rows: {initial_rows}")
-                    
-                    # Wait for search input to be present and visible
-                    search_field = WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((search_by_type, search_value))
-                    )
-                    print(f"✓ Search field found")
+                    self.log(f"Site URL: {data['siteUrl']}")
+                    self.log(f"Search Text: '{data['searchText']}'")
+                    self.log(f"Search Input Locator: {search_by_type} = {search_value}")
                     
-                    # Clear any previous search text
-                    search_field.clear()
-                    sleep(0.5)
-                    print(f"✓ Search field cleared")
-                    
-                    # Enter search text
-                    search_field.send_keys(data['searchText'])
-                    print(f"✓ Entered search text: '{data['searchText']}'")
+                    # Navigate to the banking project, reusing the page loaded
+                    # for the previous row when its state can be reset
+                    if self.open_page(data['siteUrl']):
+                        self.log(f"✓ Reused loaded page (state reset without reload)")
+                    else:
+                        self.log(f"✓ Page loaded successfully")
                     
-                    # Wait a moment for the search to filter results
-                    sleep(1.5)
+                    # Fast path: the whole row in one injected program; None
+                    # means it must be replayed step by step below
+                    observations = self.run_row_program(
+                        RowProgram()
+                        .snapshot('initial')
+                        .clear(data['searchInput']).wait_stable()
+                        .type(data['searchInput'], data['searchText']).wait_stable()
+                        .snapshot('filtered')
+                        .clear(data['searchInput']).wait_stable()
+                        .snapshot('final')) if self.fast_path else None
                     
-                    # Get filtered row count
-                    filtered_rows = self.get_table_rows_count()
-                    print(f"✓ Filtered table rows: {filtered_rows}")
+                    if observations is not None:
+                        oracle = self.table_oracle(observations['initial']) if self.verify_with_oracle else None
+                        initial_rows = observations['initial'].row_count if observations['initial'] else 0
+                        self.log(f"✓ Initial table rows: {initial_rows}")
+                        self.log(f"✓ Entered search text: '{data['searchText']}'")
+                        snapshot = observations['filtered']
+                    else:
+                        # Get initial row count (the oracle models the table once per page load)
+                        oracle = self.table_oracle() if self.verify_with_oracle else None
+                        initial_rows = oracle.row_count if oracle else self.get_table_rows_count()
+                        self.log(f"✓ Initial table rows: {initial_rows}")
+                        
+                        # Wait for search input to be present and visible
+                        search_field = self.wait_for_element(data['searchInput'])
+                        self.log(f"✓ Search field found")
+                        
+                        # Clear any previous search text
+                        search_field.clear()
+                        self.wait_for_ui_stable()
+                        self.log(f"✓ Search field cleared")
+                        
+                        # Enter search text
+                        search_field.send_keys(data['searchText'])
+                        self.log(f"✓ Entered search text: '{data['searchText']}'")
+                        
+                        # Wait for the search to filter results
+                        self.wait_for_ui_stable()
+                        
+                        # Snapshot the filtered table in one round-trip
+                        snapshot = self.snapshot_table()
                     
                     # Verify table is still present after search
-                    results_table = self.driver.find_element(By.TAG_NAME, 'table')
-                    self.assertIsNotNone(results_table, "Results table not found after search")
-                    print(f"✓ Table still present after search")
+                    self.assertIsNotNone(snapshot, "Results table not found after search")
+                    self.log(f"✓ Table still present after search")
+                    
+                    filtered_rows = snapshot.row_count
+                    self.log(f"✓ Filtered table rows: {filtered_rows}")
                     
                     # Verify that search actually filtered the results
                     # (unless the search text doesn't match any records, in which case filtered_rows could be 0)
                     if filtered_rows > 0:
-                        print(f"✓ Search returned {filtered_rows} result(s)")
+                        self.log(f"✓ Search returned {filtered_rows} result(s)")
                         
                         # Optional: Verify that search text appears in the results
-                        try:
-                            table_text = results_table.text.lower()
-                            search_text_lower = data['searchText'].lower()
-                            if search_text_lower in table_text:
-                                print(f"✓ Search text '{data['searchText']}' found in results")
-                            else:
-                                print(f"⚠ Search text '{data['searchText']}' not visible in results, but table is present")
-                        except Exception as e:
-                            print(f"⚠ Could not verify search text in results: {str(e)}")
+                        if snapshot.contains(data['searchText']):
+                            self.log(f"✓ Search text '{data['searchText']}' found in results")
+                        else:
+                            self.log(f"⚠ Search text '{data['searchText']}' not visible in results, but table is present")
                     else:
-                        print(f"⚠ Search returned 0 results - no matches found for '{data['searchText']}'")
+                        self.log(f"⚠ Search returned 0 results - no matches found for '{data['searchText']}'")
                     
-                    # Clear search field after test (optional cleanup)
-                    search_field.clear()
-                    sleep(0.5)
+                    # Verify the filtered rows are exactly the ones the oracle predicts
+                    if oracle:
+                        check = oracle.verify_search(data['searchText'], snapshot)
+                        self.assertTrue(check['ok'], f"Search for '{data['searchText']}': {check['message']}")
+                        self.log(f"✓ Results match the oracle: {check['message']}")
                     
-                    # Verify table is restored after clearing search
-                    final_rows = self.get_table_rows_count()
-                    print(f"✓ Rows after clearing search: {final_rows}")
+                    # Clear search field after test (optional cleanup)
+                    if observations is not None:
+                        final_rows = observations['final'].row_count if observations['final'] else 0
+                    else:
+                        search_field.clear()
+                        self.wait_for_ui_stable()
+                        
+                        # Verify table is restored after clearing search
+                        final_rows = self.get_table_rows_count()
+                    self.log(f"✓ Rows after clearing search: {final_rows}")
                     
                     self.print_test_result(index, passed=True, 
                                          message=f"Search for '{data['searchText']}' executed successfully")
@@ -1,78 +1,86 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import unittest
-from time import sleep
 from base_test import BaseDataDrivenTest
 
 class SortDataDrivenTest(BaseDataDrivenTest):
     """Data-driven test class for sort functionality"""
     
+    # Required CSV columns and their types
+    CSV_SCHEMA = {'siteUrl': str, 'sortLabel': str, 'customerButton': str}
+    
     def test_sort_with_csv_data(self):
         """Test sort functionality with multiple sort options from CSV"""
-        test_data = self.read_csv_data('TestFile/CustomerManage/SortDataDriven.csv')
-        
-        for index, data in enumerate(test_data, start=1):
+        for index, data in self.iter_csv_rows('TestFile/CustomerManage/SortDataDriven.csv', schema=self.CSV_SCHEMA):
             # Parse the sort label locator
             sort_by_type, sort_value = self.parse_locator(data['sortLabel'])
             
             with self.subTest(test_case=index, sort_label=sort_value):
                 try:
                     self.print_test_header(index)
-                    print(f"Site URL: {data['siteUrl']}")
-                    print(f"Sort By: {sort_value}")
-                    print(f"Sort Locator Type: {sort_by_type}")
-                    
-                    # Navigate to the banking project
-                    self.driver.get(data['siteUrl'])
+                    self.log(f"Site URL: {data['siteUrl']}")
+                    self.log(f"Sort By: {sort_value}")
+                    self.log(f"Sort Locator Type: {sort_by_type}")
                     
-                    # Wait for page to load
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.TAG_NAME, 'table'))
-                    )
-                    print(f"✓ Page loaded successfully")
+                    # Navigate to the banking project, reusing the page loaded
+                    # for the previous row when its state can be reset
+                    if self.open_page(data['siteUrl']):
+                        self.log(f"✓ Reused loaded page (state reset without reload)")
+                    else:
+                        self.log(f"✓ Page loaded successfully")
                     
-                    # Get table data before sorting (optional - for verification)
+                    # Get table data before sorting (the oracle models it once per page load)
+                    oracle = None
                     try:
-                        table_before = self.driver.find_element(By.TAG_NAME, 'table')
-                        rows_before = len(table_before.find_elements(By.TAG_NAME, 'tr'))
-                        print(f"✓ Table found with {rows_before} rows (including header)")
+                        if self.verify_with_oracle:
+                            oracle = self.table_oracle()
+                            rows_before = oracle.row_count
+                        else:
+                            rows_before = self.snapshot_table().row_count
+                        self.log(f"✓ Table found with {rows_before} rows (excluding header)")
                     except Exception as e:
-                        print(f"⚠ Warning: Could not count table rows: {str(e)}")
+                        self.log(f"⚠ Warning: Could not count table rows: {str(e)}")
                     
                     # Click on the sort link/button
                     try:
-                        sort_element = WebDriverWait(self.driver, 10).until(
-                            EC.element_to_be_clickable((sort_by_type, sort_value))
-                        )
+                        sort_element = self.wait_for_element(data['sortLabel'], clickable=True)
                         sort_element.click()
-                        print(f"✓ Clicked sort element: '{sort_value}'")
-                        sleep(1)  # Wait for sort animation/processing
+                        self.log(f"✓ Clicked sort element: '{sort_value}'")
+                        self.wait_for_ui_stable()  # Wait for sort to re-render the table
                     except Exception as e:
-                        print(f"✗ Failed to click sort element: {str(e)}")
+                        self.log(f"✗ Failed to click sort element: {str(e)}")
                         self.fail(f"Sort element not found or not clickable: {sort_value}")
                     
                     # Verify table is still present after sorting
                     try:
-                        results_table = WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_element_located((By.TAG_NAME, 'table'))
-                        )
+                        results_table = self.wait_for_element('css=table')
                         self.assertIsNotNone(results_table, "Results table not found after sort")
-                        print(f"✓ Table still present after sorting")
+                        self.log(f"✓ Table still present after sorting")
                     except Exception as e:
-                        print(f"✗ Table verification failed: {str(e)}")
+                        self.log(f"✗ Table verification failed: {str(e)}")
                         self.fail("Results table disappeared after sorting")
                     
+                    # Check the sorted column's order from a single snapshot
+                    if sort_by_type == By.LINK_TEXT:
+                        snapshot_after = self.snapshot_table()
+                        if oracle and snapshot_after:
+                            # Same rows as before, in the oracle's order for this column
+                            check = oracle.verify_sort(sort_value, snapshot_after)
+                            self.assertTrue(check['ok'], f"Sort by '{sort_value}': {check['message']}")
+                            self.log(f"✓ Sort matches the oracle: {check['message']}")
+                        else:
+                            order = snapshot_after.sort_order(sort_value) if snapshot_after else None
+                            if order:
+                                self.log(f"✓ Column '{sort_value}' is sorted {order}")
+                            else:
+                                self.log(f"⚠ Column '{sort_value}' does not appear to be sorted")
+                    
                     # Verify customer button exists using parsed locator
                     try:
-                        button_by_type, button_value = self.parse_locator(data['customerButton'])
-                        customer_button = WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_element_located((button_by_type, button_value))
-                        )
+                        customer_button = self.wait_for_element(data['customerButton'])
                         self.assertIsNotNone(customer_button, "Customer button not found")
-                        print(f"✓ Customer button verified")
+                        self.log(f"✓ Customer button verified")
                     except Exception as e:
-                        print(f"⚠ Customer button verification failed: {str(e)}")
+                        self.log(f"⚠ Customer button verification failed: {str(e)}")
                     
                     self.print_test_result(index, passed=True, 
                                          message=f"Successfully sorted by: '{sort_value}'")
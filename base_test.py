@@ -6,14 +6,51 @@ Provides reusable components for Banking Project automation tests
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from contextlib import contextmanager
+from functools import lru_cache
 import unittest
+import copy
 import csv
+import json
 import os
+import re
+import sys
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+# Optional features (browser cache, CDP backend, driver cache, failure
+# artifacts, health checks, lean profile) import their modules on first use
+from fixture_state import STORE_KEYS, FixtureState
+from instrumentation import CommandTracer, browser_memory, instrument_driver
+from reporter import get_reporter
+from result_cache import get_result_cache
+from session_pool import get_shared_pool
+from startup_profile import get_startup_profile
+from table_oracle import TableOracle
+from timeouts import get_timeout_manager
 
 
 class LocatorParser:
     """Utility class for parsing locator strings"""
     
+    # Map Katalon/Selenium IDE locator types to Selenium By types
+    LOCATOR_MAP = {
+        'id': By.ID,
+        'name': By.NAME,
+        'xpath': By.XPATH,
+        'link': By.LINK_TEXT,
+        'linktext': By.LINK_TEXT,
+        'partiallinktext': By.PARTIAL_LINK_TEXT,
+        'css': By.CSS_SELECTOR,
+        'cssselector': By.CSS_SELECTOR,
+        'classname': By.CLASS_NAME,
+        'tagname': By.TAG_NAME
+    }
+    
     @staticmethod
     def parse(locator_string):
         """
@@ -44,30 +81,253 @@ class LocatorParser:
                (locator_value.startswith("'") and locator_value.endswith("'")):
                 locator_value = locator_value[1:-1]
             
-            # Map Katalon/Selenium IDE locator types to Selenium By types
-            locator_map = {
-                'id': By.ID,
-                'name': By.NAME,
-                'xpath': By.XPATH,
-                'link': By.LINK_TEXT,
-                'linktext': By.LINK_TEXT,
-                'partiallinktext': By.PARTIAL_LINK_TEXT,
-                'css': By.CSS_SELECTOR,
-                'cssselector': By.CSS_SELECTOR,
-                'classname': By.CLASS_NAME,
-                'tagname': By.TAG_NAME
-            }
-            
-            by_type = locator_map.get(locator_type, By.XPATH)
+            by_type = LocatorParser.LOCATOR_MAP.get(locator_type, By.XPATH)
             return by_type, locator_value
         else:
             # If no prefix, treat as XPath
             return By.XPATH, locator_string
 
 
+class CompiledLocator:
+    """A parsed locator plus the fastest equivalent way to look it up"""
+    
+    def __init__(self, by, value, css=None, script=None, script_args=()):
+        """
+        Args:
+            by (str): Original Selenium By type
+            value (str): Original locator value
+            css (str): Equivalent CSS selector, if the locator could be rewritten
+            script (str): JavaScript lookup returning the element or null
+            script_args (tuple): Arguments passed to the script
+        """
+        self.by = by
+        self.value = value
+        self.css = css
+        self.script = script
+        self.script_args = script_args
+    
+    @property
+    def parsed(self):
+        """Original (By type, value) tuple, as returned by LocatorParser"""
+        return self.by, self.value
+    
+    @property
+    def locator(self):
+        """(By type, value) tuple to hand to Selenium, using CSS when possible"""
+        if self.css is not None:
+            return By.CSS_SELECTOR, self.css
+        return self.by, self.value
+    
+    def find(self, driver):
+        """
+        Find the element, taking the fast path when one was compiled
+        
+        Only lookups whose strategy was actually rewritten (XPath to CSS, or
+        a scripted lookup) count as fast. Script lookups only trust a
+        positive match; when the script finds nothing the original locator
+        is checked, so a miss never changes the outcome. For XPath that
+        check runs inside the same script call.
+        
+        Args:
+            driver (WebDriver): Browser to search
+            
+        Returns:
+            WebElement: Matching element
+            
+        Raises:
+            NoSuchElementException: If no element matches
+        """
+        stats = LocatorCompiler.stats
+        stats['lookups'] += 1
+        if self.script is not None:
+            element = driver.execute_script(self.script, *self.script_args)
+            if element is not None:
+                stats['fast'] += 1
+                return element
+            stats['fallback'] += 1
+            if self.by == By.XPATH:
+                raise NoSuchElementException(f"No element matches {self.by}={self.value}")
+            return driver.find_element(self.by, self.value)
+        if self.css is not None:
+            stats['fast'] += 1
+        return driver.find_element(*self.locator)
+    
+    def condition(self, clickable=False):
+        """
+        Build a WebDriverWait condition for this locator
+        
+        Args:
+            clickable (bool): Also require the element to be displayed and enabled
+            
+        Returns:
+            callable: Condition returning the element, or False to keep waiting
+        """
+        def _condition(driver):
+            try:
+                element = self.find(driver)
+            except (NoSuchElementException, StaleElementReferenceException):
+                return False
+            if clickable and not (element.is_displayed() and element.is_enabled()):
+                return False
+            return element
+        return _condition
+
+
+class LocatorCompiler:
+    """Utility class that compiles and memoizes locator strings"""
+    
+    CACHE_SIZE = 256
+    
+    # Lookup counters across all compiled locators
+    stats = {'lookups': 0, 'fast': 0, 'fallback': 0}
+    
+    # //tag, //tag[@attr='value'][@other] ... (no axes, functions or positions)
+    SIMPLE_XPATH = re.compile(r"""^//(\*|[A-Za-z][\w-]*)((?:\[@[A-Za-z_][\w-]*(?:=(?:'[^']*'|"[^"]*"))?\])*)$""")
+    XPATH_PREDICATE = re.compile(r"""\[@([A-Za-z_][\w-]*)(=(?:'([^']*)'|"([^"]*)"))?\]""")
+    
+    # Katalon recorder pattern:
+    # (.//*[normalize-space(text()) and normalize-space(.)='X'])[1]/following::button[1]
+    TEXT_XPATH = re.compile(
+        r"""^\(\.//\*\[normalize-space\(text\(\)\) and normalize-space\(\.\)=(?:'([^']*)'|"([^"]*)")\]\)\[1\]"""
+        r"""(?:/following::([A-Za-z][\w-]*)\[1\])?$""")
+    
+    # Same semantics as TEXT_XPATH, but skips computing the string value of
+    # every container element whose first text node is only whitespace
+    TEXT_LOOKUP_SCRIPT = """
+        var text = arguments[0], tag = arguments[1];
+        var norm = function (value) {
+            return value.replace(/[ \\t\\r\\n]+/g, ' ').replace(/^ | $/g, '');
+        };
+        var firstText = function (element) {
+            for (var node = element.firstChild; node; node = node.nextSibling) {
+                if (node.nodeType === 3 || node.nodeType === 4) { return node.nodeValue; }
+            }
+            return '';
+        };
+        var walker = document.createTreeWalker(document.documentElement, NodeFilter.SHOW_ELEMENT);
+        var match = null;
+        for (var element = walker.currentNode; element; element = walker.nextNode()) {
+            if (norm(firstText(element)) && norm(element.textContent) === text) {
+                match = element;
+                break;
+            }
+        }
+        var found = match && !tag ? match : null;
+        if (match && tag) {
+            var candidates = document.getElementsByTagName(tag);
+            for (var i = 0; i < candidates.length && !found; i++) {
+                var position = match.compareDocumentPosition(candidates[i]);
+                if ((position & Node.DOCUMENT_POSITION_FOLLOWING) &&
+                    !(position & Node.DOCUMENT_POSITION_CONTAINED_BY)) {
+                    found = candidates[i];
+                }
+            }
+        }
+        if (found) { return found; }
+        // Confirm a miss with the original XPath in the same round trip
+        return document.evaluate(arguments[2], document, null,
+                                 XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    """
+    
+    # Visible links only, like Selenium's link text lookup
+    LINK_TEXT_SCRIPT = """
+        var links = document.getElementsByTagName('a');
+        for (var i = 0; i < links.length; i++) {
+            if (links[i].getClientRects().length && links[i].innerText.trim() === arguments[0]) {
+                return links[i];
+            }
+        }
+        return null;
+    """
+    
+    @staticmethod
+    @lru_cache(maxsize=CACHE_SIZE)
+    def compile(locator_string):
+        """
+        Parse a locator string and rewrite it to a faster equivalent where safe
+        
+        Args:
+            locator_string (str): Locator in format 'type=value'
+            
+        Returns:
+            CompiledLocator: Compiled locator (cached per string)
+        """
+        by, value = LocatorParser.parse(locator_string)
+        
+        # id= and name= are left alone: Selenium already sends them as CSS
+        if by == By.LINK_TEXT:
+            return CompiledLocator(by, value, script=LocatorCompiler.LINK_TEXT_SCRIPT,
+                                   script_args=(value,))
+        if by == By.XPATH:
+            css = LocatorCompiler.xpath_to_css(value)
+            if css is not None:
+                return CompiledLocator(by, value, css=css)
+            match = LocatorCompiler.TEXT_XPATH.match(value)
+            if match:
+                text = match.group(1) if match.group(1) is not None else match.group(2)
+                return CompiledLocator(by, value, script=LocatorCompiler.TEXT_LOOKUP_SCRIPT,
+                                       script_args=(text, match.group(3), value))
+        return CompiledLocator(by, value)
+    
+    @staticmethod
+    def xpath_to_css(xpath):
+        """
+        Rewrite a simple descendant XPath into a CSS selector
+        
+        Args:
+            xpath (str): XPath such as //input[@type='text']
+            
+        Returns:
+            str: Equivalent CSS selector, or None if the XPath is not simple
+        """
+        match = LocatorCompiler.SIMPLE_XPATH.match(xpath)
+        if not match:
+            return None
+        tag, predicates = match.groups()
+        selector = '' if tag == '*' else tag
+        for name, comparison, single, double in LocatorCompiler.XPATH_PREDICATE.findall(predicates):
+            if comparison:
+                selector += f'[{name}="{LocatorCompiler.css_string(single or double)}"]'
+            else:
+                selector += f'[{name}]'
+        return selector or '*'
+    
+    @staticmethod
+    def css_string(value):
+        """Escape a value for use inside a double-quoted CSS string"""
+        return value.replace('\\', '\\\\').replace('"', '\\"')
+    
+    @staticmethod
+    def cache_info():
+        """Hit/miss statistics of the compiled locator cache"""
+        return LocatorCompiler.compile.cache_info()
+
+
 class CSVDataReader:
     """Utility class for reading CSV test data"""
     
+    @staticmethod
+    def resolve_path(filename, base_path=None, caller_depth=1):
+        """
+        Resolve a CSV path against a base directory or the caller's directory
+        
+        Args:
+            filename (str): Path to CSV file (relative or absolute)
+            base_path (str): Base directory path (optional)
+            caller_depth (int): How many frames up the file that names the CSV is
+            
+        Returns:
+            str: Path to the CSV file
+        """
+        if base_path:
+            return os.path.join(base_path, filename)
+        if os.path.isabs(filename):
+            return filename
+        # Use the calling script's directory as base; reading one frame is
+        # O(1), unlike inspect.stack() which builds context for every frame
+        caller_file = sys._getframe(caller_depth).f_code.co_filename
+        return os.path.join(os.path.dirname(os.path.abspath(caller_file)), filename)
+    
     @staticmethod
     def read(filename, base_path=None):
         """
@@ -83,40 +343,728 @@ class CSVDataReader:
         test_data = []
         
         # Determine the file path
-        if base_path:
-            csv_path = os.path.join(base_path, filename)
-        elif not os.path.isabs(filename):
-            # Use the calling script's directory as base
-            import inspect
-            caller_frame = inspect.stack()[1]
-            caller_file = caller_frame.filename
-            current_dir = os.path.dirname(os.path.abspath(caller_file))
-            csv_path = os.path.join(current_dir, filename)
-        else:
-            csv_path = filename
+        csv_path = CSVDataReader.resolve_path(filename, base_path, caller_depth=2)
         
+        reporter = get_reporter()
+        suite = os.path.basename(filename)
         try:
             with open(csv_path, 'r', encoding='utf-8') as file:
                 csv_reader = csv.DictReader(file)
                 for row in csv_reader:
                     test_data.append(row)
-            print(f"✓ Successfully loaded {len(test_data)} test cases from {os.path.basename(filename)}")
+            reporter.log(suite, None, f"✓ Successfully loaded {len(test_data)} test cases from {suite}")
         except FileNotFoundError:
-            print(f"✗ Error: File not found - {csv_path}")
+            reporter.notice(f"✗ Error: File not found - {csv_path}", suite)
             raise
         except Exception as e:
-            print(f"✗ Error reading CSV: {str(e)}")
+            reporter.notice(f"✗ Error reading CSV: {str(e)}", suite)
             raise
         
         return test_data
+    
+    @staticmethod
+    def stream(filename, base_path=None, schema=None, shard_index=0, shard_count=1, suite=None):
+        """
+        Lazily read the CSV rows belonging to one shard
+        
+        Rows are assigned round-robin: row i (1-based, blank lines skipped)
+        belongs to shard (i - 1) % shard_count, so every worker reads a
+        deterministic slice and builds dictionaries only for its own rows.
+        
+        Args:
+            filename (str): Path to CSV file (relative or absolute)
+            base_path (str): Base directory path (optional)
+            schema (dict): Column name -> type (str, int, float, bool or any
+                           callable); listed columns must exist, non-str columns
+                           are coerced and empty cells become None
+            shard_index (int): Shard to read
+            shard_count (int): Total number of shards
+            suite (str): Suite that rows with too few or too many cells are
+                         reported under (defaults to the CSV file name)
+            
+        Returns:
+            iterator: (row index, row dictionary) tuples
+            
+        Raises:
+            ValueError: If a schema column is missing or a value cannot be coerced
+        """
+        if not 0 <= shard_index < shard_count:
+            raise ValueError(f"shard_index {shard_index} is outside 0..{shard_count - 1}")
+        
+        # Resolve eagerly: once iteration starts, the caller's frame is gone
+        csv_path = CSVDataReader.resolve_path(filename, base_path, caller_depth=2)
+        converters = {column: CSVDataReader.COERCERS.get(column_type, column_type)
+                      for column, column_type in (schema or {}).items()}
+        return CSVDataReader._stream_rows(csv_path, converters, shard_index, shard_count,
+                                          suite or os.path.basename(csv_path))
+    
+    @staticmethod
+    def _stream_rows(csv_path, converters, shard_index, shard_count, suite):
+        """Generator behind stream(); see there for details"""
+        filename = csv_path
+        reporter = get_reporter()
+        with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+            csv_reader = csv.reader(file)
+            header = next(csv_reader, [])
+            missing = [column for column in converters if column not in header]
+            if missing:
+                raise ValueError(f"{os.path.basename(filename)} is missing columns: {', '.join(missing)}")
+            
+            index = 0
+            yielded = 0
+            for values in csv_reader:
+                if not values:
+                    continue
+                index += 1
+                if (index - 1) % shard_count != shard_index:
+                    continue
+                
+                if len(values) != len(header):
+                    reporter.log(suite, index, f"⚠ {os.path.basename(filename)} row {index} has "
+                                               f"{len(values)} cells for {len(header)} columns")
+                row = dict(zip(header, values))
+                for column in header[len(values):]:
+                    row[column] = None
+                for column, convert in converters.items():
+                    if convert is str:
+                        # Text columns are only checked for presence
+                        continue
+                    value = row[column]
+                    try:
+                        row[column] = convert(value) if value not in (None, '') else None
+                    except ValueError as e:
+                        raise ValueError(f"{os.path.basename(filename)} row {index}, "
+                                         f"column '{column}': {str(e)}") from e
+                yielded += 1
+                yield index, row
+        
+        reporter.log(suite, None, f"✓ Streamed {yielded} of {index} test cases from {os.path.basename(filename)}"
+                     + (f" (shard {shard_index + 1}/{shard_count})" if shard_count > 1 else ""))
+    
+    @staticmethod
+    def parse_bool(value):
+        """Coerce a CSV cell such as 'true', 'yes' or '0' to bool"""
+        normalized = value.strip().lower()
+        if normalized in ('true', 'yes', 'y', '1'):
+            return True
+        if normalized in ('false', 'no', 'n', '0'):
+            return False
+        raise ValueError(f"not a boolean: {value!r}")
+    
+    # Schema types that need more than calling the type on the cell text
+    COERCERS = {bool: parse_bool.__func__}
+
+
+class TableSnapshot:
+    """Header and cell text of an HTML table, read in one round-trip"""
+    
+    # Collects every cell's text in the browser and returns plain arrays,
+    # instead of one WebElement reference per row over the wire
+    SNAPSHOT_SCRIPT = """
+        var table = document.querySelector(arguments[0]);
+        if (!table) { return null; }
+        var cellText = function (cell) {
+            return cell.textContent.replace(/\\s+/g, ' ').trim();
+        };
+        var rows = table.querySelectorAll('tr');
+        var header = [], body = [];
+        for (var i = 0; i < rows.length; i++) {
+            var cells = Array.prototype.map.call(rows[i].cells, cellText);
+            if (i === 0) { header = cells; } else { body.push(cells); }
+        }
+        return {header: header, rows: body};
+    """
+    
+    def __init__(self, header, rows):
+        """
+        Args:
+            header (list): Header cell texts
+            rows (list): One list of cell texts per data row
+        """
+        self.header = header
+        self.rows = rows
+    
+    @classmethod
+    def capture(cls, driver, selector='table'):
+        """
+        Take a snapshot of the first table matching a CSS selector
+        
+        Args:
+            driver (WebDriver): Browser to read from
+            selector (str): CSS selector of the table
+            
+        Returns:
+            TableSnapshot: Snapshot, or None if no table is present
+        """
+        result = driver.execute_script(cls.SNAPSHOT_SCRIPT, selector)
+        if result is None:
+            return None
+        return cls(result['header'], result['rows'])
+    
+    @property
+    def row_count(self):
+        """Number of data rows (excluding header)"""
+        return len(self.rows)
+    
+    @property
+    def text(self):
+        """All cell text, one line per row"""
+        return "\n".join(" ".join(row) for row in [self.header] + self.rows)
+    
+    def contains(self, text):
+        """
+        Check whether any data cell contains the text (case-insensitive)
+        
+        Args:
+            text (str): Text to look for
+            
+        Returns:
+            bool: True if found
+        """
+        needle = text.lower()
+        return any(needle in cell.lower() for row in self.rows for cell in row)
+    
+    def column_index(self, label):
+        """
+        Find a column by its header text (case-insensitive)
+        
+        Args:
+            label (str): Header label, e.g. 'First Name'
+            
+        Returns:
+            int: Column index, or None if no header matches
+        """
+        label = label.strip().lower()
+        for index, cell in enumerate(self.header):
+            if cell.lower() == label:
+                return index
+        return None
+    
+    def column(self, label):
+        """
+        Get all values of a column
+        
+        Args:
+            label (str): Header label
+            
+        Returns:
+            list: Column values, or None if the column does not exist
+        """
+        index = self.column_index(label)
+        if index is None:
+            return None
+        return [row[index] if index < len(row) else '' for row in self.rows]
+    
+    def sort_order(self, label):
+        """
+        Determine how a column is ordered, comparing like AngularJS orderBy
+        
+        Args:
+            label (str): Header label
+            
+        Returns:
+            str: 'ascending', 'descending', or None if unsorted or missing
+        """
+        values = self.column(label)
+        if values is None:
+            return None
+        keys = [value.lower() for value in values]
+        if keys == sorted(keys):
+            return 'ascending'
+        if keys == sorted(keys, reverse=True):
+            return 'descending'
+        return None
+
+
+class UIStabilityWait:
+    """Utility class for waiting until the AngularJS UI has settled"""
+    
+    # Resolves once Angular has no outstanding $http/$timeout work and the
+    # DOM has then been free of mutations for the quiet period. Pages
+    # without Angular only wait for the quiet period.
+    STABILITY_SCRIPT = """
+        var quietMs = arguments[0], timeoutMs = arguments[1];
+        var done = arguments[arguments.length - 1];
+        var start = Date.now(), finished = false, observer = null, quietTimer = null;
+        
+        function finish(stable) {
+            if (finished) { return; }
+            finished = true;
+            if (observer) { observer.disconnect(); }
+            clearTimeout(quietTimer);
+            var table = document.querySelector('table');
+            var rows = table ? table.querySelectorAll('tr').length : 0;
+            done({stable: stable, elapsed: Date.now() - start, rows: Math.max(rows - 1, 0)});
+        }
+        
+        function waitForQuietDom() {
+            observer = new MutationObserver(function () {
+                clearTimeout(quietTimer);
+                quietTimer = setTimeout(function () { finish(true); }, quietMs);
+            });
+            observer.observe(document.documentElement,
+                             {childList: true, subtree: true, attributes: true, characterData: true});
+            quietTimer = setTimeout(function () { finish(true); }, quietMs);
+        }
+        
+        setTimeout(function () { finish(false); }, timeoutMs);
+        try {
+            var root = document.querySelector('[ng-app]') || document.querySelector('.ng-scope');
+            var injector = window.angular && root && window.angular.element(root).injector();
+            if (injector) {
+                injector.get('$browser').notifyWhenNoOutstandingRequests(waitForQuietDom);
+                return;
+            }
+        } catch (e) {}
+        waitForQuietDom();
+    """
+    
+    @staticmethod
+    def wait(driver, timeout=10, quiet_period=0.1):
+        """
+        Wait until the page is stable, returning as soon as it is
+        
+        Args:
+            driver (WebDriver): Browser to wait on
+            timeout (float): Maximum seconds to wait
+            quiet_period (float): Seconds without DOM mutations that count as stable
+            
+        Returns:
+            dict: 'stable' (bool), 'elapsed' (ms) and 'rows' (table data rows)
+        """
+        try:
+            return driver.execute_async_script(UIStabilityWait.STABILITY_SCRIPT,
+                                               int(quiet_period * 1000), int(timeout * 1000))
+        except Exception:
+            # Script injection failed (e.g. page mid-navigation); fall back
+            # to polling until the table row count stops changing
+            return UIStabilityWait.wait_for_row_count(driver, timeout, quiet_period)
+    
+    @staticmethod
+    def wait_for_row_count(driver, timeout=10, quiet_period=0.1):
+        """
+        Wait until the table row count is the same on two consecutive polls
+        
+        Args:
+            driver (WebDriver): Browser to wait on
+            timeout (float): Maximum seconds to wait
+            quiet_period (float): Seconds between polls
+            
+        Returns:
+            dict: 'stable' (bool), 'elapsed' (ms) and 'rows' (table data rows)
+        """
+        start = time.monotonic()
+        previous = None
+        while True:
+            try:
+                rows = driver.execute_script(
+                    "var t = document.querySelector('table');"
+                    "return t ? Math.max(t.querySelectorAll('tr').length - 1, 0) : 0;")
+            except Exception:
+                rows = None
+            elapsed = time.monotonic() - start
+            if rows is not None and rows == previous:
+                return {'stable': True, 'elapsed': int(elapsed * 1000), 'rows': rows}
+            if elapsed >= timeout:
+                return {'stable': False, 'elapsed': int(elapsed * 1000), 'rows': rows or 0}
+            previous = rows
+            time.sleep(quiet_period)
+
+
+class RowScheduler:
+    """Utility class for ordering CSV rows so consecutive rows share a page"""
+    
+    @staticmethod
+    def group_by_site(rows, key='siteUrl'):
+        """
+        Group rows by their site URL, keeping first-appearance order
+        
+        Rows for the first URL are passed through as they arrive and only
+        rows for other URLs are buffered, so a file that uses a single URL
+        is streamed without holding it in memory.
+        
+        Args:
+            rows (iterable): (row index, row dictionary) tuples
+            key (str): Column holding the page URL
+            
+        Yields:
+            tuple: The same tuples with rows for the same URL adjacent
+        """
+        first_url = None
+        deferred = {}
+        for index, data in rows:
+            url = data.get(key)
+            if first_url is None:
+                first_url = url
+            if url == first_url:
+                yield index, data
+            else:
+                deferred.setdefault(url, []).append((index, data))
+        for group in deferred.values():
+            yield from group
+
+
+class RowProgram:
+    """A CSV row's steps compiled into one execute_async_script call"""
+    
+    # Runs the steps in order in the page and reports every observation at
+    # once. A step that cannot be reproduced faithfully in JavaScript (no
+    # element, not interactable, UI never settles) ends the program with
+    # ok=false so the caller can replay the row step by step.
+    PROGRAM_BODY = """
+        var steps = arguments[0], timeoutMs = arguments[1], quietMs = arguments[2];
+        var done = arguments[arguments.length - 1];
+        var observations = {}, start = Date.now(), finished = false;
+        
+        function finish(result) {
+            if (finished) { return; }
+            finished = true;
+            result.observations = observations;
+            result.elapsed = Date.now() - start;
+            done(result);
+        }
+        
+        function locate(locator) {
+            var by = locator[0], value = locator[1];
+            if (by === 'css selector') { return document.querySelector(value); }
+            if (by === 'id') { return document.getElementById(value); }
+            if (by === 'name') { return document.querySelector('[name="' + CSS.escape(value) + '"]'); }
+            if (by === 'tag name') { return document.getElementsByTagName(value)[0] || null; }
+            if (by === 'class name') { return document.getElementsByClassName(value)[0] || null; }
+            if (by === 'xpath') {
+                return document.evaluate(value, document, null,
+                                         XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            }
+            if (by === 'link text' || by === 'partial link text') {
+                var anchors = document.getElementsByTagName('a');
+                for (var i = 0; i < anchors.length; i++) {
+                    var text = (anchors[i].innerText || anchors[i].textContent).trim();
+                    if (by === 'link text' ? text === value : text.indexOf(value) !== -1) { return anchors[i]; }
+                }
+            }
+            return null;
+        }
+        
+        function waitFor(locator, callback) {
+            var element = locate(locator);
+            if (element) { callback(element); return; }
+            var timer = null;
+            var observer = new MutationObserver(function () {
+                var found = locate(locator);
+                if (found) { observer.disconnect(); clearTimeout(timer); callback(found); }
+            });
+            observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+            timer = setTimeout(function () { observer.disconnect(); callback(null); },
+                               Math.max(timeoutMs - (Date.now() - start), 0));
+        }
+        
+        function interactable(element) {
+            var style = getComputedStyle(element);
+            return !element.disabled && style.visibility !== 'hidden' && style.display !== 'none' &&
+                !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+        }
+        
+        function setValue(element, value) {
+            element.focus();
+            element.value = value;
+            element.dispatchEvent(new Event('input', {bubbles: true}));
+            element.dispatchEvent(new Event('change', {bubbles: true}));
+        }
+        
+        function run(index) {
+            if (index >= steps.length) { finish({ok: true}); return; }
+            var step = steps[index];
+            var next = function () {
+                try { run(index + 1); } catch (e) { finish({ok: false, step: index + 1, reason: String(e)}); }
+            };
+            var fallback = function (reason) { finish({ok: false, step: index, reason: reason}); };
+            
+            if (step.op === 'snapshot') {
+                observations[step.name] = snapshotTable(step.selector);
+                next();
+            } else if (step.op === 'wait_stable') {
+                waitStable(quietMs, Math.max(timeoutMs - (Date.now() - start), 0), function (state) {
+                    if (!state.stable) { fallback('UI did not settle'); return; }
+                    if (step.name) { observations[step.name] = state; }
+                    next();
+                });
+            } else {
+                waitFor(step.locator, function (element) {
+                    if (!element) { fallback('element not found: ' + step.locator[1]); return; }
+                    if (step.op !== 'locate' && !interactable(element)) {
+                        fallback('element not interactable: ' + step.locator[1]);
+                        return;
+                    }
+                    if (step.op === 'clear') {
+                        setValue(element, '');
+                    } else if (step.op === 'type') {
+                        setValue(element, element.value + step.text);
+                    } else if (step.op === 'click') {
+                        element.click();
+                    }
+                    if (step.name) { observations[step.name] = true; }
+                    next();
+                });
+            }
+        }
+        
+        setTimeout(function () { finish({ok: false, step: -1, reason: 'row program timed out'}); }, timeoutMs + 1000);
+        try { run(0); } catch (e) { finish({ok: false, step: 0, reason: String(e)}); }
+    """
+    
+    def __init__(self):
+        self.steps = []
+        self.needs_user_input = None
+    
+    def _add(self, op, locator_string=None, name=None, **fields):
+        """Append a step, resolving its locator with the LocatorCompiler"""
+        step = {'op': op}
+        if locator_string is not None:
+            step['locator'] = list(LocatorCompiler.compile(locator_string).locator)
+        if name:
+            step['name'] = name
+        step.update(fields)
+        self.steps.append(step)
+        return self
+    
+    def locate(self, locator_string, name=None):
+        """Wait until an element matching the locator exists"""
+        return self._add('locate', locator_string, name)
+    
+    def clear(self, locator_string, name=None):
+        """Empty a text field (input/change events, like AngularJS expects)"""
+        return self._add('clear', locator_string, name)
+    
+    def type(self, locator_string, text, name=None):
+        """
+        Append text to a field with a single input event
+        
+        Text with special keys (Selenium Keys, e.g. ENTER) needs real key
+        events, so the program is marked for the step-by-step path.
+        """
+        if any('\ue000' <= character <= '\uf8ff' for character in text):
+            self.needs_user_input = f"special keys in '{locator_string}'"
+        return self._add('type', locator_string, name, text=text)
+    
+    def click(self, locator_string, name=None, trusted=False):
+        """
+        Click an element with element.click()
+        
+        Args:
+            trusted (bool): The page needs a real (isTrusted) mouse click;
+                            forces the step-by-step path
+        """
+        if trusted:
+            self.needs_user_input = f"trusted click on '{locator_string}'"
+        return self._add('click', locator_string, name)
+    
+    def wait_stable(self, name=None):
+        """Wait until AngularJS and the DOM have settled (see UIStabilityWait)"""
+        return self._add('wait_stable', name=name)
+    
+    def snapshot(self, name, selector='table'):
+        """Record a TableSnapshot of the table under `name` (None if absent)"""
+        return self._add('snapshot', name=name, selector=selector)
+    
+    @classmethod
+    def script(cls):
+        """The full program: snapshot and stability helpers plus the step runner"""
+        return ("var snapshotTable = function () {" + TableSnapshot.SNAPSHOT_SCRIPT + "};\n"
+                "var waitStable = function () {" + UIStabilityWait.STABILITY_SCRIPT + "};\n"
+                + cls.PROGRAM_BODY)
+    
+    def run(self, driver, timeout=10, quiet_period=0.1):
+        """
+        Execute the program in one round-trip
+        
+        Args:
+            driver (WebDriver): Browser showing the page
+            timeout (float): Seconds the whole row may take
+            quiet_period (float): Seconds without DOM mutations that count as stable
+            
+        Returns:
+            dict: 'ok' (bool), 'observations' (snapshots as TableSnapshot),
+                  'elapsed' (ms), plus 'step' and 'reason' when ok is False
+        """
+        if self.needs_user_input:
+            return {'ok': False, 'step': None, 'reason': f"needs real user input ({self.needs_user_input})",
+                    'observations': {}, 'elapsed': 0}
+        result = driver.execute_async_script(self.script(), self.steps,
+                                             int(timeout * 1000), int(quiet_period * 1000))
+        for step in self.steps:
+            if step['op'] == 'snapshot':
+                table = result['observations'].get(step['name'])
+                result['observations'][step['name']] = \
+                    TableSnapshot(table['header'], table['rows']) if table else None
+        return result
 
 
 class BaseDataDrivenTest(unittest.TestCase):
     """Base class for data-driven tests with common functionality"""
     
+    # Run Chrome without a UI (set by parallel workers)
+    headless = False
+    
+    # Driver backend: 'selenium' (chromedriver over HTTP), 'cdp' (DevTools
+    # websocket with asyncio; one browser process, one tab per session) or
+    # 'grid' (a Selenium Grid or other remote WebDriver endpoint at grid_url).
+    # Maps backend names to the classmethod that creates a driver.
+    driver_backend = 'selenium'
+    DRIVER_BACKENDS = {
+        'selenium': 'create_selenium_driver',
+        'cdp': 'create_cdp_driver',
+        'grid': 'create_grid_driver',
+    }
+    grid_url = None
+    
+    # chromedriver and Chrome locations found by Selenium Manager are cached
+    # in this file and validated against the binaries before each launch
+    # (None runs driver discovery on every launch)
+    driver_cache_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.resolved_drivers.json')
+    
+    # CSV row sharding: this class only runs rows where
+    # (row_index - 1) % shard_count == shard_index
+    shard_index = 0
+    shard_count = 1
+    
+    # Origin (e.g. 'http://127.0.0.1:8765') that replaces the scheme and
+    # host of every CSV siteUrl, to run against the local stand-in app
+    site_url_base = None
+    
+    # Run rows for the same siteUrl back to back and reuse the loaded page
+    # between them, resetting in-app state instead of reloading
+    group_rows_by_site = True
+    reuse_loaded_page = True
+    _loaded_url = None
+    _table_oracle = None
+    _last_row = None
+    _last_row_failed = False
+    _row_data = None
+    health = None
+    artifacts = None
+    
+    # Marks the page as re-sorted when a table header link is clicked;
+    # installed after every load so reset_page_state() can tell
+    WATCH_SORT_SCRIPT = """
+        if (window.__sortWatched) { return; }
+        window.__sortWatched = true;
+        document.addEventListener('click', function (event) {
+            var link = event.target.closest && event.target.closest('a');
+            if (link && link.closest('thead, table tr:first-child')) {
+                window.__sortChanged = true;
+            }
+        }, true);
+    """
+    
+    # Clears text inputs (firing the events AngularJS listens for) and
+    # reports whether the page is still the expected, usable view; a page
+    # whose sort order was changed is not (the app has no "unsorted" link)
+    RESET_PAGE_SCRIPT = """
+        var url = arguments[0], changed = false;
+        if (!window.__sortWatched || window.__sortChanged) {
+            return {ok: false, changed: false};
+        }
+        var inputs = document.querySelectorAll('input[type=text], input[type=search], input:not([type])');
+        for (var i = 0; i < inputs.length; i++) {
+            if (inputs[i].value !== '') {
+                inputs[i].value = '';
+                inputs[i].dispatchEvent(new Event('input', {bubbles: true}));
+                inputs[i].dispatchEvent(new Event('change', {bubbles: true}));
+                changed = true;
+            }
+        }
+        return {ok: location.href === url && !!document.querySelector('table'), changed: changed};
+    """
+    
+    # Lease browsers from the process-wide session pool instead of
+    # starting a new Chrome for every test class
+    use_session_pool = True
+    session_pool_size = 2
+    
+    # Directory for Chrome trace-event JSON and per-step latency summaries
+    trace_dir = None
+    
+    # Reporter output: JSON Lines/JUnit directory and console mode
+    # (verbose prints every step; otherwise a compact progress line)
+    report_dir = None
+    verbose_console = False
+    
+    # Sample page memory at the end of the class (see last_browser_memory)
+    collect_browser_memory = False
+    last_browser_memory = None
+    
+    # Lean profile: headless with a fixed viewport, images disabled, and
+    # ads, trackers and heavy assets blocked via Network.setBlockedURLs
+    lean_mode = False
+    lean_window_size = (1366, 768)
+    lean_blocked_types = ('Image', 'Font', 'Media')
+    lean_extra_blocked_urls = ()
+    
+    # JSON file of full page-load network usage per URL: regular runs
+    # record it, lean runs report requests and bytes saved against it
+    page_weight_file = None
+    
+    # Seed every browser from a shared profile template, copied on start
+    # so parallel workers never share a live profile; newly cached assets
+    # are written back (unless read-only) under a size cap
+    browser_cache_dir = None
+    browser_cache_max_mb = 500
+    browser_cache_write_back = True
+    
+    # No implicit wait: every explicit wait gets a deadline learned from the
+    # step's latency history (p99 plus a margin), or default_timeout until
+    # enough history exists
+    adaptive_timeouts = True
+    timeout_history_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                        '.timeout_history.json')
+    default_timeout = 10
+    
+    # Incremental re-runs: skip rows whose last result passed with the same
+    # row content, test-module source and app_version fingerprint
+    incremental = False
+    result_cache_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.row_results.json')
+    app_version = ''
+    
+    # Compiled fast path: suites that support it run a row's whole step
+    # sequence as one RowProgram (one round-trip), falling back to the
+    # step-by-step path when a step needs real user input or fails
+    fast_path = False
+    
+    # Fixture isolation: destructive rows first restore the app's customer
+    # store (localStorage) to a baseline, either fixture_seed or the store
+    # as first seen by the class, so rows no longer depend on each other
+    isolate_fixture_state = False
+    fixture_store_keys = STORE_KEYS
+    fixture_seed = None
+    
+    # Verify search and sort results against a TableOracle built from one
+    # table snapshot per page load
+    verify_with_oracle = True
+    
+    # Browser health: every health_check_every rows (and after a failed
+    # row) sample renderer memory and command latency between rows, and
+    # replace the driver when a limit is crossed (0 disables sampling)
+    health_check_every = 25
+    recycle_heap_mb = 512
+    recycle_rss_mb = 1536
+    recycle_dom_nodes = 200000
+    recycle_listeners = 100000
+    recycle_latency_factor = 4.0
+    
+    # Failure artifacts: when artifact_dir is set, a failed row's
+    # screenshot, page source and console log are grabbed and written (and
+    # compressed) by a background thread pool, capped at artifact_max_mb
+    artifact_dir = None
+    artifact_max_mb = 200
+    
     @classmethod
-    def setUpClass(cls):
-        """Set up browser once for all tests with proper Chrome options"""
+    def build_chrome_options(cls):
+        """
+        Build the Chrome options used for this class's browser
+        
+        Returns:
+            Options: Configured Chrome options
+        """
         # Configure Chrome options to suppress popups and notifications
         chrome_options = Options()
         chrome_options.add_argument("--disable-notifications")
@@ -126,25 +1074,449 @@ class BaseDataDrivenTest(unittest.TestCase):
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--no-first-run")
         chrome_options.add_argument("--no-default-browser-check")
-        # Uncomment to run in headless mode (no UI):
-        # chrome_options.add_argument("--headless")
+        if cls.lean_mode:
+            from lean_browser import LeanProfile
+            LeanProfile.apply_options(chrome_options, cls.lean_window_size)
+        elif cls.headless:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--window-size=1920,1080")
+        if cls.measures_network():
+            from lean_browser import LeanProfile
+            LeanProfile.enable_network_log(chrome_options)
+        if cls.artifact_dir:
+            # Keep console messages for failure artifacts
+            prefs = dict(chrome_options.capabilities.get('goog:loggingPrefs') or {})
+            prefs['browser'] = 'ALL'
+            chrome_options.set_capability('goog:loggingPrefs', prefs)
+        return chrome_options
+    
+    @classmethod
+    def measures_network(cls):
+        """Whether page loads are measured from Chrome's performance log"""
+        return bool(cls.lean_mode or cls.page_weight_file)
+    
+    @classmethod
+    def create_driver(cls, chrome_options=None):
+        """
+        Start a new browser session with the configured driver backend
         
-        cls.driver = webdriver.Chrome(options=chrome_options)
-        cls.driver.implicitly_wait(10)
-        cls.driver.maximize_window()
-        print("\n✓ Browser initialized with proper Chrome options")
+        Args:
+            chrome_options (Options): Chrome options (built if omitted)
+            
+        Returns:
+            WebDriver: New Chrome driver (or CDPTab on the 'cdp' backend)
+            
+        Raises:
+            ValueError: If driver_backend is not in DRIVER_BACKENDS
+        """
+        if chrome_options is None:
+            chrome_options = cls.build_chrome_options()
+        factory = cls.DRIVER_BACKENDS.get(cls.driver_backend)
+        if factory is None:
+            raise ValueError(f"Unknown driver backend '{cls.driver_backend}' "
+                             f"(expected one of: {', '.join(cls.DRIVER_BACKENDS)})")
+        with get_startup_profile().phase('browser launch', f"{cls.__name__} ({cls.driver_backend})"):
+            driver = getattr(cls, factory)(chrome_options)
+        
+        if cls.lean_mode:
+            from lean_browser import LeanProfile
+            # Stays active on the tab across navigations and pool resets
+            LeanProfile.block_urls(driver, LeanProfile.blocked_patterns(
+                cls.lean_blocked_types, cls.lean_extra_blocked_urls))
+        elif not cls.headless:
+            driver.maximize_window()
+        return driver
+    
+    @classmethod
+    def create_selenium_driver(cls, chrome_options):
+        """
+        Start Chrome through chromedriver
+        
+        Args:
+            chrome_options (Options): Chrome options
+            
+        Returns:
+            WebDriver: New Chrome driver
+        """
+        profile_dir = None
+        if cls.browser_cache_dir:
+            from browser_cache import get_profile_cache
+            cache = get_profile_cache(cls.browser_cache_dir,
+                                      max_bytes=int(cls.browser_cache_max_mb * 1048576),
+                                      write_back=cls.browser_cache_write_back)
+            profile_dir = cache.checkout()
+            # Private copy, so the caller's options (and pool key) stay unchanged
+            chrome_options = copy.deepcopy(chrome_options)
+            chrome_options.add_argument(f"--user-data-dir={profile_dir}")
+        
+        try:
+            driver = cls.launch_chrome(chrome_options)
+        except Exception:
+            if profile_dir:
+                cache.checkin(profile_dir)
+            raise
+        
+        if profile_dir:
+            # Write the session's cache back once the browser has exited
+            quit_browser = driver.quit
+            
+            def quit():
+                try:
+                    quit_browser()
+                finally:
+                    cache.checkin(profile_dir)
+            
+            driver.quit = quit
+        return driver
+    
+    @classmethod
+    def launch_chrome(cls, chrome_options):
+        """
+        Start chromedriver and Chrome, skipping Selenium Manager when the resolved paths are cached
+        
+        A launch with cached paths that fails drops the cache entry and
+        retries once with Selenium Manager's discovery.
+        
+        Args:
+            chrome_options (Options): Chrome options
+            
+        Returns:
+            WebDriver: New Chrome driver
+        """
+        if not cls.driver_cache_file:
+            return webdriver.Chrome(options=chrome_options)
+        from driver_resolver import get_driver_cache
+        drivers = get_driver_cache(cls.driver_cache_file)
+        resolved = drivers.resolve(chrome_options)
+        options = copy.deepcopy(chrome_options)
+        options.binary_location = resolved['browser_path']
+        try:
+            return webdriver.Chrome(options=options, service=Service(executable_path=resolved['driver_path']))
+        except Exception as e:
+            if not resolved['cached']:
+                raise
+            cls.reporter().echo(f"⚠ Cached chromedriver launch failed ({str(e).strip().splitlines()[0]}); "
+                                f"resolving again")
+            drivers.invalidate(chrome_options)
+            return webdriver.Chrome(options=chrome_options)
+    
+    @classmethod
+    def create_cdp_driver(cls, chrome_options):
+        """
+        Open a tab in this process's DevTools-driven Chrome, launching it on first use
+        
+        Args:
+            chrome_options (Options): Chrome options
+            
+        Returns:
+            CDPTab: New tab with a WebDriver-like interface
+        """
+        from cdp_driver import CDPBrowser, get_cdp_browser
+        
+        def launch():
+            options, on_close = chrome_options, None
+            if cls.browser_cache_dir:
+                from browser_cache import get_profile_cache
+                # The whole browser shares one profile copy on this backend
+                cache = get_profile_cache(cls.browser_cache_dir,
+                                          max_bytes=int(cls.browser_cache_max_mb * 1048576),
+                                          write_back=cls.browser_cache_write_back)
+                profile_dir = cache.checkout()
+                options = copy.deepcopy(chrome_options)
+                options.add_argument(f"--user-data-dir={profile_dir}")
+                on_close = lambda: cache.checkin(profile_dir)
+            return CDPBrowser(options, on_close=on_close)
+        
+        browser = get_cdp_browser(tuple(chrome_options.arguments), launch)
+        return browser.new_tab()
+    
+    @classmethod
+    def create_grid_driver(cls, chrome_options):
+        """
+        Start Chrome on a Selenium Grid node
+        
+        The browser runs on the Grid's machine, so the local profile cache
+        (browser_cache_dir) does not apply.
+        
+        Args:
+            chrome_options (Options): Chrome options
+            
+        Returns:
+            WebDriver: Remote driver
+            
+        Raises:
+            ValueError: If grid_url is not set
+        """
+        if not cls.grid_url:
+            raise ValueError("The 'grid' driver backend needs grid_url (e.g. http://grid:4444)")
+        return webdriver.Remote(command_executor=cls.grid_url, options=chrome_options)
+    
+    @classmethod
+    def acquire_driver(cls):
+        """
+        Get a browser for this class, from the session pool when enabled
+        
+        Returns:
+            WebDriver: Chrome driver
+        """
+        if not cls.use_session_pool:
+            driver = cls.create_driver()
+            cls.reporter().echo("\n✓ Browser initialized with proper Chrome options")
+            return driver
+        
+        chrome_options = cls.build_chrome_options()
+        pool = get_shared_pool(max_size=cls.session_pool_size)
+        reused_before = pool.reused
+        # Sessions are only reused with identical arguments and capabilities
+        key = (cls.driver_backend, tuple(chrome_options.arguments),
+               json.dumps(chrome_options.to_capabilities(), sort_keys=True, default=str))
+        driver = pool.acquire(lambda: cls.create_driver(chrome_options), key=key)
+        if pool.reused > reused_before:
+            cls.reporter().echo("\n✓ Reusing warm browser session from pool")
+        else:
+            cls.reporter().echo("\n✓ Browser initialized with proper Chrome options")
+        return driver
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up browser once for all tests with proper Chrome options"""
+        cls._loaded_url = None
+        cls.network_usage = None
+        cls.network_reference = None
+        cls.cache_hits = {'hits': 0, 'requests': 0}
+        cls.cached_rows = []
+        cls._row_keys = {}
+        cls.fast_path_stats = {'rows': 0, 'fallbacks': 0}
+        cls.fixture_baseline = cls.fixture_seed
+        cls._table_oracle = None
+        cls._last_row = None
+        cls._last_row_failed = False
+        cls.health = None
+        if cls.health_check_every:
+            from health_monitor import HealthMonitor
+            cls.health = HealthMonitor(cls.health_check_every, cls.recycle_heap_mb, cls.recycle_rss_mb,
+                                       cls.recycle_dom_nodes, cls.recycle_listeners,
+                                       cls.recycle_latency_factor)
+        cls.page_weight = None
+        if cls.page_weight_file:
+            from lean_browser import PageWeightBaseline
+            cls.page_weight = PageWeightBaseline(cls.page_weight_file)
+        cls.artifacts = None
+        if cls.artifact_dir:
+            from failure_artifacts import get_artifact_store
+            cls.artifacts = get_artifact_store(cls.artifact_dir, cls.artifact_max_mb * 1048576)
+        cls.artifacts_captured = 0
+        cls.driver = cls.acquire_driver()
+        if cls.artifacts:
+            # Drop console messages left by a pooled session's previous class
+            cls.drain_console_log()
+        
+        # Time every WebDriver command, tagged with class, row and step
+        cls.tracer = CommandTracer(cls.__name__)
+        instrument_driver(cls.driver, cls.tracer)
     
     @classmethod
     def tearDownClass(cls):
-        """Close browser after all tests"""
-        print("\n" + "="*60)
-        print("Test execution completed. Closing browser...")
-        print("="*60)
-        cls.driver.quit()
+        """Close browser (or return it to the session pool) after all tests"""
+        stats = LocatorCompiler.stats
+        cache = LocatorCompiler.cache_info()
+        lines = ["\n" + "="*60, "Test execution completed. Closing browser...",
+                 f"Locator lookups: {stats['lookups']} total, {stats['fast']} fast path, "
+                 f"{stats['fallback']} fallback (compile cache: {cache.hits} hits, {cache.misses} misses)"]
+        if cls.network_usage:
+            lines.append(f"Network ({cls.network_usage.loads} page loads): "
+                         f"{cls.network_usage.describe(cls.network_reference)}")
+        if cls.browser_cache_dir and cls.cache_hits['requests']:
+            hits, requests = cls.cache_hits['hits'], cls.cache_hits['requests']
+            lines.append(f"Browser cache: {hits}/{requests} resources from cache "
+                         f"({hits / requests * 100:.1f}% hit ratio)")
+        if cls.page_weight and not cls.lean_mode:
+            cls.page_weight.save()
+            lines.append(f"✓ Page weights recorded in {cls.page_weight_file}")
+        if cls.incremental:
+            get_result_cache(cls.result_cache_file).save()
+            lines.append(f"Incremental: {len(cls.cached_rows)} unchanged passing rows skipped, "
+                         f"{len(cls._row_keys)} rows run")
+        if cls.fast_path and (cls.fast_path_stats['rows'] or cls.fast_path_stats['fallbacks']):
+            lines.append(f"Fast path: {cls.fast_path_stats['rows']} rows in one round-trip, "
+                         f"{cls.fast_path_stats['fallbacks']} fell back to step-by-step")
+        if cls.health and cls.health.series:
+            lines.append(f"Browser health: {cls.health.describe()}")
+            if cls.report_dir:
+                lines.append(f"✓ Memory time series written to {cls.health.export(cls.report_dir, cls.__name__)}")
+        if cls.artifacts_captured:
+            lines.append(f"Failure artifacts: {cls.artifacts_captured} row(s) captured in {cls.artifacts.directory}")
+        if cls.adaptive_timeouts:
+            cls.timeouts().save()
+        if cls.verbose_console:
+            lines.append(cls.tracer.format_summary())
+            if cls.adaptive_timeouts:
+                prefix = f"{cls.__name__}:"
+                lines.extend(f"Timeout {step[len(prefix):]}: {deadline:.2f}s ({count} samples)"
+                             for step, (deadline, count) in cls.timeouts().describe().items()
+                             if step.startswith(prefix))
+        if cls.trace_dir:
+            trace_path, summary_path = cls.tracer.export(cls.trace_dir)
+            lines.append(f"✓ Command trace written to {trace_path}")
+        lines.append("="*60)
+        cls.reporter().echo("\n".join(line for line in lines if line))
+        
+        # Stop tracing before the pool resets the session
+        instrument_driver(cls.driver, None)
+        if cls.collect_browser_memory:
+            cls.last_browser_memory = browser_memory(cls.driver)
+        if cls.use_session_pool:
+            get_shared_pool().release(cls.driver)
+        else:
+            cls.driver.quit()
+    
+    @classmethod
+    def recycle_driver(cls, reason):
+        """
+        Replace the class's browser with a fresh one between rows
+        
+        The old browser is quit rather than returned to the session pool.
+        
+        Args:
+            reason (str): Why the browser is replaced (reported)
+        """
+        cls.reporter().echo(f"⚠ Recycling {cls.__name__} browser: {reason}")
+        instrument_driver(cls.driver, None)
+        if cls.use_session_pool:
+            get_shared_pool().discard(cls.driver)
+        else:
+            try:
+                cls.driver.quit()
+            except Exception:
+                pass
+        cls.driver = cls.acquire_driver()
+        instrument_driver(cls.driver, cls.tracer)
+        cls._loaded_url = None
+        cls._table_oracle = None
+    
+    @classmethod
+    def timeouts(cls):
+        """
+        Get the process-wide timeout manager for this class's history file
+        
+        Returns:
+            TimeoutManager: Adaptive timeout manager
+        """
+        return get_timeout_manager(cls.timeout_history_file, default=cls.default_timeout)
+    
+    def step_timeout(self, step):
+        """
+        Deadline for a wait step of this class
+        
+        Args:
+            step (str): Step name, e.g. 'wait_for_element'
+            
+        Returns:
+            float: Seconds to wait
+        """
+        if not self.adaptive_timeouts:
+            return self.default_timeout
+        return self.timeouts().timeout(self.timeout_key(step))
+    
+    def timeout_key(self, step):
+        """
+        History key of a wait step: class, step and the target's scheme and host
+        
+        The target is part of the key so latencies learned against the local
+        stand-in never become deadlines against the real site. The port is
+        left out, as the stand-in picks a new one every run.
+        
+        Args:
+            step (str): Step name
+            
+        Returns:
+            str: e.g. 'SearchDataDrivenTest:open_page@https://www.globalsqa.com'
+        """
+        url = (self._row_data or {}).get('siteUrl') or type(self)._loaded_url or self.site_url_base or ''
+        target = urlsplit(url)
+        return f"{type(self).__name__}:{step}@{target.scheme}://{target.hostname or ''}"
+    
+    def record_step_latency(self, step, seconds):
+        """
+        Add a successful wait's latency to the step's history
+        
+        Args:
+            step (str): Step name
+            seconds (float): Time the wait took
+        """
+        if self.adaptive_timeouts:
+            self.timeouts().record(self.timeout_key(step), seconds)
+    
+    def record_step_timeout(self, step, deadline):
+        """
+        Note that a wait with a learned deadline timed out, so the deadline grows back
+        
+        Args:
+            step (str): Step name
+            deadline (float): Deadline the wait ran into
+        """
+        if self.adaptive_timeouts:
+            self.timeouts().record_timeout(self.timeout_key(step), deadline)
+            self.log(f"⚠ {step} timed out after {deadline:.2f}s; raising its deadline")
+    
+    @classmethod
+    def reporter(cls):
+        """
+        Get the process-wide reporter, created from this class's settings
+        
+        Returns:
+            Reporter: Buffered result reporter
+        """
+        return get_reporter(report_dir=cls.report_dir, verbose=cls.verbose_console)
+    
+    @contextmanager
+    def subTest(self, *args, **params):
+        """
+        subTest that also tags traced commands and reported steps with the row index
+        
+        A 'suite' parameter reports the row under that suite instead of the class name.
+        """
+        self._current_row = params.get('test_case')
+        self._current_suite = params.get('suite')
+        self.tracer.set_row(self._current_row)
+        try:
+            with super().subTest(*args, **params):
+                yield
+        finally:
+            self._current_row = None
+            self._current_suite = None
+            self.tracer.set_row(None)
+    
+    def suite_name(self):
+        """Suite the current row is reported under"""
+        return getattr(self, '_current_suite', None) or type(self).__name__
+    
+    def log(self, message):
+        """
+        Report a step message (e.g. '✓ Page loaded successfully') for the current row
+        
+        Messages go to the buffered reporter instead of blocking on console I/O.
+        
+        Args:
+            message (str): Message; a leading ✓/⚠/✗ sets its level
+        """
+        self.reporter().log(self.suite_name(), getattr(self, '_current_row', None), message)
+    
+    def step(self, name):
+        """
+        Time a named step in the command trace
+        
+        Args:
+            name (str): Step name
+            
+        Returns:
+            context manager: Active for the duration of the step
+        """
+        return self.tracer.step(name)
     
     def parse_locator(self, locator_string):
         """
-        Parse locator string using LocatorParser utility
+        Parse locator string using the cached LocatorCompiler
         
         Args:
             locator_string (str): Locator in format 'type=value'
@@ -152,7 +1524,79 @@ class BaseDataDrivenTest(unittest.TestCase):
         Returns:
             tuple: (By type, locator value)
         """
-        return LocatorParser.parse(locator_string)
+        return LocatorCompiler.compile(locator_string).parsed
+    
+    def wait_until(self, condition, timeout):
+        """
+        Wait for a WebDriverWait condition on either driver backend
+        
+        Drivers with their own wait_until (the CDP backend re-checks on DOM
+        mutation events) use it; Selenium drivers poll with WebDriverWait.
+        
+        Args:
+            condition (callable): Called with the driver; a truthy result ends the wait
+            timeout (float): Maximum seconds to wait
+            
+        Returns:
+            Any: The condition's result
+            
+        Raises:
+            TimeoutException: If the condition is not met in time
+        """
+        event_wait = getattr(self.driver, 'wait_until', None)
+        if event_wait is not None:
+            return event_wait(condition, timeout)
+        return WebDriverWait(self.driver, timeout).until(condition)
+    
+    def wait_for_element(self, locator_string, timeout=None, clickable=False, may_be_absent=False):
+        """
+        Wait for an element using its compiled (fast path) locator
+        
+        Args:
+            locator_string (str): Locator in format 'type=value'
+            timeout (float): Maximum seconds to wait (learned per step if omitted)
+            clickable (bool): Also wait for the element to be displayed and enabled
+            may_be_absent (bool): A missing element is an expected outcome (e.g. an
+                                  already deleted customer), so a timeout does not
+                                  escalate the learned deadline
+            
+        Returns:
+            WebElement: Matching element
+            
+        Raises:
+            TimeoutException: If no matching element appears in time
+        """
+        compiled = LocatorCompiler.compile(locator_string)
+        step = 'wait_for_clickable' if clickable else 'wait_for_element'
+        learned = timeout is None
+        if learned:
+            timeout = self.step_timeout(step)
+        start = time.perf_counter()
+        try:
+            with self.step(step):
+                element = self.wait_until(compiled.condition(clickable=clickable), timeout)
+        except TimeoutException:
+            if learned and not may_be_absent:
+                self.record_step_timeout(step, timeout)
+            raise
+        self.record_step_latency(step, time.perf_counter() - start)
+        return element
+    
+    def find_element_by_locator(self, locator_string):
+        """
+        Find an element immediately using its compiled (fast path) locator
+        
+        Args:
+            locator_string (str): Locator in format 'type=value'
+            
+        Returns:
+            WebElement: Matching element
+            
+        Raises:
+            NoSuchElementException: If no element matches
+        """
+        with self.step('find_element'):
+            return LocatorCompiler.compile(locator_string).find(self.driver)
     
     def read_csv_data(self, filename):
         """
@@ -165,7 +1609,237 @@ class BaseDataDrivenTest(unittest.TestCase):
             list: List of dictionaries containing test data
         """
         current_dir = os.path.dirname(os.path.abspath(__file__))
-        return CSVDataReader.read(filename, base_path=current_dir)
+        test_data = CSVDataReader.read(filename, base_path=current_dir)
+        if self.site_url_base:
+            for row in test_data:
+                if 'siteUrl' in row:
+                    row['siteUrl'] = self.rewrite_site_url(row['siteUrl'], self.site_url_base)
+        return test_data
+    
+    @staticmethod
+    def rewrite_site_url(url, base):
+        """
+        Point a URL at another origin, keeping its path, query and fragment
+        
+        Args:
+            url (str): Original URL
+            base (str): New origin, e.g. 'http://127.0.0.1:8765'
+            
+        Returns:
+            str: Rewritten URL
+        """
+        target = urlsplit(base)
+        return urlunsplit(urlsplit(url)._replace(scheme=target.scheme, netloc=target.netloc))
+    
+    def iter_csv_rows(self, filename, schema=None, suite=None):
+        """
+        Lazily iterate over the CSV rows assigned to this class's shard
+        
+        Rows keep their 1-based position in the full CSV file, so subTest
+        numbering is identical whether the file runs in one process or is
+        split across parallel workers. Rows sharing a siteUrl are scheduled
+        back to back so open_page() can reuse the loaded page. In
+        incremental mode, rows with a still-valid passing result are skipped.
+        
+        Args:
+            filename (str): Path to CSV file
+            schema (dict): Optional column name -> type coercion (see CSVDataReader.stream)
+            suite (str): Suite the rows are reported under (defaults to the class name)
+            
+        Yields:
+            tuple: (row index, row dictionary)
+        """
+        suite = suite or type(self).__name__
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        rows = CSVDataReader.stream(filename, base_path=current_dir, schema=schema,
+                                    shard_index=self.shard_index, shard_count=self.shard_count,
+                                    suite=suite)
+        if self.group_rows_by_site:
+            rows = RowScheduler.group_by_site(rows)
+        for index, data in rows:
+            if self.incremental:
+                # Keyed by the row as read from the CSV: the stand-in's origin
+                # changes every run, app_version identifies the target instead
+                cache = get_result_cache(self.result_cache_file)
+                key = cache.row_key(type(self), data, self.app_version)
+                if cache.passed(key):
+                    type(self).cached_rows.append((suite, index))
+                    self.reporter().row_cached(suite, index)
+                    continue
+                type(self)._row_keys[(suite, index)] = key
+            if self.site_url_base and data.get('siteUrl'):
+                data['siteUrl'] = self.rewrite_site_url(data['siteUrl'], self.site_url_base)
+            self.check_browser_health()
+            self._row_data = data
+            yield index, data
+    
+    def open_page(self, url, timeout=None):
+        """
+        Show the page at url, reusing the loaded page when its state can be reset
+        
+        A full navigation (and AngularJS bootstrap) only happens for the
+        first row of a URL, or when reset_page_state() cannot restore the view.
+        
+        Args:
+            url (str): Page URL
+            timeout (float): Seconds allowed for the navigation and table
+                             (learned per step if omitted)
+            
+        Returns:
+            bool: True if the loaded page was reused, False if it was (re)loaded
+        """
+        if self.reuse_loaded_page and type(self)._loaded_url == url:
+            try:
+                with self.step('reset_page_state'):
+                    if self.reset_page_state(url):
+                        return True
+            except Exception as e:
+                self.log(f"⚠ Could not reset page state, reloading: {str(e)}")
+        
+        type(self)._loaded_url = None
+        self.invalidate_table_oracle()
+        if self.measures_network():
+            # Drop network events from earlier rows
+            self.driver.get_log('performance')
+        learned = timeout is None
+        if learned:
+            timeout = self.step_timeout('open_page')
+        if getattr(self.driver, '_page_load_timeout', None) != timeout:
+            # A hung navigation fails at the same deadline as the wait
+            self.driver.set_page_load_timeout(timeout)
+            self.driver._page_load_timeout = timeout
+        start = time.perf_counter()
+        try:
+            with self.step('open_page'):
+                self.driver.get(url)
+                self.wait_until(EC.presence_of_element_located((By.TAG_NAME, 'table')), timeout)
+        except TimeoutException:
+            if learned:
+                self.record_step_timeout('open_page', timeout)
+            raise
+        self.record_step_latency('open_page', time.perf_counter() - start)
+        if self.reuse_loaded_page:
+            self.driver.execute_script(self.WATCH_SORT_SCRIPT)
+        type(self)._loaded_url = url
+        if self.measures_network():
+            self.record_page_load(url)
+        if self.browser_cache_dir:
+            from browser_cache import page_cache_hits
+            hits = page_cache_hits(self.driver)
+            if hits:
+                type(self).cache_hits['hits'] += hits['hits']
+                type(self).cache_hits['requests'] += hits['requests']
+                self.log(f"✓ Browser cache: {hits['hits']}/{hits['requests']} resources from cache")
+        return False
+    
+    def record_page_load(self, url):
+        """
+        Report the requests and bytes of the page load that just finished
+        
+        Lean runs compare against the page's full load from page_weight_file;
+        other runs record the full load there.
+        
+        Args:
+            url (str): Loaded URL
+        """
+        from lean_browser import NetworkUsage
+        cls = type(self)
+        try:
+            usage = NetworkUsage.from_performance_log(self.driver.get_log('performance'))
+        except Exception as e:
+            self.log(f"⚠ Could not read network usage: {str(e)}")
+            return
+        
+        reference = cls.page_weight.get(url) if cls.page_weight and cls.lean_mode else None
+        if cls.page_weight and not cls.lean_mode:
+            cls.page_weight.record(url, usage)
+        
+        if cls.network_usage is None:
+            cls.network_usage = NetworkUsage(loads=0)
+        cls.network_usage.add(usage)
+        if reference is not None:
+            if cls.network_reference is None:
+                cls.network_reference = NetworkUsage(loads=0)
+            cls.network_reference.add(reference)
+        self.log(f"✓ Page load: {usage.describe(reference)}")
+    
+    def reset_page_state(self, url):
+        """
+        Cheaply restore the loaded page to its default state between rows
+        
+        Clears the search box. A page whose table was re-sorted since it
+        loaded cannot be restored this way and needs a reload; override to
+        restore other in-app state.
+        
+        Args:
+            url (str): URL the page is expected to show
+            
+        Returns:
+            bool: True if the page is usable, False if it needs a reload
+        """
+        state = self.driver.execute_script(self.RESET_PAGE_SCRIPT, url)
+        if state['changed']:
+            self.wait_for_ui_stable()
+        return state['ok']
+    
+    def restore_fixture_state(self):
+        """
+        Reset the app's customer store to the class baseline in one script call
+        
+        Without a fixture_seed, the first call records the current store as
+        the baseline instead. Call it once the app's page is loaded.
+        
+        Returns:
+            bool: True if the store had changed and was restored
+        """
+        if not self.isolate_fixture_state:
+            return False
+        with self.step('restore_fixture_state'):
+            if type(self).fixture_baseline is None:
+                type(self).fixture_baseline = FixtureState.snapshot(self.driver, self.fixture_store_keys)
+                return False
+            result = FixtureState.restore(self.driver, type(self).fixture_baseline)
+        if not result['changed']:
+            return False
+        self.invalidate_table_oracle()
+        self.wait_for_ui_stable()
+        self.log(f"✓ Customer store restored ({', '.join(result['changed'])}) in {result['elapsed']:.2f} ms")
+        return True
+    
+    def snapshot_table(self, selector='table'):
+        """
+        Read the table header and all cell text in a single script call
+        
+        Args:
+            selector (str): CSS selector of the table
+            
+        Returns:
+            TableSnapshot: Snapshot, or None if no table is present
+        """
+        with self.step('snapshot_table'):
+            return TableSnapshot.capture(self.driver, selector)
+    
+    def table_oracle(self, snapshot=None):
+        """
+        Get the search/sort oracle of the loaded page, modelled from one snapshot
+        
+        Args:
+            snapshot (TableSnapshot): Unfiltered snapshot already read for this
+                                      row, used instead of reading the table again
+            
+        Returns:
+            TableOracle: Oracle, or None if the page shows no table
+        """
+        if type(self)._table_oracle is None:
+            snapshot = snapshot or self.snapshot_table()
+            if snapshot is None:
+                return None
+            type(self)._table_oracle = TableOracle(snapshot)
+        return type(self)._table_oracle
+    
+    def invalidate_table_oracle(self):
+        """Drop the oracle after the page reloaded or its data changed"""
+        type(self)._table_oracle = None
     
     def get_table_rows_count(self):
         """
@@ -175,32 +1849,133 @@ class BaseDataDrivenTest(unittest.TestCase):
             int: Number of data rows in table
         """
         try:
-            table = self.driver.find_element(By.TAG_NAME, 'table')
-            rows = table.find_elements(By.TAG_NAME, 'tr')
-            # Subtract 1 for header row
-            return len(rows) - 1 if len(rows) > 0 else 0
+            snapshot = self.snapshot_table()
+            return snapshot.row_count if snapshot else 0
         except Exception as e:
-            print(f"⚠ Could not count table rows: {str(e)}")
+            self.log(f"⚠ Could not count table rows: {str(e)}")
             return 0
     
+    def wait_for_ui_stable(self, timeout=None, quiet_period=0.1):
+        """
+        Wait until AngularJS and the DOM have settled
+        
+        Replaces fixed sleeps after clicks and typing: returns as soon as
+        the UI is stable instead of always paying the worst case.
+        
+        Args:
+            timeout (float): Maximum seconds to wait (learned per step if omitted)
+            quiet_period (float): Seconds without DOM mutations that count as stable
+            
+        Returns:
+            dict: 'stable' (bool), 'elapsed' (ms) and 'rows' (table data rows)
+        """
+        learned = timeout is None
+        if learned:
+            timeout = self.step_timeout('wait_for_ui_stable')
+        with self.step('wait_for_ui_stable'):
+            state = UIStabilityWait.wait(self.driver, timeout, quiet_period)
+        if state['stable']:
+            self.record_step_latency('wait_for_ui_stable', state['elapsed'] / 1000.0)
+        else:
+            self.log(f"⚠ UI did not settle within {timeout}s")
+            if learned:
+                self.record_step_timeout('wait_for_ui_stable', timeout)
+        return state
+    
+    def run_row_program(self, program, timeout=None):
+        """
+        Run a row's compiled steps in one execute_async_script call
+        
+        Args:
+            program (RowProgram): Steps of the row
+            timeout (float): Seconds the whole row may take (learned if omitted)
+            
+        Returns:
+            dict: Observation name -> value (snapshots as TableSnapshot), or
+                  None if the row must be replayed step by step
+        """
+        learned = timeout is None
+        if learned:
+            timeout = self.step_timeout('run_row_program')
+        try:
+            with self.step('run_row_program'):
+                result = program.run(self.driver, timeout)
+        except Exception as e:
+            # e.g. a script timeout or a navigation during the program
+            if learned and isinstance(e, TimeoutException):
+                self.record_step_timeout('run_row_program', timeout)
+            message = str(e).strip()
+            result = {'ok': False, 'step': None,
+                      'reason': message.splitlines()[0] if message else type(e).__name__}
+        if not result['ok']:
+            type(self).fast_path_stats['fallbacks'] += 1
+            self.log(f"⚠ Fast path falling back to step-by-step"
+                     f"{'' if result['step'] is None else ' at step ' + str(result['step'])}: {result['reason']}")
+            return None
+        type(self).fast_path_stats['rows'] += 1
+        self.record_step_latency('run_row_program', result['elapsed'] / 1000.0)
+        self.log(f"✓ Ran {len(program.steps)} steps in one round-trip ({result['elapsed']} ms)")
+        return result['observations']
+    
+    def check_browser_health(self):
+        """
+        Sample the browser after a finished row and recycle it if it is unhealthy
+        
+        Runs between rows, so the next row starts on the fresh browser.
+        """
+        cls = type(self)
+        row, cls._last_row = cls._last_row, None
+        if cls.health is None or row is None:
+            return
+        if not cls.health.due(after_failure=cls._last_row_failed):
+            return
+        with self.step('health_check'):
+            entry = cls.health.sample(cls.driver, cls.tracer, row)
+        reason = cls.health.recycle_reason(entry)
+        if reason:
+            cls.recycle_driver(f"{reason} after row {row}")
+            cls.health.recycled(row, reason)
+    
+    @classmethod
+    def drain_console_log(cls):
+        """Discard the browser console messages collected so far"""
+        try:
+            cls.driver.get_log('browser')
+        except Exception as e:
+            cls.reporter().echo(f"⚠ Browser console log unavailable: {str(e).strip().splitlines()[0]}")
+    
+    def capture_failure_artifacts(self, test_case_num, message=""):
+        """
+        Grab a failed row's screenshot, page source and console log
+        
+        Only the browser reads happen here; compression and disk writes run
+        on the artifact store's thread pool.
+        
+        Args:
+            test_case_num (int): Failed row index
+            message (str): Failure message
+        """
+        with self.step('failure_artifacts'):
+            path = self.artifacts.capture(self.driver, self.suite_name(), test_case_num,
+                                          self._row_data, message)
+        type(self).artifacts_captured += 1
+        self.log(f"✓ Failure artifacts queued for {os.path.basename(path)}")
+    
     def print_test_header(self, test_case_num, title="Test Case"):
-        """Print formatted test case header"""
-        print(f"\n{'='*60}")
-        print(f"{title} {test_case_num}")
-        print(f"{'='*60}")
+        """Report the start of a test case (printed as a header in verbose mode)"""
+        self.reporter().row_started(self.suite_name(), test_case_num, title)
     
     def print_test_result(self, test_case_num, passed=True, message=""):
-        """Print formatted test result"""
-        print(f"{'='*60}")
-        if passed:
-            print(f"✓✓✓ Test Case {test_case_num} PASSED ✓✓✓")
-            if message:
-                print(f"    {message}")
-        else:
-            print(f"✗✗✗ Test Case {test_case_num} FAILED ✗✗✗")
-            if message:
-                print(f"    Error: {message}")
-        print(f"{'='*60}")
+        """Report a test case result (printed as a banner in verbose mode)"""
+        suite = self.suite_name()
+        self.reporter().row_finished(suite, test_case_num, passed, message)
+        type(self)._last_row = test_case_num
+        type(self)._last_row_failed = not passed
+        if not passed and self.artifacts:
+            self.capture_failure_artifacts(test_case_num, message)
+        key = type(self)._row_keys.get((suite, test_case_num)) if self.incremental else None
+        if key:
+            get_result_cache(self.result_cache_file).record(key, passed, suite, test_case_num)
     
     def extract_customer_info_from_xpath(self, xpath):
         """
@@ -0,0 +1,238 @@
+"""
+Benchmark Runner
+Runs the data-driven suites against the local Banking Project stand-in at
+several table sizes and fails when results regress past a stored baseline
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import unittest
+
+# Add current directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from CustomerManage import TEST_CLASSES
+from instrumentation import percentile
+from local_server import LocalBankingServer
+from parallel_runner import RowResultCollector
+from reporter import get_reporter
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Metrics compared against the baseline (higher is worse for all of them)
+GATED_METRICS = ('wall_s', 'row_p50_ms', 'row_p95_ms', 'memory_mb')
+
+# Row counts that fail the gate whenever they are non-zero
+FAILURE_METRICS = ('failed_rows', 'error_rows')
+
+
+class TimedRowCollector(RowResultCollector):
+    """Result collector that also times each subTest row"""
+
+    def __init__(self, suite_name=None):
+        super().__init__(suite_name=suite_name)
+        self.row_durations = []
+        self._row_start = None
+
+    def startTest(self, test):
+        super().startTest(test)
+        self._row_start = time.perf_counter()
+
+    def addSubTest(self, test, subtest, err):
+        now = time.perf_counter()
+        self.row_durations.append((now - self._row_start) * 1000.0)
+        self._row_start = now
+        super().addSubTest(test, subtest, err)
+
+
+def run_suite_once(test_class, site_url_base):
+    """
+    Run one test class against the stand-in, with console output suppressed
+
+    Args:
+        test_class (type): BaseDataDrivenTest subclass
+        site_url_base (str): Origin of the local stand-in
+
+    Returns:
+        dict: 'wall_s', 'row_ms' (list), 'memory_mb', 'failed' and 'errors' (row counts)
+    """
+    test_class.site_url_base = site_url_base
+    test_class.headless = True
+    test_class.collect_browser_memory = True
+    test_class.last_browser_memory = None
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    result = TimedRowCollector(suite_name=test_class.__name__)
+    start = time.perf_counter()
+    # Keep console I/O out of the measurement
+    with contextlib.redirect_stdout(io.StringIO()):
+        suite.run(result)
+    wall = time.perf_counter() - start
+
+    memory = test_class.last_browser_memory or {}
+    return {
+        'wall_s': wall,
+        'row_ms': result.row_durations,
+        'memory_mb': memory.get('js_heap_used_mb'),
+        'failed': sum(1 for record in result.records if record['outcome'] == 'failed'),
+        'errors': sum(1 for record in result.records if record['outcome'] == 'error'),
+    }
+
+
+def run_benchmarks(test_classes, row_counts, repeat, latency=0.0):
+    """
+    Run every suite `repeat` times for each fixture size
+
+    Args:
+        test_classes (list): BaseDataDrivenTest subclasses
+        row_counts (list): Customer counts served by the stand-in
+        repeat (int): Runs per suite and size
+        latency (float): Seconds of latency added to every stand-in response
+
+    Returns:
+        dict: {'rows=N': {suite: metrics}}
+    """
+    results = {}
+    for rows in row_counts:
+        server = LocalBankingServer(rows=rows, latency=latency).start()
+        size_key = f"rows={rows}"
+        results[size_key] = {}
+        try:
+            for test_class in test_classes:
+                runs = [run_suite_once(test_class, server.base_url) for _ in range(repeat)]
+                row_ms = [duration for run in runs for duration in run['row_ms']]
+                memory = [run['memory_mb'] for run in runs if run['memory_mb'] is not None]
+                metrics = {
+                    'runs': repeat,
+                    'wall_s': round(statistics.median(run['wall_s'] for run in runs), 3),
+                    'row_p50_ms': round(percentile(row_ms, 50), 1),
+                    'row_p95_ms': round(percentile(row_ms, 95), 1),
+                    'memory_mb': round(max(memory), 3) if memory else None,
+                    'failed_rows': sum(run['failed'] for run in runs),
+                    'error_rows': sum(run['errors'] for run in runs),
+                }
+                results[size_key][test_class.__name__] = metrics
+                print(f"  {size_key:<12} {test_class.__name__:<24} wall {metrics['wall_s']:>7.2f}s  "
+                      f"row p50 {metrics['row_p50_ms']:>8.1f}ms  p95 {metrics['row_p95_ms']:>8.1f}ms  "
+                      f"heap {metrics['memory_mb'] if metrics['memory_mb'] is not None else '-'} MB")
+        finally:
+            server.stop()
+    return results
+
+
+def compare_to_baseline(results, baseline, threshold):
+    """
+    Find metrics that got worse than the baseline by more than the threshold
+
+    Any failed or errored row also fails the gate, with or without a
+    baseline entry: a suite that stops early can look faster than before.
+
+    Args:
+        results (dict): Current benchmark results
+        baseline (dict): Stored baseline results
+        threshold (float): Allowed relative slowdown, e.g. 0.2 for 20%
+
+    Returns:
+        list: Human readable regression descriptions
+    """
+    regressions = []
+    for size_key, suites in results.items():
+        for suite, metrics in suites.items():
+            reference = baseline.get(size_key, {}).get(suite)
+            for metric in FAILURE_METRICS:
+                current = metrics.get(metric) or 0
+                if current:
+                    previous = (reference or {}).get(metric) or 0
+                    regressions.append(f"{size_key} {suite} {metric}: {previous} -> {current}")
+            if not reference:
+                continue
+            for metric in GATED_METRICS:
+                current, previous = metrics.get(metric), reference.get(metric)
+                if current is None or not previous:
+                    continue
+                change = (current - previous) / previous
+                if change > threshold:
+                    regressions.append(f"{size_key} {suite} {metric}: {previous} -> {current} "
+                                       f"(+{change * 100:.1f}%)")
+    return regressions
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Benchmark the data-driven suites against the local stand-in")
+    parser.add_argument("--rows", default="100,1000,10000",
+                        help="Comma-separated customer counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per suite and size")
+    parser.add_argument("--suites", default="",
+                        help="Comma-separated suite name prefixes (e.g. search,sort); default all")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Milliseconds of latency added to every stand-in response")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Allowed relative regression before failing (0.2 = 20%%)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Store this run as the new baseline instead of comparing")
+    parser.add_argument("--output", help="Also write this run's results to a JSON file")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    return args
+
+
+def main(argv=None):
+    """
+    Command line entry point
+
+    Returns:
+        int: Exit code (1 when a regression exceeds the threshold)
+    """
+    args = parse_args(argv)
+    row_counts = [int(rows) for rows in args.rows.split(',') if rows.strip()]
+    prefixes = [prefix.strip().lower() for prefix in args.suites.split(',') if prefix.strip()]
+    test_classes = [test_class for test_class in TEST_CLASSES
+                    if not prefixes or any(test_class.__name__.lower().startswith(p) for p in prefixes)]
+
+    print("\n" + "=" * 70)
+    print("DATA-DRIVEN TEST BENCHMARK")
+    print("=" * 70)
+    # Only the benchmark table goes to the console
+    get_reporter(progress=False, stream=open(os.devnull, 'w', encoding='utf-8'))
+    results = run_benchmarks(test_classes, row_counts, args.repeat, args.latency / 1000.0)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+        print(f"\n✓ Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠ No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+
+    print("\n" + "=" * 70)
+    if regressions:
+        print(f"✗ {len(regressions)} regression(s) or failing row count(s) (threshold {args.threshold * 100:.0f}%):")
+        for regression in regressions:
+            print(f"    {regression}")
+    else:
+        print(f"✓ No regressions over {args.threshold * 100:.0f}% against {os.path.basename(args.baseline)}")
+    print("=" * 70 + "\n")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
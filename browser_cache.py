@@ -0,0 +1,216 @@
+"""
+Shared Browser Disk Cache
+Seeds every Chrome session from a shared profile template (copy-on-start),
+writes newly cached assets back under a lock, and keeps the shared cache
+under a size cap by evicting the least recently written files
+"""
+
+from contextlib import contextmanager
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+# Profile directories holding HTTP and compiled-script caches; only these
+# are written back to the shared template
+CACHE_DIRS = (
+    os.path.join('Default', 'Cache'),
+    os.path.join('Default', 'Code Cache'),
+)
+
+# Files Chrome uses to claim a profile; never copied between sessions
+LOCK_FILES = ('SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile', 'LOCK')
+
+# Counts Resource Timing entries served from cache; cross-origin entries
+# without Timing-Allow-Origin report no sizes and are left out
+CACHE_HITS_SCRIPT = """
+    var entries = performance.getEntriesByType('navigation').concat(
+        performance.getEntriesByType('resource'));
+    var hits = 0, total = 0;
+    for (var i = 0; i < entries.length; i++) {
+        if (!entries[i].decodedBodySize) { continue; }
+        total++;
+        if (entries[i].transferSize === 0) { hits++; }
+    }
+    return {hits: hits, requests: total};
+"""
+
+
+class ProfileCache:
+    """Shared, size-capped profile template that sessions copy on start"""
+
+    def __init__(self, template_dir, max_bytes=500 * 1048576, write_back=True, lock_timeout=60):
+        """
+        Args:
+            template_dir (str): Shared cache / pre-warmed profile directory
+            max_bytes (int): Size cap for the cached files in the template
+            write_back (bool): Copy newly cached files back after each session;
+                               False keeps a pre-warmed template read-only
+            lock_timeout (float): Seconds after which a leftover lock is considered stale
+        """
+        self.template_dir = os.path.abspath(template_dir)
+        self.max_bytes = max_bytes
+        self.write_back = write_back
+        self.lock_timeout = lock_timeout
+        self.sessions = {}       # session profile dir -> file snapshot at start
+        self._lock = threading.Lock()
+        os.makedirs(self.template_dir, exist_ok=True)
+
+    def checkout(self):
+        """
+        Copy the template into a private profile directory for one session
+
+        Returns:
+            str: Profile directory to pass as --user-data-dir
+        """
+        session_dir = os.path.join(tempfile.mkdtemp(prefix='chrome-profile-'), 'profile')
+        with self._template_lock():
+            shutil.copytree(self.template_dir, session_dir,
+                            ignore=shutil.ignore_patterns(*LOCK_FILES, '.cache-lock', '*.tmp'))
+        with self._lock:
+            self.sessions[session_dir] = self._cache_files(session_dir)
+        return session_dir
+
+    def checkin(self, session_dir):
+        """
+        Write new cache files back to the template and delete the session copy
+
+        Call after the browser using session_dir has quit.
+
+        Args:
+            session_dir (str): Directory returned by checkout()
+        """
+        with self._lock:
+            before = self.sessions.pop(session_dir, {})
+        try:
+            if self.write_back:
+                changed = {path: stat for path, stat in self._cache_files(session_dir).items()
+                           if before.get(path) != stat}
+                if changed:
+                    with self._template_lock():
+                        # Oldest first, so eviction keeps the session's newest files
+                        for relative_path in sorted(changed, key=lambda path: changed[path][1]):
+                            self._copy_file(session_dir, relative_path)
+                        self.evict()
+        finally:
+            shutil.rmtree(os.path.dirname(session_dir), ignore_errors=True)
+
+    def evict(self):
+        """
+        Delete the least recently written cache files until the template fits max_bytes
+
+        Returns:
+            int: Bytes freed
+        """
+        files = []
+        total = 0
+        for relative_path, (size, mtime) in self._cache_files(self.template_dir).items():
+            files.append((mtime, size, relative_path))
+            total += size
+        freed = 0
+        for mtime, size, relative_path in sorted(files):
+            if total - freed <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.template_dir, relative_path))
+                freed += size
+            except OSError:
+                pass
+        return freed
+
+    def size(self):
+        """Bytes of cached files in the template"""
+        return sum(size for size, _ in self._cache_files(self.template_dir).values())
+
+    @staticmethod
+    def _cache_files(root):
+        """Map each file under CACHE_DIRS to its (size, mtime)"""
+        files = {}
+        for cache_dir in CACHE_DIRS:
+            for directory, _, names in os.walk(os.path.join(root, cache_dir)):
+                for name in names:
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files[os.path.relpath(path, root)] = (stat.st_size, stat.st_mtime)
+        return files
+
+    def _copy_file(self, session_dir, relative_path):
+        """Copy one file into the template atomically, so readers never see half a file"""
+        target = os.path.join(self.template_dir, relative_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temporary = f"{target}.{os.getpid()}.tmp"
+        try:
+            shutil.copy2(os.path.join(session_dir, relative_path), temporary)
+            os.replace(temporary, target)
+            # Eviction order follows the last write-back, not Chrome's mtime
+            os.utime(target)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+    @contextmanager
+    def _template_lock(self):
+        """Cross-process lock on the template (a lock file created exclusively)"""
+        lock_path = os.path.join(self.template_dir, '.cache-lock')
+        while True:
+            try:
+                handle = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > self.lock_timeout:
+                        # Left behind by a worker that crashed mid write-back
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    continue
+                time.sleep(0.05)
+        try:
+            os.write(handle, str(os.getpid()).encode('ascii'))
+            yield
+        finally:
+            os.close(handle)
+            os.remove(lock_path)
+
+
+def page_cache_hits(driver):
+    """
+    Count the current page's resources that were served from cache
+
+    Args:
+        driver (WebDriver): Driver showing a freshly loaded page
+
+    Returns:
+        dict: 'hits' and 'requests', or None if the page cannot be read
+    """
+    try:
+        return driver.execute_script(CACHE_HITS_SCRIPT)
+    except Exception:
+        return None
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_profile_cache(template_dir, max_bytes=500 * 1048576, write_back=True):
+    """
+    Get this process's ProfileCache for a template directory
+
+    Args:
+        template_dir (str): Shared cache / pre-warmed profile directory
+        max_bytes (int): Size cap used when the cache is first created
+        write_back (bool): Write-back mode used when the cache is first created
+
+    Returns:
+        ProfileCache: Cache for the directory
+    """
+    key = os.path.abspath(template_dir)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ProfileCache(key, max_bytes=max_bytes, write_back=write_back)
+        return _caches[key]
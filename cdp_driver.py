@@ -0,0 +1,848 @@
+"""
+Chrome DevTools Protocol Driver Backend
+Drives Chrome directly over its DevTools websocket with asyncio instead of
+through chromedriver: one browser process, one multiplexed connection,
+many tabs, and event subscriptions instead of polling. CDPTab exposes the
+subset of the Selenium WebDriver API the suites use, so the same test
+code runs on either backend.
+"""
+
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from urllib.parse import urlsplit
+import asyncio
+import atexit
+import base64
+import itertools
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from selenium.common.exceptions import (JavascriptException, NoSuchElementException,
+                                        StaleElementReferenceException, TimeoutException,
+                                        WebDriverException)
+
+
+class WebSocketClient:
+    """Minimal RFC 6455 client on asyncio streams (text frames, no extensions)"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._fragments = []
+
+    @classmethod
+    async def connect(cls, url, timeout=10):
+        """
+        Open a websocket connection
+
+        Args:
+            url (str): ws:// URL
+            timeout (float): Seconds allowed for the handshake
+
+        Returns:
+            WebSocketClient: Connected client
+        """
+        parts = urlsplit(url)
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parts.hostname, parts.port or 80, limit=2 ** 26), timeout)
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        path = parts.path + (f"?{parts.query}" if parts.query else '')
+        writer.write((f"GET {path or '/'} HTTP/1.1\r\n"
+                      f"Host: {parts.netloc}\r\n"
+                      "Upgrade: websocket\r\n"
+                      "Connection: Upgrade\r\n"
+                      f"Sec-WebSocket-Key: {key}\r\n"
+                      "Sec-WebSocket-Version: 13\r\n\r\n").encode('ascii'))
+        await writer.drain()
+        response = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout)
+        status = response.split(b'\r\n', 1)[0]
+        if b' 101 ' not in status + b' ':
+            writer.close()
+            raise WebDriverException(f"DevTools websocket handshake failed: {status.decode('latin-1')}")
+        return cls(reader, writer)
+
+    async def send(self, text):
+        """Send one masked text frame"""
+        payload = text.encode('utf-8')
+        header = bytearray([0x81])
+        if len(payload) < 126:
+            header.append(0x80 | len(payload))
+        elif len(payload) < 65536:
+            header.append(0x80 | 126)
+            header += struct.pack('!H', len(payload))
+        else:
+            header.append(0x80 | 127)
+            header += struct.pack('!Q', len(payload))
+        mask = os.urandom(4)
+        self.writer.write(bytes(header) + mask + self._mask(payload, mask))
+        await self.writer.drain()
+
+    @staticmethod
+    def _mask(payload, mask):
+        """XOR a payload with the repeated 4-byte mask"""
+        repeated = (mask * (len(payload) // 4 + 1))[:len(payload)]
+        return (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(len(payload), 'big')
+
+    async def recv(self):
+        """
+        Receive the next text message, answering pings along the way
+
+        Returns:
+            str: Message, or None once the connection is closed
+        """
+        while True:
+            try:
+                first, second = await self.reader.readexactly(2)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return None
+            opcode = first & 0x0F
+            length = second & 0x7F
+            if length == 126:
+                length = struct.unpack('!H', await self.reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack('!Q', await self.reader.readexactly(8))[0]
+            mask = await self.reader.readexactly(4) if second & 0x80 else None
+            payload = await self.reader.readexactly(length)
+            if mask:
+                payload = self._mask(payload, mask)
+
+            if opcode == 0x8:
+                return None
+            if opcode == 0x9:
+                await self._send_control(0xA, payload)
+                continue
+            if opcode in (0x1, 0x2, 0x0):
+                self._fragments.append(payload)
+                if first & 0x80:
+                    message, self._fragments = b''.join(self._fragments), []
+                    return message.decode('utf-8')
+
+    async def _send_control(self, opcode, payload=b''):
+        """Send a masked control frame (pong or close)"""
+        mask = os.urandom(4)
+        self.writer.write(bytes([0x80 | opcode, 0x80 | len(payload)]) + mask + self._mask(payload, mask))
+        await self.writer.drain()
+
+    async def close(self):
+        """Send a close frame and close the socket"""
+        try:
+            await self._send_control(0x8)
+        except Exception:
+            pass
+        self.writer.close()
+
+
+class CDPConnection:
+    """DevTools protocol session multiplexer over one browser websocket"""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self._ids = itertools.count(1)
+        self._pending = {}       # command id -> asyncio.Future
+        self._listeners = {}     # (method, session id) -> [callback]
+        self._listeners_lock = threading.Lock()
+        self._reader = asyncio.ensure_future(self._read_loop())
+
+    async def send(self, method, params=None, session_id=None):
+        """
+        Send a command and wait for its result
+
+        Args:
+            method (str): Protocol method, e.g. 'Page.navigate'
+            params (dict): Method parameters
+            session_id (str): Target session (flattened mode); None for the browser
+
+        Returns:
+            dict: Command result
+
+        Raises:
+            WebDriverException: If the browser answers with an error
+        """
+        command_id = next(self._ids)
+        message = {'id': command_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command_id] = future
+        await self.websocket.send(json.dumps(message))
+        return await future
+
+    def on(self, method, callback, session_id=None):
+        """
+        Subscribe to an event; safe to call from any thread
+
+        Args:
+            method (str): Event name, e.g. 'Page.loadEventFired'
+            callback (callable): Called with the event params on the event loop
+            session_id (str): Only events of this target session
+
+        Returns:
+            callable: Unsubscribes the callback
+        """
+        key = (method, session_id)
+        with self._listeners_lock:
+            self._listeners.setdefault(key, []).append(callback)
+
+        def unsubscribe():
+            with self._listeners_lock:
+                if callback in self._listeners.get(key, []):
+                    self._listeners[key].remove(callback)
+        return unsubscribe
+
+    async def _read_loop(self):
+        """Route responses to their commands and events to their listeners"""
+        while True:
+            text = await self.websocket.recv()
+            if text is None:
+                break
+            message = json.loads(text)
+            if 'id' in message:
+                future = self._pending.pop(message['id'], None)
+                if future is None or future.done():
+                    continue
+                if 'error' in message:
+                    error = message['error']
+                    future.set_exception(WebDriverException(f"{error.get('message')} ({error.get('code')})"))
+                else:
+                    future.set_result(message.get('result', {}))
+            else:
+                key = (message.get('method'), message.get('sessionId'))
+                with self._listeners_lock:
+                    callbacks = list(self._listeners.get(key, ()))
+                for callback in callbacks:
+                    try:
+                        callback(message.get('params', {}))
+                    except Exception:
+                        pass
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(WebDriverException("DevTools connection closed"))
+        self._pending.clear()
+
+    async def close(self):
+        """Close the websocket"""
+        await self.websocket.close()
+        self._reader.cancel()
+
+
+def find_chrome_binary(chrome_options=None):
+    """
+    Locate the Chrome executable
+
+    Args:
+        chrome_options (Options): Options whose binary_location wins if set
+
+    Returns:
+        str: Path to Chrome
+
+    Raises:
+        WebDriverException: If Chrome cannot be found
+    """
+    candidates = [getattr(chrome_options, 'binary_location', None), os.environ.get('CHROME_BINARY')]
+    for name in ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome'):
+        candidates.append(shutil.which(name))
+    if sys.platform == 'darwin':
+        candidates.append('/Applications/Google Chrome.app/Contents/MacOS/Google Chrome')
+    elif sys.platform.startswith('win'):
+        for root in (os.environ.get('PROGRAMFILES'), os.environ.get('PROGRAMFILES(X86)'),
+                     os.environ.get('LOCALAPPDATA')):
+            if root:
+                candidates.append(os.path.join(root, 'Google', 'Chrome', 'Application', 'chrome.exe'))
+    for candidate in candidates:
+        if candidate and os.path.exists(candidate):
+            return candidate
+    raise WebDriverException("Chrome executable not found; set CHROME_BINARY")
+
+
+class CDPBrowser:
+    """One Chrome process driven over DevTools; hands out tabs"""
+
+    def __init__(self, chrome_options=None, launch_timeout=20, on_close=None):
+        """
+        Args:
+            chrome_options (Options): Chrome options (arguments and binary_location are used)
+            launch_timeout (float): Seconds to wait for Chrome's DevTools endpoint
+            on_close (callable): Called after the browser process has exited
+        """
+        self.on_close = on_close
+        self.tabs = []
+        arguments = list(getattr(chrome_options, 'arguments', []))
+        user_data_dir = next((argument.split('=', 1)[1] for argument in arguments
+                              if argument.startswith('--user-data-dir=')), None)
+        self._own_profile = user_data_dir is None
+        if self._own_profile:
+            user_data_dir = tempfile.mkdtemp(prefix='cdp-profile-')
+            arguments.append(f"--user-data-dir={user_data_dir}")
+        self.user_data_dir = user_data_dir
+        port_file = os.path.join(user_data_dir, 'DevToolsActivePort')
+        if os.path.exists(port_file):
+            os.remove(port_file)
+
+        self.process = subprocess.Popen(
+            [find_chrome_binary(chrome_options), *arguments, '--remote-debugging-port=0', 'about:blank'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + launch_timeout
+        while not os.path.exists(port_file) or os.path.getsize(port_file) == 0:
+            if self.process.poll() is not None or time.monotonic() > deadline:
+                self.process.kill()
+                raise WebDriverException("Chrome did not open its DevTools port")
+            time.sleep(0.05)
+        with open(port_file, 'r', encoding='utf-8') as file:
+            port, path = file.read().split()[:2]
+
+        # The event loop runs on its own thread; sync callers submit coroutines to it
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='cdp-loop', daemon=True)
+        self._thread.start()
+        self.connection = self.run(self._connect(f"ws://127.0.0.1:{port}{path}"))
+        self._closed = False
+
+    async def _connect(self, url):
+        return CDPConnection(await WebSocketClient.connect(url))
+
+    def run(self, coroutine, timeout=None):
+        """
+        Run a coroutine on the browser's event loop and wait for it
+
+        Args:
+            coroutine (coroutine): Work to run
+            timeout (float): Seconds to wait (None waits forever)
+
+        Returns:
+            Any: Coroutine result
+
+        Raises:
+            TimeoutException: If the coroutine does not finish in time
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutException(f"DevTools call did not finish within {timeout}s")
+
+    def send(self, method, params=None, session_id=None, timeout=None):
+        """Send a protocol command from synchronous code"""
+        return self.run(self.connection.send(method, params, session_id), timeout)
+
+    async def new_tab_async(self, url='about:blank'):
+        """
+        Open a tab and attach a flattened session to it (for asyncio callers)
+
+        Returns:
+            tuple: (target id, session id)
+        """
+        target = await self.connection.send('Target.createTarget', {'url': url})
+        attached = await self.connection.send('Target.attachToTarget',
+                                              {'targetId': target['targetId'], 'flatten': True})
+        session_id = attached['sessionId']
+        await asyncio.gather(self.connection.send('Page.enable', {}, session_id),
+                             self.connection.send('Runtime.enable', {}, session_id))
+        return target['targetId'], session_id
+
+    def new_tab(self, url='about:blank'):
+        """
+        Open a tab with a WebDriver-like interface
+
+        Tabs share the browser process and connection, and can be driven
+        from different threads at the same time.
+
+        Returns:
+            CDPTab: New tab
+        """
+        target_id, session_id = self.run(self.new_tab_async(url), timeout=30)
+        tab = CDPTab(self, target_id, session_id)
+        self.tabs.append(tab)
+        return tab
+
+    def close(self):
+        """Close the connection and stop the browser process"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.send('Browser.close', timeout=5)
+        except Exception:
+            pass
+        try:
+            self.run(self.connection.close(), timeout=5)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        if self._own_profile:
+            shutil.rmtree(self.user_data_dir, ignore_errors=True)
+        if self.on_close:
+            self.on_close()
+
+
+class _SwitchTo:
+    """driver.switch_to stand-in: a CDPTab is always its own single window"""
+
+    def __init__(self, tab):
+        self.tab = tab
+
+    def window(self, handle):
+        if handle != self.tab.target_id:
+            raise WebDriverException(f"Unknown window handle: {handle}")
+
+
+class CDPTab:
+    """A browser tab with the subset of the WebDriver API used by the suites"""
+
+    # Wraps a script body like Selenium's execute_script: elements come back
+    # as remote objects, everything else as JSON
+    SCRIPT_WRAPPER = """(function () {
+        var result = (function () { %s }).apply(window, %s);
+        return (result instanceof Node) ? result : JSON.stringify(result === undefined ? null : result);
+    })()"""
+
+    ASYNC_SCRIPT_WRAPPER = """new Promise(function (resolve) {
+        var args = %s;
+        args.push(function (result) {
+            resolve((result instanceof Node) ? result : JSON.stringify(result === undefined ? null : result));
+        });
+        (function () { %s }).apply(window, args);
+    })"""
+
+    # Resolves on the next DOM mutation (or after arguments[0] ms), so waits
+    # re-check their condition when the page changes instead of every 500 ms
+    DOM_CHANGE_SCRIPT = """
+        var done = arguments[arguments.length - 1];
+        var observer = new MutationObserver(function () { observer.disconnect(); done(true); });
+        observer.observe(document.documentElement,
+                         {childList: true, subtree: true, attributes: true, characterData: true});
+        setTimeout(function () { observer.disconnect(); done(false); }, arguments[0]);
+    """
+
+    # Selenium locator strategies evaluated in the page
+    FIND_ELEMENTS_SCRIPT = """
+        var by = arguments[0], value = arguments[1], root = arguments[2] || document, found = [];
+        if (by === 'css selector') {
+            found = root.querySelectorAll(value);
+        } else if (by === 'id') {
+            found = root.querySelectorAll('[id="' + CSS.escape(value) + '"]');
+        } else if (by === 'name') {
+            found = root.querySelectorAll('[name="' + CSS.escape(value) + '"]');
+        } else if (by === 'class name') {
+            found = root.getElementsByClassName(value);
+        } else if (by === 'tag name') {
+            found = root.getElementsByTagName(value);
+        } else if (by === 'xpath') {
+            var snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var i = 0; i < snapshot.snapshotLength; i++) { found.push(snapshot.snapshotItem(i)); }
+        } else if (by === 'link text' || by === 'partial link text') {
+            var anchors = root.getElementsByTagName('a');
+            for (var j = 0; j < anchors.length; j++) {
+                var text = (anchors[j].innerText || anchors[j].textContent).trim();
+                if (by === 'link text' ? text === value : text.indexOf(value) !== -1) { found.push(anchors[j]); }
+            }
+        }
+        return Array.prototype.slice.call(found);
+    """
+
+    def __init__(self, browser, target_id, session_id):
+        """
+        Args:
+            browser (CDPBrowser): Owning browser
+            target_id (str): DevTools target id (also the window handle)
+            session_id (str): Flattened session id
+        """
+        self.browser = browser
+        self.target_id = target_id
+        self.session_id = session_id
+        self.page_load_timeout = 300
+        self.script_timeout = 30
+        self.switch_to = _SwitchTo(self)
+        self._network_log = None
+        self._console_log = None
+        self._closed = False
+
+    # -- protocol access -------------------------------------------------
+
+    def execute(self, driver_command, params=None):
+        """
+        Send a DevTools command to this tab (the hook instrumentation wraps)
+
+        Args:
+            driver_command (str): Protocol method
+            params (dict): Method parameters
+
+        Returns:
+            dict: Command result
+        """
+        return self.browser.send(driver_command, params, self.session_id, timeout=self.script_timeout + 5)
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        """Send a raw DevTools command (same signature as Chrome WebDriver)"""
+        return self.execute(cmd, cmd_args)
+
+    def on(self, method, callback):
+        """
+        Subscribe to a DevTools event of this tab
+
+        Args:
+            method (str): Event name
+            callback (callable): Called with the event params (on the event loop thread)
+
+        Returns:
+            callable: Unsubscribes the callback
+        """
+        return self.browser.connection.on(method, callback, self.session_id)
+
+    def expect_event(self, method, predicate=None):
+        """
+        Start listening for an event before triggering it
+
+        Args:
+            method (str): Event name
+            predicate (callable): Optional filter on the event params
+
+        Returns:
+            Future: Resolves with the first matching event's params
+        """
+        future = Future()
+
+        def callback(params):
+            if not future.done() and (predicate is None or predicate(params)):
+                future.set_result(params)
+
+        unsubscribe = self.on(method, callback)
+        future.add_done_callback(lambda _: unsubscribe())
+        return future
+
+    # -- navigation and scripts ------------------------------------------
+
+    def get(self, url):
+        """
+        Navigate and wait for the load event (no polling)
+
+        Raises:
+            TimeoutException: If the page does not load within page_load_timeout
+        """
+        loaded = self.expect_event('Page.loadEventFired')
+        try:
+            result = self.execute('Page.navigate', {'url': url})
+            if result.get('errorText'):
+                raise WebDriverException(f"Navigation to {url} failed: {result['errorText']}")
+            if result.get('loaderId'):
+                loaded.result(self.page_load_timeout)
+        except FutureTimeoutError:
+            raise TimeoutException(f"Page load did not finish within {self.page_load_timeout}s")
+        finally:
+            loaded.cancel()
+
+    def execute_script(self, script, *args):
+        """Run a script body with arguments; returns elements, JSON values or None"""
+        if any(isinstance(arg, CDPElement) for arg in args):
+            return self._call_with_elements(script, args)
+        expression = self.SCRIPT_WRAPPER % (script, json.dumps(list(args)))
+        return self._unwrap(self.execute('Runtime.evaluate', {'expression': expression}))
+
+    def execute_async_script(self, script, *args):
+        """Run a script body whose last argument is a completion callback"""
+        expression = self.ASYNC_SCRIPT_WRAPPER % (json.dumps(list(args)), script)
+        return self._unwrap(self.execute('Runtime.evaluate', {'expression': expression, 'awaitPromise': True}))
+
+    def _call_with_elements(self, script, args):
+        """execute_script with element arguments, via Runtime.callFunctionOn"""
+        target = next(arg for arg in args if isinstance(arg, CDPElement))
+        arguments = [{'objectId': arg.object_id} if isinstance(arg, CDPElement) else {'value': arg}
+                     for arg in args]
+        declaration = ("function () { var result = (function () { %s }).apply(window, arguments);"
+                       " return (result instanceof Node) ? result :"
+                       " JSON.stringify(result === undefined ? null : result); }" % script)
+        return self._unwrap(self.execute('Runtime.callFunctionOn', {
+            'objectId': target.object_id, 'functionDeclaration': declaration, 'arguments': arguments}))
+
+    def _unwrap(self, response):
+        """Convert a Runtime result into a Python value or CDPElement"""
+        if 'exceptionDetails' in response:
+            details = response['exceptionDetails']
+            description = details.get('exception', {}).get('description') or details.get('text')
+            if 'stale element reference' in str(description):
+                raise StaleElementReferenceException(description)
+            raise JavascriptException(description)
+        result = response['result']
+        if result.get('subtype') == 'node':
+            return CDPElement(self, result['objectId'])
+        if result.get('type') == 'string':
+            return json.loads(result['value'])
+        return result.get('value')
+
+    def wait_until(self, condition, timeout):
+        """
+        Wait for a WebDriverWait-style condition, re-checking on DOM changes
+
+        Args:
+            condition (callable): Called with this tab; a truthy result ends the wait
+            timeout (float): Seconds to wait
+
+        Returns:
+            Any: The condition's result
+
+        Raises:
+            TimeoutException: If the condition stays falsy
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                value = condition(self)
+            except (NoSuchElementException, StaleElementReferenceException):
+                value = False
+            if value:
+                return value
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(f"Condition not met within {timeout}s")
+            try:
+                self.execute_async_script(self.DOM_CHANGE_SCRIPT, int(min(remaining, 1.0) * 1000))
+            except WebDriverException:
+                # Page is navigating; its new document has no observer yet
+                time.sleep(0.05)
+
+    # -- elements ----------------------------------------------------------
+
+    def find_element(self, by='id', value=None, root=None):
+        """Find the first matching element (Selenium By strategies)"""
+        elements = self.find_elements(by, value, root)
+        if not elements:
+            raise NoSuchElementException(f"No element matches {by}={value}")
+        return elements[0]
+
+    def find_elements(self, by='id', value=None, root=None):
+        """Find all matching elements"""
+        if root:
+            response = self.execute('Runtime.callFunctionOn', {
+                'objectId': root.object_id,
+                'functionDeclaration': "function () { %s }" % self.FIND_ELEMENTS_SCRIPT,
+                'arguments': [{'value': by}, {'value': value}, {'objectId': root.object_id}]})
+        else:
+            expression = "(function () { %s }).apply(window, %s)" % (self.FIND_ELEMENTS_SCRIPT,
+                                                                    json.dumps([by, value, None]))
+            response = self.execute('Runtime.evaluate', {'expression': expression})
+        if 'exceptionDetails' in response:
+            self._unwrap(response)
+        properties = self.execute('Runtime.getProperties', {'objectId': response['result']['objectId'],
+                                                            'ownProperties': True})
+        elements = [(int(prop['name']), CDPElement(self, prop['value']['objectId']))
+                    for prop in properties['result']
+                    if prop['name'].isdigit() and prop.get('value', {}).get('subtype') == 'node']
+        return [element for _, element in sorted(elements, key=lambda item: item[0])]
+
+    # -- WebDriver housekeeping --------------------------------------------
+
+    @property
+    def current_url(self):
+        return self.execute_script("return location.href;")
+
+    @property
+    def title(self):
+        return self.execute_script("return document.title;")
+
+    @property
+    def page_source(self):
+        return self.execute_script("return document.documentElement.outerHTML;")
+
+    @property
+    def window_handles(self):
+        return [] if self._closed else [self.target_id]
+
+    def get_screenshot_as_png(self):
+        """PNG bytes of the viewport"""
+        return base64.b64decode(self.execute('Page.captureScreenshot', {'format': 'png'})['data'])
+
+    def save_screenshot(self, filename):
+        with open(filename, 'wb') as file:
+            file.write(self.get_screenshot_as_png())
+        return True
+
+    def get_log(self, log_type):
+        """
+        Buffered Network.* events in chromedriver's 'performance' log format,
+        or console messages in its 'browser' log format
+
+        The first call starts recording and returns an empty list.
+        """
+        if log_type == 'browser':
+            return self._get_console_log()
+        if log_type != 'performance':
+            return []
+        if self._network_log is None:
+            self._network_log = []
+            for method in ('Network.requestWillBeSent', 'Network.loadingFinished', 'Network.loadingFailed'):
+                self.on(method, lambda params, method=method: self._network_log.append(
+                    {'message': json.dumps({'message': {'method': method, 'params': params}})}))
+            self.execute('Network.enable', {})
+            return []
+        entries, self._network_log[:] = list(self._network_log), []
+        return entries
+
+    def _get_console_log(self):
+        """Console API calls and browser log entries since the last call"""
+        if self._console_log is None:
+            self._console_log = []
+
+            def console_called(params):
+                text = ' '.join(str(arg.get('value', arg.get('description', ''))) for arg in params.get('args', []))
+                self._console_log.append({'level': params.get('type', 'log').upper(), 'source': 'console-api',
+                                          'message': text, 'timestamp': int(params.get('timestamp', 0))})
+
+            def entry_added(params):
+                entry = params['entry']
+                self._console_log.append({'level': entry['level'].upper(), 'source': entry['source'],
+                                          'message': entry['text'], 'timestamp': int(entry['timestamp'])})
+
+            self.on('Runtime.consoleAPICalled', console_called)
+            self.on('Log.entryAdded', entry_added)
+            self.execute('Runtime.enable', {})
+            self.execute('Log.enable', {})
+            return []
+        entries, self._console_log[:] = list(self._console_log), []
+        return entries
+
+    def set_page_load_timeout(self, time_to_wait):
+        self.page_load_timeout = time_to_wait
+
+    def set_script_timeout(self, time_to_wait):
+        self.script_timeout = time_to_wait
+
+    def implicitly_wait(self, time_to_wait):
+        # Waits are explicit and event driven on this backend
+        pass
+
+    def maximize_window(self):
+        pass
+
+    def delete_all_cookies(self):
+        self.execute('Network.clearBrowserCookies', {})
+
+    def close(self):
+        """Close this tab"""
+        if not self._closed:
+            self._closed = True
+            self.browser.send('Target.closeTarget', {'targetId': self.target_id}, timeout=10)
+            if self in self.browser.tabs:
+                self.browser.tabs.remove(self)
+
+    def quit(self):
+        """Close this tab; the shared browser process is stopped by close_cdp_browsers()"""
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class CDPElement:
+    """A DOM element held as a DevTools remote object"""
+
+    def __init__(self, tab, object_id):
+        self.tab = tab
+        self.object_id = object_id
+
+    def _call(self, body, *args):
+        """Run a function body with this element as `this`"""
+        declaration = ("function () { if (!this.isConnected) { throw new Error('stale element reference'); }"
+                       " var result = (function () { %s }).apply(this, arguments);"
+                       " return JSON.stringify(result === undefined ? null : result); }" % body)
+        try:
+            response = self.tab.execute('Runtime.callFunctionOn', {
+                'objectId': self.object_id, 'functionDeclaration': declaration,
+                'arguments': [{'value': arg} for arg in args]})
+        except WebDriverException as e:
+            # The remote object died with its document (e.g. after navigation)
+            raise StaleElementReferenceException(str(e))
+        return self.tab._unwrap(response)
+
+    def click(self):
+        """Scroll into view and click with real mouse events at the element's center"""
+        x, y = self._call("this.scrollIntoView({block: 'center', inline: 'center'});"
+                          " var box = this.getBoundingClientRect();"
+                          " return [box.left + box.width / 2, box.top + box.height / 2];")
+        for event_type in ('mouseMoved', 'mousePressed', 'mouseReleased'):
+            params = {'type': event_type, 'x': x, 'y': y}
+            if event_type != 'mouseMoved':
+                params.update({'button': 'left', 'clickCount': 1})
+            self.tab.execute('Input.dispatchMouseEvent', params)
+
+    def clear(self):
+        """Empty a text field, firing the events AngularJS listens for"""
+        self._call("this.focus(); this.value = '';"
+                   " this.dispatchEvent(new Event('input', {bubbles: true}));"
+                   " this.dispatchEvent(new Event('change', {bubbles: true}));")
+
+    def send_keys(self, *value):
+        """Focus the element and type text as trusted input"""
+        self._call("this.focus();")
+        self.tab.execute('Input.insertText', {'text': ''.join(str(part) for part in value)})
+
+    def is_displayed(self):
+        return self._call("var style = getComputedStyle(this);"
+                          " return style.visibility !== 'hidden' && style.display !== 'none' &&"
+                          " !!(this.offsetWidth || this.offsetHeight || this.getClientRects().length);")
+
+    def is_enabled(self):
+        return self._call("return !this.disabled;")
+
+    def get_attribute(self, name):
+        return self._call("return (arguments[0] in this && typeof this[arguments[0]] !== 'function')"
+                          " ? this[arguments[0]] : this.getAttribute(arguments[0]);", name)
+
+    @property
+    def text(self):
+        return self._call("return (this.innerText || '').trim();")
+
+    @property
+    def tag_name(self):
+        return self._call("return this.tagName.toLowerCase();")
+
+    def find_element(self, by='id', value=None):
+        return self.tab.find_element(by, value, root=self)
+
+    def find_elements(self, by='id', value=None):
+        return self.tab.find_elements(by, value, root=self)
+
+
+_browsers = {}
+_browsers_lock = threading.Lock()
+_atexit_registered = False
+
+
+def get_cdp_browser(key, launch):
+    """
+    Get this process's browser for a Chrome configuration, launching it on first use
+
+    Args:
+        key (hashable): Configuration key, e.g. the Chrome arguments
+        launch (callable): Returns a new CDPBrowser when none is running for the key
+
+    Returns:
+        CDPBrowser: Shared browser; open tabs with new_tab()
+    """
+    global _atexit_registered
+    with _browsers_lock:
+        browser = _browsers.get(key)
+        if browser is None or browser.process.poll() is not None:
+            if not _atexit_registered:
+                atexit.register(close_cdp_browsers)
+                _atexit_registered = True
+            browser = _browsers[key] = launch()
+        return browser
+
+
+def close_cdp_browsers():
+    """Stop every browser started by get_cdp_browser()"""
+    with _browsers_lock:
+        browsers = list(_browsers.values())
+        _browsers.clear()
+    for browser in browsers:
+        browser.close()
@@ -0,0 +1,508 @@
+"""
+Distributed Test Runner
+A coordinator hands CSV-row shards to worker nodes over a small HTTP/JSON
+protocol; nodes on any number of build agents pull shards, send heartbeats
+and steal queued shards from busy nodes
+"""
+
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import importlib
+import json
+import math
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+import traceback
+import urllib.error
+import urllib.request
+
+from parallel_runner import _init_worker, run_shard
+from reporter import get_reporter
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def class_path(test_class):
+    """
+    Importable name of a test class, sent to nodes instead of the class
+
+    Args:
+        test_class (type): Test class
+
+    Returns:
+        str: e.g. 'TestSuite.CustomerManage.SortDataDriven:SortDataDrivenTest'
+    """
+    return f"{test_class.__module__}:{test_class.__qualname__}"
+
+
+def load_class(path):
+    """
+    Import a test class from its class_path()
+
+    Args:
+        path (str): 'module:ClassName'
+
+    Returns:
+        type: The test class
+    """
+    module_name, _, name = path.partition(':')
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    return getattr(importlib.import_module(module_name), name)
+
+
+def error_record(suite, test, message, trace=''):
+    """Result record for a shard that produced no row results"""
+    return {'suite': suite, 'test': test, 'test_case': None, 'params': {},
+            'outcome': 'error', 'message': message, 'traceback': trace}
+
+
+class CoordinatorHandler(BaseHTTPRequestHandler):
+    """JSON endpoints nodes call to register, lease shards, heartbeat and report results"""
+
+    ROUTES = {
+        '/register': 'register',
+        '/lease': 'lease',
+        '/heartbeat': 'heartbeat',
+        '/result': 'result',
+    }
+
+    def do_POST(self):
+        method = self.ROUTES.get(urlsplit(self.path).path)
+        if method is None:
+            self._respond(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            reply = getattr(self.server, method)(payload)
+        except (ValueError, KeyError) as e:
+            self._respond(400, {'error': f"{type(e).__name__}: {str(e)}"})
+            return
+        self._respond(200, reply)
+
+    def do_GET(self):
+        if urlsplit(self.path).path == '/status':
+            self._respond(200, self.server.status())
+        else:
+            self._respond(404, {'error': 'not found'})
+
+    def _respond(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep test output clean
+        pass
+
+
+class Coordinator(ThreadingHTTPServer):
+    """
+    Hands out shards of every test class to worker nodes until all have results
+
+    Each node owns a queue of shards. A node takes work from its own
+    queue first, then a fair share of the unowned shards, and once both
+    are empty it steals the back half of the longest queue, so nodes that
+    join late or run fast shards keep busy. A node that misses heartbeats
+    for heartbeat_timeout is presumed dead and its shards are handed out
+    again; the first result for a shard wins.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, test_classes, shard_count=8, class_config=None, host='127.0.0.1', port=0,
+                 heartbeat_interval=5.0, heartbeat_timeout=30.0, max_attempts=3):
+        """
+        Args:
+            test_classes (list): BaseDataDrivenTest subclasses (or their class_path()) to run
+            shard_count (int): Shards each class's CSV rows are split into
+            class_config (dict): Class attributes sent to every node (JSON-serializable)
+            host (str): Interface to bind ('0.0.0.0' to accept remote nodes)
+            port (int): Port to bind (0 picks a free port)
+            heartbeat_interval (float): Seconds between node heartbeats
+            heartbeat_timeout (float): Seconds of silence after which a node is presumed dead
+            max_attempts (int): Nodes a shard may be lost with before it is reported as an error
+        """
+        super().__init__((host, port), CoordinatorHandler)
+        self.class_config = dict(class_config or {})
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.units = {}
+        for test_class in test_classes:
+            path = test_class if isinstance(test_class, str) else class_path(test_class)
+            suite = path.rpartition(':')[2]
+            for shard_index in range(shard_count):
+                unit_id = f"{suite}/{shard_index + 1}"
+                self.units[unit_id] = {'id': unit_id, 'class': path, 'suite': suite,
+                                       'shard_index': shard_index, 'shard_count': shard_count}
+        self.unowned = deque(self.units)    # unit ids no node has taken yet
+        self.queues = {}                    # node id -> deque of unit ids
+        self.nodes = {}                     # node id -> node state
+        self.leases = {}                    # unit id -> node id running it
+        self.attempts = {}                  # unit id -> nodes lost while running it
+        self.results = {}                   # unit id -> result records
+        self.steals = 0
+        self.reassigned = 0
+        self._condition = threading.Condition()
+        self._thread = None
+
+    @property
+    def url(self):
+        """URL nodes on this machine use, e.g. http://127.0.0.1:8790"""
+        host, port = self.server_address[:2]
+        return f"http://{'127.0.0.1' if host in ('0.0.0.0', '') else host}:{port}"
+
+    @property
+    def finished(self):
+        """Whether every shard has a result"""
+        return len(self.results) == len(self.units)
+
+    def register(self, payload):
+        """Add a node; returns its id, the class config and the heartbeat interval"""
+        with self._condition:
+            node_id = f"{payload.get('name') or 'node'}#{len(self.nodes) + 1}"
+            self.nodes[node_id] = {'name': payload.get('name'), 'last_seen': time.monotonic(),
+                                   'alive': True, 'released': False, 'shards': 0, 'rows': 0}
+            self.queues[node_id] = deque()
+            return {'node_id': node_id, 'config': self.class_config,
+                    'heartbeat_interval': self.heartbeat_interval}
+
+    def heartbeat(self, payload):
+        """Note that a node is alive"""
+        with self._condition:
+            self._touch(payload['node_id'])
+            self._reap()
+            return {'ok': True}
+
+    def lease(self, payload):
+        """
+        Give a node its next shard
+
+        Returns:
+            dict: {'unit': shard}, {'wait': seconds} while other nodes hold the
+                  last shards, or {'done': True} once every shard has a result
+        """
+        with self._condition:
+            node_id = payload['node_id']
+            self._touch(node_id)
+            self._reap()
+            queue = self.queues[node_id]
+            if not queue and self.unowned:
+                # A fair share of the unowned shards, kept in class order so
+                # the node reuses its warm browser and loaded page
+                alive = sum(1 for node in self.nodes.values() if node['alive'])
+                share = math.ceil(len(self.unowned) / max(alive, 1))
+                queue.extend(self.unowned.popleft() for _ in range(share))
+            if not queue:
+                self._steal(node_id)
+            while queue:
+                unit_id = queue.popleft()
+                if unit_id not in self.results:
+                    self.leases[unit_id] = node_id
+                    return {'unit': self.units[unit_id]}
+            if self.finished:
+                self.nodes[node_id]['released'] = True
+                self._condition.notify_all()
+                return {'done': True}
+            return {'wait': min(self.heartbeat_interval, 1.0)}
+
+    def result(self, payload):
+        """Store a shard's result records; later results for the same shard are dropped"""
+        with self._condition:
+            node_id, unit_id = payload['node_id'], payload['unit_id']
+            self._touch(node_id)
+            if unit_id not in self.units or unit_id in self.results:
+                return {'accepted': False}
+            records = payload['records']
+            self.results[unit_id] = records
+            if self.leases.get(unit_id) == node_id:
+                del self.leases[unit_id]
+            # A reassigned shard may still be queued elsewhere
+            for queue in [self.unowned] + list(self.queues.values()):
+                if unit_id in queue:
+                    queue.remove(unit_id)
+            node = self.nodes[node_id]
+            node['shards'] += 1
+            node['rows'] += sum(1 for record in records if record['test_case'] is not None)
+            failed = sum(1 for record in records if record['outcome'] in ('failed', 'error'))
+            get_reporter().log('Coordinator', None,
+                               f"{'✗' if failed else '✓'} [{len(self.results)}/{len(self.units)}] {unit_id} "
+                               f"on {node_id}: {len(records)} result(s), {failed} failed")
+            self._condition.notify_all()
+            return {'accepted': True}
+
+    def status(self):
+        """Progress snapshot for GET /status"""
+        with self._condition:
+            return {'shards': len(self.units), 'done': len(self.results), 'running': dict(self.leases),
+                    'unowned': len(self.unowned), 'steals': self.steals, 'reassigned': self.reassigned,
+                    'nodes': {node_id: {key: value for key, value in node.items() if key != 'last_seen'}
+                              for node_id, node in self.nodes.items()}}
+
+    def _touch(self, node_id):
+        """Refresh a node's last heartbeat (a node presumed dead comes back empty-handed)"""
+        node = self.nodes[node_id]
+        node['last_seen'] = time.monotonic()
+        node['alive'] = True
+
+    def _steal(self, thief):
+        """Move the back half of the longest other queue to an idle node"""
+        victims = [(len(queue), node_id) for node_id, queue in self.queues.items()
+                   if node_id != thief and len(queue) > 0]
+        if not victims:
+            return
+        size, victim = max(victims)
+        stolen = [self.queues[victim].pop() for _ in range(math.ceil(size / 2))]
+        self.queues[thief].extend(reversed(stolen))
+        self.steals += 1
+
+    def _reap(self):
+        """Hand out the shards of nodes whose heartbeats stopped"""
+        now = time.monotonic()
+        for node_id, node in self.nodes.items():
+            if not node['alive'] or node['released'] or now - node['last_seen'] <= self.heartbeat_timeout:
+                continue
+            node['alive'] = False
+            get_reporter().notice(f"⚠ Node {node_id} missed heartbeats for {self.heartbeat_timeout:.0f}s; "
+                                  f"reassigning its shards", 'Coordinator')
+            self.unowned.extendleft(reversed(self.queues[node_id]))
+            self.queues[node_id].clear()
+            for unit_id in [unit_id for unit_id, owner in self.leases.items() if owner == node_id]:
+                del self.leases[unit_id]
+                self.attempts[unit_id] = self.attempts.get(unit_id, 0) + 1
+                if self.attempts[unit_id] >= self.max_attempts:
+                    unit = self.units[unit_id]
+                    self.results[unit_id] = [error_record(
+                        unit['suite'], f"shard {unit['shard_index'] + 1}/{unit['shard_count']}",
+                        f"Shard lost with {self.attempts[unit_id]} nodes; not retried")]
+                else:
+                    self.unowned.appendleft(unit_id)
+                    self.reassigned += 1
+        self._condition.notify_all()
+
+    def start(self):
+        """
+        Serve nodes on a background thread
+
+        Returns:
+            Coordinator: self, for chaining
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None, linger=None):
+        """
+        Block until every shard has a result
+
+        Args:
+            timeout (float): Give up after this many seconds (None waits forever)
+            linger (float): Seconds to keep serving afterwards so polling
+                            nodes learn the run is done (default: 2 heartbeats)
+
+        Returns:
+            list: Result records sorted by suite and row index
+
+        Raises:
+            TimeoutError: If timeout passes first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while not self.finished:
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"{len(self.units) - len(self.results)} shard(s) still running")
+                self._condition.wait(1.0)
+                self._reap()
+            linger_until = time.monotonic() + (2 * self.heartbeat_interval if linger is None else linger)
+            while time.monotonic() < linger_until and any(
+                    node['alive'] and not node['released'] for node in self.nodes.values()):
+                self._condition.wait(0.2)
+            records = [record for unit_id in self.units for record in self.results[unit_id]]
+        records.sort(key=lambda r: (r['suite'], r['test_case'] is None, r['test_case'] or 0))
+        return records
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self.shutdown()
+        self.server_close()
+
+    def describe(self):
+        """
+        One-line summary of the run
+
+        Returns:
+            str: e.g. '24 shards on 3 nodes, 4 steals, 1 reassigned'
+        """
+        return (f"{len(self.units)} shards on {len(self.nodes)} node{'s' if len(self.nodes) != 1 else ''}, "
+                f"{self.steals} steal{'s' if self.steals != 1 else ''}, {self.reassigned} reassigned")
+
+
+class CoordinatorClient:
+    """JSON-over-HTTP calls from a node to the coordinator"""
+
+    def __init__(self, url, timeout=30.0, retries=5):
+        """
+        Args:
+            url (str): Coordinator URL, e.g. http://build-01:8790
+            timeout (float): Seconds per request
+            retries (int): Attempts before a connection error is raised
+        """
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.retries = retries
+
+    def call(self, path, payload):
+        """
+        POST a JSON payload and return the JSON reply
+
+        Connection errors are retried with backoff, so a node survives a
+        short coordinator hiccup.
+
+        Raises:
+            OSError: If the coordinator stays unreachable
+        """
+        body = json.dumps(payload).encode('utf-8')
+        for attempt in range(self.retries):
+            request = urllib.request.Request(self.url + path, data=body, method='POST',
+                                             headers={'Content-Type': 'application/json'})
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return json.loads(response.read())
+            except urllib.error.HTTPError:
+                raise
+            except OSError:
+                if attempt == self.retries - 1:
+                    raise
+                time.sleep(min(2 ** attempt * 0.5, 5.0))
+
+
+def run_unit(unit, config):
+    """
+    Run one shard in this process
+
+    Args:
+        unit (dict): Shard from the coordinator
+        config (dict): Class attributes to set
+
+    Returns:
+        list: Result records (an error record if the shard could not run)
+    """
+    try:
+        return run_shard(load_class(unit['class']), unit['shard_index'], unit['shard_count'], config)
+    except Exception as e:
+        return [error_record(unit['suite'], f"shard {unit['shard_index'] + 1}/{unit['shard_count']}",
+                             f"Node failed: {str(e)}", traceback.format_exc())]
+
+
+def run_node(url, name=None):
+    """
+    Pull and run shards from a coordinator until it reports the run is done
+
+    Heartbeats are sent from a background thread, including while a
+    shard runs, so the coordinator only reassigns the shards of nodes that
+    are really gone.
+
+    Args:
+        url (str): Coordinator URL
+        name (str): Node name shown by the coordinator (defaults to host-pid)
+
+    Returns:
+        int: Number of shards this node ran
+    """
+    client = CoordinatorClient(url)
+    registration = client.call('/register', {'name': name or f"{socket.gethostname()}-{os.getpid()}"})
+    node_id = registration['node_id']
+    stop = threading.Event()
+
+    def send_heartbeats():
+        while not stop.wait(registration['heartbeat_interval']):
+            try:
+                client.call('/heartbeat', {'node_id': node_id})
+            except OSError:
+                pass
+
+    threading.Thread(target=send_heartbeats, name='node-heartbeat', daemon=True).start()
+    shards = 0
+    try:
+        while True:
+            reply = client.call('/lease', {'node_id': node_id})
+            if reply.get('done'):
+                return shards
+            unit = reply.get('unit')
+            if unit is None:
+                time.sleep(reply.get('wait', 1.0))
+                continue
+            records = run_unit(unit, registration['config'])
+            client.call('/result', {'node_id': node_id, 'unit_id': unit['id'], 'records': records})
+            shards += 1
+    finally:
+        stop.set()
+
+
+def _node_main(url, name):
+    """Entry point of a node process"""
+    _init_worker()
+    try:
+        run_node(url, name)
+    except OSError as e:
+        get_reporter().echo(f"✗ Node {name or os.getpid()} lost the coordinator at {url}: {str(e)}")
+        sys.exit(1)
+
+
+def start_nodes(url, count, name=None):
+    """
+    Start node processes against a coordinator
+
+    Nodes are fresh interpreters (spawned, not forked), like nodes on
+    other build agents; this is also the local stand-in for a multi-agent
+    setup.
+
+    Args:
+        url (str): Coordinator URL
+        count (int): Number of node processes (one browser each)
+        name (str): Name prefix (defaults to host-pid)
+
+    Returns:
+        list: Started multiprocessing.Process objects
+    """
+    context = multiprocessing.get_context('spawn')
+    processes = []
+    for slot in range(count):
+        process = context.Process(target=_node_main, args=(url, f"{name}-{slot + 1}" if name else None),
+                                  name=f"node-{slot + 1}")
+        process.start()
+        processes.append(process)
+    return processes
+
+
+def run_nodes(url, count, name=None):
+    """
+    Run node processes until the coordinator's run is done
+
+    Args:
+        url (str): Coordinator URL
+        count (int): Number of node processes
+        name (str): Name prefix
+
+    Returns:
+        bool: True if every node exited cleanly
+    """
+    processes = start_nodes(url, count, name)
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        raise
+    return all(process.exitcode == 0 for process in processes)
@@ -0,0 +1,198 @@
+"""
+Resolved Driver Cache
+Remembers where Selenium Manager found chromedriver and Chrome, and their
+versions, so later launches skip driver and browser discovery; entries are
+re-validated against the files on disk before every use
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+import selenium
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.driver_finder import DriverFinder
+
+from startup_profile import get_startup_profile
+
+VERSION_PATTERN = re.compile(r'(\d+(?:\.\d+)+)')
+
+
+def binary_version(path):
+    """
+    Version a chromedriver or Chrome binary reports with --version
+
+    Args:
+        path (str): Binary path
+
+    Returns:
+        str: e.g. '126.0.6478.126', or None if it cannot be read
+    """
+    try:
+        output = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=15).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = VERSION_PATTERN.search(output)
+    return match.group(1) if match else None
+
+
+def file_stamp(path):
+    """Size and modification time of a file, or None if it is missing"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class ResolvedDriverCache:
+    """chromedriver and Chrome locations keyed by platform, Selenium version and requested browser"""
+
+    def __init__(self, path, max_age=7 * 86400):
+        """
+        Args:
+            path (str): JSON file holding the resolved paths
+            max_age (float): Seconds after which an entry is resolved again, so
+                             newer drivers Selenium Manager would pick are found
+        """
+        self.path = path
+        self.max_age = max_age
+        self.entries = self._read(path) if os.path.exists(path) else {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(chrome_options):
+        """
+        Cache key for the browser a set of options asks for
+
+        Args:
+            chrome_options (Options): Chrome options
+
+        Returns:
+            str: e.g. 'linux|selenium 4.21.0|version=|binary='
+        """
+        return (f"{sys.platform}|selenium {selenium.__version__}"
+                f"|version={chrome_options.browser_version or ''}"
+                f"|binary={getattr(chrome_options, 'binary_location', '') or ''}")
+
+    def valid(self, entry):
+        """
+        Whether a cached entry still describes the binaries on disk
+
+        Both files must exist unchanged (same size and mtime, so an in-place
+        Chrome update invalidates the entry), the entry must be younger
+        than max_age, and the driver's major version must match Chrome's.
+
+        Args:
+            entry (dict): Cached entry
+
+        Returns:
+            bool: True if the entry can be used
+        """
+        if self.max_age and time.time() - entry.get('resolved_at', 0) > self.max_age:
+            return False
+        for name in ('driver', 'browser'):
+            stamp = entry.get(f'{name}_stamp')
+            if not stamp or file_stamp(entry.get(f'{name}_path') or '') != stamp:
+                return False
+        driver_version, browser_version = entry.get('driver_version'), entry.get('browser_version')
+        if driver_version and browser_version and \
+                driver_version.split('.')[0] != browser_version.split('.')[0]:
+            return False
+        return os.access(entry['driver_path'], os.X_OK)
+
+    def resolve(self, chrome_options):
+        """
+        chromedriver and Chrome for a set of options, from the cache when valid
+
+        Args:
+            chrome_options (Options): Chrome options
+
+        Returns:
+            dict: 'driver_path', 'browser_path', 'driver_version', 'browser_version'
+                  and 'cached' (False when Selenium Manager was run)
+
+        Raises:
+            NoSuchDriverException: If Selenium Manager cannot find a driver
+        """
+        started = time.perf_counter()
+        key = self.key(chrome_options)
+        with self._lock:
+            entry = self.entries.get(key)
+        cached = bool(entry) and self.valid(entry)
+        if not cached:
+            finder = DriverFinder(Service(), chrome_options)
+            driver_path, browser_path = finder.get_driver_path(), finder.get_browser_path()
+            entry = {'driver_path': driver_path, 'driver_stamp': file_stamp(driver_path),
+                     'driver_version': binary_version(driver_path),
+                     'browser_path': browser_path, 'browser_stamp': file_stamp(browser_path),
+                     'browser_version': binary_version(browser_path),
+                     'resolved_at': time.time()}
+            with self._lock:
+                self.entries[key] = entry
+            self.save(key, entry)
+        with self._lock:
+            if cached:
+                self.hits += 1
+            else:
+                self.misses += 1
+        get_startup_profile().record('driver resolution', time.perf_counter() - started,
+                                     'cache' if cached else 'Selenium Manager')
+        return dict(entry, cached=cached)
+
+    def invalidate(self, chrome_options):
+        """Forget the entry for a set of options (e.g. after a failed launch)"""
+        key = self.key(chrome_options)
+        with self._lock:
+            self.entries.pop(key, None)
+        self.save(key, None)
+
+    def save(self, key, entry):
+        """Merge one entry (None removes it) into the file; other processes may share it"""
+        with self._lock:
+            merged = self._read(self.path) if os.path.exists(self.path) else {}
+            if entry is None:
+                merged.pop(key, None)
+            else:
+                merged[key] = entry
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temporary = f"{self.path}.{os.getpid()}.tmp"
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump(merged, file, indent=2)
+            os.replace(temporary, self.path)
+
+    @staticmethod
+    def _read(path):
+        """Load a cache file, treating a corrupt file as empty"""
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_driver_cache(path):
+    """
+    Get this process's ResolvedDriverCache for a file
+
+    Args:
+        path (str): JSON cache file
+
+    Returns:
+        ResolvedDriverCache: Cache for the file
+    """
+    key = os.path.abspath(path)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ResolvedDriverCache(key)
+        return _caches[key]
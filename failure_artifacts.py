@@ -0,0 +1,190 @@
+"""
+Failure Artifact Capture
+Grabs a failed row's screenshot, page source and browser console log,
+then hands compression and disk writes to a thread pool so the next row
+starts right away; total artifact storage is kept under a size cap
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+
+from reporter import get_reporter
+
+
+class ArtifactStore:
+    """Size-capped directory of per-row failure artifacts written in the background"""
+
+    def __init__(self, directory, max_bytes=200 * 1048576, workers=2):
+        """
+        Args:
+            directory (str): Root directory; each failed row gets a subdirectory
+            max_bytes (int): Size cap for all artifacts; the oldest rows are evicted beyond it
+            workers (int): Background writer threads
+        """
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.captured = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='artifacts')
+        self._lock = threading.Lock()
+        self._pending = []
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def row_key(suite, test_case, row):
+        """
+        Directory name of a row's artifacts
+
+        Args:
+            suite (str): Test class (or suite) name
+            test_case (int): subTest row index
+            row (dict): CSV row data
+
+        Returns:
+            str: e.g. 'SearchDataDrivenTest-row4-1a2b3c4d'
+        """
+        digest = hashlib.sha256(json.dumps(row or {}, sort_keys=True, default=str).encode('utf-8'))
+        return f"{re.sub(r'[^A-Za-z0-9_.-]', '_', suite)}-row{test_case}-{digest.hexdigest()[:8]}"
+
+    def capture(self, driver, suite, test_case, row=None, message=''):
+        """
+        Grab a failed row's artifacts and queue them for writing
+
+        Only the browser reads happen on the caller's thread; each one that
+        fails (e.g. a crashed tab) is skipped.
+
+        Args:
+            driver (WebDriver): Driver showing the failed page
+            suite (str): Test class (or suite) name
+            test_case (int): subTest row index
+            row (dict): CSV row data
+            message (str): Failure message
+
+        Returns:
+            str: Directory the artifacts will be written to
+        """
+        grabbed = {'row': row, 'message': message, 'suite': suite, 'test_case': test_case,
+                   'captured_at': time.time()}
+        for name, read in (('screenshot', driver.get_screenshot_as_png),
+                           ('page_source', lambda: driver.page_source),
+                           ('console', lambda: driver.get_log('browser')),
+                           ('url', lambda: driver.current_url)):
+            try:
+                grabbed[name] = read()
+            except Exception as e:
+                grabbed[name] = None
+                grabbed.setdefault('errors', {})[name] = str(e).strip().split('\n')[0]
+        target = os.path.join(self.directory, self.row_key(suite, test_case, row))
+        future = self._executor.submit(self._write, target, grabbed)
+        with self._lock:
+            self.captured += 1
+            self._pending = [pending for pending in self._pending if not pending.done()] + [future]
+        return target
+
+    def _write(self, target, grabbed):
+        """Write one row's artifacts (background thread), then enforce the size cap"""
+        temporary = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        os.makedirs(temporary, exist_ok=True)
+        try:
+            if grabbed.get('screenshot'):
+                # PNG is already compressed
+                with open(os.path.join(temporary, 'screenshot.png'), 'wb') as file:
+                    file.write(grabbed['screenshot'])
+            if grabbed.get('page_source') is not None:
+                with gzip.open(os.path.join(temporary, 'page.html.gz'), 'wt', encoding='utf-8') as file:
+                    file.write(grabbed['page_source'])
+            if grabbed.get('console') is not None:
+                with gzip.open(os.path.join(temporary, 'console.json.gz'), 'wt', encoding='utf-8') as file:
+                    json.dump(grabbed['console'], file)
+            details = {key: value for key, value in grabbed.items()
+                       if key not in ('screenshot', 'page_source', 'console')}
+            with open(os.path.join(temporary, 'failure.json'), 'w', encoding='utf-8') as file:
+                json.dump(details, file, indent=2, default=str)
+            # A re-run of the same row replaces its previous artifacts
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(temporary, target)
+        finally:
+            shutil.rmtree(temporary, ignore_errors=True)
+        self.evict()
+
+    def evict(self):
+        """
+        Delete the oldest row directories until the artifacts fit max_bytes
+
+        Returns:
+            int: Bytes freed
+        """
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if name.endswith('.tmp') or not os.path.isdir(path):
+                    continue
+                size = sum(os.path.getsize(os.path.join(path, file)) for file in os.listdir(path))
+                entries.append((os.path.getmtime(path), size, path))
+                total += size
+            freed = 0
+            # Never evict the newest row: it is the one that just failed
+            for mtime, size, path in sorted(entries)[:-1]:
+                if total - freed <= self.max_bytes:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                freed += size
+            return freed
+
+    def flush(self):
+        """Wait until every queued row has been written"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                get_reporter().notice(f"⚠ Could not write failure artifacts: {str(e)}", 'ArtifactStore')
+
+    def close(self):
+        """Finish queued writes and stop the writer threads"""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_artifact_store(directory, max_bytes=200 * 1048576):
+    """
+    Get this process's ArtifactStore for a directory
+
+    Args:
+        directory (str): Artifact root directory
+        max_bytes (int): Size cap used when the store is first created
+
+    Returns:
+        ArtifactStore: Store for the directory
+    """
+    key = os.path.abspath(directory)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = ArtifactStore(key, max_bytes=max_bytes)
+        return _stores[key]
+
+
+def close_artifact_stores():
+    """Flush and close every store (registered with atexit and worker finalizers)"""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
+
+
+atexit.register(close_artifact_stores)
@@ -0,0 +1,102 @@
+"""
+Fixture State Snapshot and Restore
+Reads and rewrites the Banking Project's customer store (kept in browser
+localStorage) with one injected script, so destructive rows can start from
+a known store instead of a fresh browser
+"""
+
+import json
+
+# localStorage keys holding the Banking Project's customers, accounts and transactions
+STORE_KEYS = ('User', 'Account', 'Transaction')
+
+SNAPSHOT_SCRIPT = """
+    var keys = arguments[0], store = {};
+    for (var i = 0; i < keys.length; i++) {
+        store[keys[i]] = window.localStorage.getItem(keys[i]);
+    }
+    return store;
+"""
+
+# Writes only the keys that differ (null removes a key), then makes the app
+# re-read the store: AngularJS apps reload the current route, others get a
+# hashchange event
+RESTORE_SCRIPT = """
+    var store = arguments[0], changed = [], start = performance.now();
+    Object.keys(store).forEach(function (key) {
+        var value = store[key];
+        if (window.localStorage.getItem(key) === value) { return; }
+        if (value === null) {
+            window.localStorage.removeItem(key);
+        } else {
+            window.localStorage.setItem(key, value);
+        }
+        changed.push(key);
+    });
+    if (changed.length) {
+        var injector = null;
+        if (window.angular) {
+            var root = document.querySelector('[ng-app], [data-ng-app], .ng-scope') || document.body;
+            injector = window.angular.element(root).injector();
+        }
+        if (injector && injector.has('$route')) {
+            var rootScope = injector.get('$rootScope');
+            var reload = function () { injector.get('$route').reload(); };
+            if (rootScope.$$phase) { rootScope.$evalAsync(reload); } else { rootScope.$apply(reload); }
+        } else {
+            window.dispatchEvent(new HashChangeEvent('hashchange'));
+        }
+    }
+    return {changed: changed, elapsed: performance.now() - start};
+"""
+
+
+class FixtureState:
+    """Utility class for snapshotting and restoring the app's localStorage store"""
+
+    @staticmethod
+    def snapshot(driver, keys=STORE_KEYS):
+        """
+        Read the store of the page's origin
+
+        Args:
+            driver (WebDriver): Driver showing the app
+            keys (tuple): localStorage keys to read
+
+        Returns:
+            dict: Key -> raw stored string (None if the key is absent)
+        """
+        return driver.execute_script(SNAPSHOT_SCRIPT, list(keys))
+
+    @staticmethod
+    def restore(driver, store):
+        """
+        Put a snapshot back and refresh the view if anything changed
+
+        Args:
+            driver (WebDriver): Driver showing the app
+            store (dict): Output of snapshot() or seed_from_fixture()
+
+        Returns:
+            dict: 'changed' (keys rewritten) and 'elapsed' (ms spent in the page)
+        """
+        return driver.execute_script(RESTORE_SCRIPT, store)
+
+    @staticmethod
+    def seed_from_fixture(fixture, keys=STORE_KEYS):
+        """
+        Turn fixture data into a store snapshot
+
+        Values are serialized like the app's JSON.stringify, so restoring
+        over an untouched store is a no-op.
+
+        Args:
+            fixture (dict): e.g. local_server.build_fixture() output
+            keys (tuple): localStorage keys the snapshot covers
+
+        Returns:
+            dict: Key -> raw string (None for keys the fixture lacks)
+        """
+        return {key: json.dumps(fixture[key], separators=(',', ':'), ensure_ascii=False)
+                if key in fixture else None
+                for key in keys}
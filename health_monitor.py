@@ -0,0 +1,219 @@
+"""
+Browser Health Monitor
+Samples renderer memory (CDP Performance.getMetrics and process RSS) and
+command latency every few CSV rows, decides when a long-lived driver
+should be recycled, and keeps the memory-over-rows time series
+"""
+
+import json
+import os
+import time
+
+from instrumentation import browser_memory, percentile
+
+
+def browser_root_pid(driver):
+    """
+    Process id whose descendants are the driver's Chrome processes
+
+    Args:
+        driver (WebDriver): Selenium driver (chromedriver's pid) or CDP tab (Chrome's pid)
+
+    Returns:
+        int: Process id, or None if unknown (e.g. a remote driver)
+    """
+    process = getattr(getattr(driver, 'service', None), 'process', None) or \
+        getattr(getattr(driver, 'browser', None), 'process', None)
+    return getattr(process, 'pid', None)
+
+
+def renderer_rss_mb(root_pid):
+    """
+    Resident memory of the Chrome renderer processes below a process
+
+    Reads /proc, so it is only available on Linux.
+
+    Args:
+        root_pid (int): Process whose descendants are searched
+
+    Returns:
+        float: Total renderer RSS in MB, or None if it cannot be read
+    """
+    if not root_pid or not os.path.isdir('/proc'):
+        return None
+    children = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat', 'rb') as file:
+                # The command name may contain spaces; fields resume after ')'
+                parent = int(file.read().rsplit(b')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(name))
+
+    total = 0
+    pending = list(children.get(root_pid, []))
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            with open(f'/proc/{pid}/cmdline', 'rb') as file:
+                if b'--type=renderer' not in file.read():
+                    continue
+            with open(f'/proc/{pid}/statm', 'rb') as file:
+                total += int(file.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return round(total / 1048576.0, 3)
+
+
+class HealthMonitor:
+    """Periodic browser health samples and driver recycling decisions for one test class"""
+
+    def __init__(self, every_rows=25, max_heap_mb=512, max_rss_mb=1536, max_nodes=200000,
+                 max_listeners=100000, max_latency_factor=4.0):
+        """
+        Args:
+            every_rows (int): Rows between samples
+            max_heap_mb (float): Recycle above this JS heap (MB)
+            max_rss_mb (float): Recycle above this total renderer RSS (MB)
+            max_nodes (int): Recycle above this many DOM nodes
+            max_listeners (int): Recycle above this many JS event listeners
+            max_latency_factor (float): Recycle when the median command latency
+                                        grows past this multiple of the first sample's
+        """
+        self.every_rows = every_rows
+        self.max_heap_mb = max_heap_mb
+        self.max_rss_mb = max_rss_mb
+        self.max_nodes = max_nodes
+        self.max_listeners = max_listeners
+        self.max_latency_factor = max_latency_factor
+        self.series = []
+        self.recycles = []
+        self._rows_since_sample = 0
+        self._event_cursor = 0
+        self._baseline_latency = None
+
+    def due(self, after_failure=False):
+        """
+        Count a row and tell whether the browser should be sampled before the next one
+
+        Args:
+            after_failure (bool): The row failed; sample right away, it may
+                                  have been a crashed tab
+
+        Returns:
+            bool: True if sample() should run now
+        """
+        self._rows_since_sample += 1
+        return after_failure or self._rows_since_sample >= self.every_rows
+
+    def sample(self, driver, tracer, row):
+        """
+        Record one health sample
+
+        Args:
+            driver (WebDriver): Driver to sample
+            tracer (CommandTracer): Tracer holding the commands run since the last sample
+            row (int): Index of the row that just finished
+
+        Returns:
+            dict: The sample; 'responsive' is False if the browser did not answer
+        """
+        self._rows_since_sample = 0
+        events = tracer.events[self._event_cursor:]
+        self._event_cursor = len(tracer.events)
+        latencies = [event['dur'] / 1000.0 for event in events if event['cat'] == 'command']
+
+        memory = None
+        try:
+            # A crashed or hung tab fails even the cheapest command
+            driver.execute_script("return 1")
+            memory = browser_memory(driver) or {}
+            responsive = True
+        except Exception:
+            responsive = False
+
+        entry = {'row': row, 'ts': round(time.time(), 3), 'responsive': responsive,
+                 'rss_mb': renderer_rss_mb(browser_root_pid(driver)),
+                 'command_p50_ms': round(percentile(latencies, 50), 3) if latencies else None,
+                 'commands': len(latencies)}
+        entry.update(memory or {})
+        self.series.append(entry)
+        if self._baseline_latency is None and entry['command_p50_ms']:
+            self._baseline_latency = entry['command_p50_ms']
+        return entry
+
+    def recycle_reason(self, entry):
+        """
+        Decide whether a sample crossed a threshold
+
+        Args:
+            entry (dict): Output of sample()
+
+        Returns:
+            str: Reason to recycle the driver, or None if it is healthy
+        """
+        if not entry['responsive']:
+            return "browser not responding"
+        checks = [
+            ('js_heap_used_mb', self.max_heap_mb, "JS heap {:.0f} MB"),
+            ('rss_mb', self.max_rss_mb, "renderer RSS {:.0f} MB"),
+            ('nodes', self.max_nodes, "{} DOM nodes"),
+            ('listeners', self.max_listeners, "{} event listeners"),
+        ]
+        for key, limit, text in checks:
+            if limit and entry.get(key) is not None and entry[key] > limit:
+                return text.format(entry[key])
+        latency = entry['command_p50_ms']
+        if self.max_latency_factor and self._baseline_latency and latency and \
+                latency > self._baseline_latency * self.max_latency_factor:
+            return f"command p50 {latency:.1f} ms (was {self._baseline_latency:.1f} ms)"
+        return None
+
+    def recycled(self, row, reason):
+        """
+        Note that the driver was replaced after a row
+
+        Args:
+            row (int): Index of the row after which the driver was replaced
+            reason (str): Threshold that was crossed
+        """
+        self.recycles.append({'row': row, 'reason': reason, 'ts': round(time.time(), 3)})
+        # The new browser gets its own latency baseline
+        self._baseline_latency = None
+
+    def describe(self):
+        """
+        One-line summary of the series
+
+        Returns:
+            str: e.g. '4 samples, JS heap 3.1 -> 9.8 MB, 1 recycle', or '' without samples
+        """
+        if not self.series:
+            return ''
+        heaps = [entry['js_heap_used_mb'] for entry in self.series if entry.get('js_heap_used_mb') is not None]
+        text = f"{len(self.series)} samples"
+        if heaps:
+            text += f", JS heap {heaps[0]:.1f} -> {heaps[-1]:.1f} MB (peak {max(heaps):.1f})"
+        return text + f", {len(self.recycles)} recycle{'s' if len(self.recycles) != 1 else ''}"
+
+    def export(self, directory, name):
+        """
+        Write the memory-over-rows time series and recycle events as JSON
+
+        Args:
+            directory (str): Output directory
+            name (str): Test class name
+
+        Returns:
+            str: File path
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}-{os.getpid()}.health.json")
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'samples': self.series, 'recycles': self.recycles}, file, indent=2)
+        return path
@@ -0,0 +1,231 @@
+"""
+WebDriver Command Instrumentation
+Times every WebDriver command and test step, tagged with the test class,
+subTest row and step name, and exports Chrome trace-event JSON plus a
+p50/p95/p99 summary per step
+"""
+
+from contextlib import contextmanager
+import json
+import math
+import os
+import threading
+import time
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile
+
+    Args:
+        values (list): Numbers to summarize
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: Percentile value, or 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(math.ceil(pct / 100.0 * len(ordered))), 1)
+    return ordered[rank - 1]
+
+
+class CommandTracer:
+    """Collects timed spans for one test class"""
+
+    def __init__(self, test_class):
+        """
+        Args:
+            test_class (str): Name of the test class being traced
+        """
+        self.test_class = test_class
+        self.events = []
+        self.test_case = None
+        self._steps = []
+        self._pid = os.getpid()
+
+    @property
+    def current_step(self):
+        """Innermost active step name, or None"""
+        return self._steps[-1] if self._steps else None
+
+    def set_row(self, test_case):
+        """
+        Tag following spans with a subTest row index
+
+        Args:
+            test_case (int): Row index, or None outside a row
+        """
+        self.test_case = test_case
+
+    @contextmanager
+    def step(self, name):
+        """
+        Time a named step; commands issued inside it are tagged with its name
+
+        Args:
+            name (str): Step name, e.g. 'open_page'
+        """
+        self._steps.append(name)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._steps.pop()
+            self._record(name, 'step', start, time.perf_counter_ns(), {})
+
+    def record_command(self, command, start, end):
+        """
+        Record one WebDriver command
+
+        Args:
+            command (str): WebDriver command name, e.g. 'findElement'
+            start (int): perf_counter_ns() before the command
+            end (int): perf_counter_ns() after the command
+        """
+        self._record(command, 'command', start, end, {'step': self.current_step or command})
+
+    def _record(self, name, category, start, end, args):
+        """Append a Chrome trace 'complete' event"""
+        args['test_class'] = self.test_class
+        args['test_case'] = self.test_case
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': start // 1000,
+            'dur': (end - start) // 1000,
+            'pid': self._pid,
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+
+    def durations(self):
+        """
+        Group span durations by step
+
+        Steps are the named spans; commands issued outside any step are
+        grouped under their command name.
+
+        Returns:
+            dict: Step name -> list of durations in milliseconds
+        """
+        grouped = {}
+        for event in self.events:
+            if event['cat'] == 'step':
+                key = event['name']
+            elif event['args']['step'] == event['name']:
+                key = event['name']
+            else:
+                continue
+            grouped.setdefault(key, []).append(event['dur'] / 1000.0)
+        return grouped
+
+    def summary(self):
+        """
+        Latency percentiles per step
+
+        Returns:
+            dict: Step name -> {'count', 'total_ms', 'p50_ms', 'p95_ms', 'p99_ms'}
+        """
+        return {
+            name: {
+                'count': len(values),
+                'total_ms': round(sum(values), 3),
+                'p50_ms': round(percentile(values, 50), 3),
+                'p95_ms': round(percentile(values, 95), 3),
+                'p99_ms': round(percentile(values, 99), 3),
+            }
+            for name, values in self.durations().items()
+        }
+
+    def export(self, trace_dir):
+        """
+        Write the trace (loadable in chrome://tracing or Perfetto) and summary
+
+        Args:
+            trace_dir (str): Output directory
+
+        Returns:
+            tuple: (trace file path, summary file path)
+        """
+        os.makedirs(trace_dir, exist_ok=True)
+        prefix = os.path.join(trace_dir, f"{self.test_class}-{self._pid}")
+        trace_path = prefix + '.trace.json'
+        summary_path = prefix + '.summary.json'
+        with open(trace_path, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, file)
+        with open(summary_path, 'w', encoding='utf-8') as file:
+            json.dump(self.summary(), file, indent=2)
+        return trace_path, summary_path
+
+    def format_summary(self):
+        """
+        Format a per-step latency table, slowest total first
+
+        Returns:
+            str: Table text, or '' if nothing was recorded
+        """
+        summary = self.summary()
+        if not summary:
+            return ''
+        lines = [f"{'Step':<32}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'total ms':>11}"]
+        for name, stats in sorted(summary.items(), key=lambda item: -item[1]['total_ms']):
+            lines.append(f"{name:<32}{stats['count']:>7}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+                         f"{stats['p99_ms']:>10.1f}{stats['total_ms']:>11.1f}")
+        return "\n".join(lines)
+
+
+def instrument_driver(driver, tracer):
+    """
+    Route every command of a driver through a tracer
+
+    WebElement commands are sent through their parent driver's execute(),
+    so wrapping it once covers clicks, typing and element lookups too. The
+    wrapper stays installed on pooled drivers; pass tracer=None to pause it.
+
+    Args:
+        driver (WebDriver): Driver to instrument
+        tracer (CommandTracer): Tracer to record into, or None
+    """
+    if not hasattr(driver, '_untraced_execute'):
+        driver._untraced_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            active = driver.command_tracer
+            if active is None:
+                return driver._untraced_execute(driver_command, params)
+            start = time.perf_counter_ns()
+            try:
+                return driver._untraced_execute(driver_command, params)
+            finally:
+                active.record_command(driver_command, start, time.perf_counter_ns())
+
+        driver.execute = execute
+    driver.command_tracer = tracer
+
+
+def browser_memory(driver):
+    """
+    Read the current page's memory use through CDP Performance.getMetrics
+
+    Args:
+        driver (WebDriver): Chrome driver
+
+    Returns:
+        dict: 'js_heap_used_mb', 'js_heap_total_mb', 'nodes' and 'listeners',
+              or None if the browser does not support CDP
+    """
+    try:
+        driver.execute_cdp_cmd('Performance.enable', {})
+        metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+    except Exception:
+        return None
+    values = {metric['name']: metric['value'] for metric in metrics}
+    return {
+        'js_heap_used_mb': round(values.get('JSHeapUsedSize', 0) / 1048576.0, 3),
+        'js_heap_total_mb': round(values.get('JSHeapTotalSize', 0) / 1048576.0, 3),
+        'nodes': int(values.get('Nodes', 0)),
+        'listeners': int(values.get('JSEventListeners', 0)),
+    }
@@ -0,0 +1,406 @@
+"""
+Keyword-Driven Executor
+Runs CSV rows from declarative step definitions (one JSON file per CSV)
+instead of a hand-written loop per suite, and plans the row order so
+compatible rows share one page session
+"""
+
+import json
+import os
+import re
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Column types usable in a definition's "schema"
+SCHEMA_TYPES = {'str': str, 'int': int, 'float': float, 'bool': bool}
+
+# ${column} or ${column:filter} inside step arguments
+PLACEHOLDER_PATTERN = re.compile(r'\$\{(\w+)(?::(\w+))?\}')
+
+
+class StepDefinition:
+    """
+    Declarative description of how to run the rows of one CSV file
+
+    The JSON file holds:
+        suite: Name rows are reported under (e.g. 'SearchDataDrivenTest')
+        csv: CSV path relative to the project
+        schema: Column name -> 'str', 'int', 'float' or 'bool'
+        read_only: False if a row changes application data (e.g. deletes a customer)
+        batch_by: Columns whose equal values should run back to back
+        subtest: subTest parameter name -> template
+        log: Templates logged at the start of each row
+        steps: List of {"keyword": ..., arguments...}; any step may set
+               "soft": true (log a warning instead of failing) and
+               "error": template used as the failure message
+        message: Template of the success message
+
+    Templates substitute ${column}; ${column:value} is the value part of a
+    locator column and ${column:customer} the customer a locator points at.
+    """
+
+    def __init__(self, path, data):
+        """
+        Args:
+            path (str): Definition file the data was loaded from
+            data (dict): Parsed definition
+        """
+        self.path = path
+        self.suite = data['suite']
+        self.csv = data['csv']
+        self.schema = {column: SCHEMA_TYPES[type_name]
+                       for column, type_name in data.get('schema', {}).items()}
+        self.read_only = data.get('read_only', True)
+        self.batch_by = list(data.get('batch_by', []))
+        self.subtest = data.get('subtest', {})
+        self.log = data.get('log', [])
+        self.steps = data['steps']
+        self.message = data.get('message', "Row executed successfully")
+        unknown = [step.get('keyword') for step in self.steps if step.get('keyword') not in KEYWORDS]
+        if unknown:
+            raise ValueError(f"{os.path.basename(path)} uses unknown keywords: {', '.join(map(str, unknown))}")
+
+    @classmethod
+    def load(cls, path, base_path=PROJECT_DIR):
+        """
+        Load a definition file
+
+        Args:
+            path (str): JSON file (relative to base_path or absolute)
+            base_path (str): Directory relative paths are resolved against
+
+        Returns:
+            StepDefinition: Parsed definition
+
+        Raises:
+            ValueError: If the definition uses a keyword that does not exist
+        """
+        path = os.path.join(base_path, path)
+        with open(path, 'r', encoding='utf-8') as file:
+            return cls(path, json.load(file))
+
+    @staticmethod
+    def render(template, data, test):
+        """
+        Substitute row values into a template
+
+        Args:
+            template: String template (other values are returned unchanged)
+            data (dict): Row data
+            test (BaseDataDrivenTest): Test providing locator helpers for filters
+
+        Returns:
+            Rendered value
+        """
+        if not isinstance(template, str):
+            return template
+
+        def substitute(match):
+            value = data[match.group(1)]
+            if match.group(2) == 'value':
+                return test.parse_locator(value)[1]
+            if match.group(2) == 'customer':
+                return test.extract_customer_info_from_xpath(test.parse_locator(value)[1])
+            return str(value)
+
+        return PLACEHOLDER_PATTERN.sub(substitute, template)
+
+    def batch_key(self, data):
+        """Values of the batch_by columns for a row"""
+        return tuple(str(data.get(column)) for column in self.batch_by)
+
+
+class RowPlanner:
+    """Utility class for ordering rows of several definitions into shared page sessions"""
+
+    @staticmethod
+    def plan(sources, key='siteUrl', isolated=False):
+        """
+        Order the rows of several definitions
+
+        Read-only definitions run before destructive ones, so deleting a
+        customer never changes what a search or sort row sees. Within each
+        phase, rows for the same page are adjacent (one navigation each),
+        then rows of the same definition, then rows with equal batch_by
+        values (e.g. every sort row for one label back to back). Order is
+        otherwise kept as first appearance. Unlike iter_csv_rows, the planner
+        reads every row up front.
+
+        Args:
+            sources (list): (StepDefinition, iterable of (row index, row dictionary)) tuples
+            key (str): Column holding the page URL
+            isolated (bool): Destructive rows restore the app's data before
+                             and after themselves, so they need no phase of their own
+
+        Returns:
+            list: (StepDefinition, row index, row dictionary) tuples in execution order
+        """
+        pages = {}        # URL -> first appearance
+        batches = {}      # (definition position, batch key) -> first appearance
+        planned = []
+        for position, (definition, rows) in enumerate(sources):
+            for index, data in rows:
+                page = pages.setdefault(data.get(key), len(pages))
+                batch = batches.setdefault((position, definition.batch_key(data)), len(batches))
+                phase = 0 if definition.read_only or isolated else 1
+                planned.append(((phase, page, position, batch, len(planned)), definition, index, data))
+        planned.sort(key=lambda item: item[0])
+        return [(definition, index, data) for _, definition, index, data in planned]
+
+
+class RowState:
+    """What one row has observed so far"""
+
+    def __init__(self, data):
+        """
+        Args:
+            data (dict): Row data
+        """
+        self.data = data
+        self.snapshots = {}
+        # An action ran since the UI last settled; the next observation waits first
+        self.dirty = False
+
+
+class Keywords:
+    """Keyword implementations; each takes the test, the row state and the step's arguments"""
+
+    @staticmethod
+    def open_page(test, row, url):
+        """Show the page, reusing the loaded one when its state can be reset"""
+        if test.open_page(url):
+            test.log("✓ Reused loaded page (state reset without reload)")
+        else:
+            test.log("✓ Page loaded successfully")
+        row.dirty = False
+
+    @staticmethod
+    def restore_fixture(test, row):
+        """Reset the app's customer store to the baseline (see restore_fixture_state)"""
+        test.restore_fixture_state()
+
+    @staticmethod
+    def snapshot(test, row, name, selector='table', required=False):
+        """Snapshot the table under `name`, waiting for the UI first if an action ran"""
+        Keywords._settle(test, row)
+        snapshot = test.snapshot_table(selector)
+        row.snapshots[name] = snapshot
+        if required:
+            test.assertIsNotNone(snapshot, "Results table not found")
+        test.log(f"✓ Table rows ({name}): {snapshot.row_count if snapshot else 0}")
+
+    @staticmethod
+    def model_table(test, row):
+        """Build the page's TableOracle (one table read per page load)"""
+        Keywords._settle(test, row)
+        oracle = test.table_oracle()
+        test.assertIsNotNone(oracle, "Results table not found")
+        test.log(f"✓ Table modelled: {oracle.row_count} rows")
+
+    @staticmethod
+    def expect_element(test, row, locator, clickable=False):
+        """Wait until an element is present (and clickable)"""
+        test.wait_for_element(locator, clickable=clickable)
+        test.log(f"✓ Element found: {test.parse_locator(locator)[1]}")
+
+    @staticmethod
+    def expect_absent(test, row, locator):
+        """Check that no element matches any more"""
+        Keywords._settle(test, row)
+        try:
+            test.find_element_by_locator(locator)
+        except NoSuchElementException:
+            test.log(f"✓ Element removed: {test.parse_locator(locator)[1]}")
+            return
+        test.fail(f"Element still present: {test.parse_locator(locator)[1]}")
+
+    @staticmethod
+    def clear(test, row, locator):
+        """Empty a text field"""
+        test.wait_for_element(locator).clear()
+        row.dirty = True
+        test.log("✓ Field cleared")
+
+    @staticmethod
+    def type(test, row, locator, text):
+        """Type text into a field"""
+        test.wait_for_element(locator).send_keys(text)
+        row.dirty = True
+        test.log(f"✓ Entered text: '{text}'")
+
+    @staticmethod
+    def click(test, row, locator, may_be_absent=False):
+        """Click an element once it is clickable (see wait_for_element for may_be_absent)"""
+        test.wait_for_element(locator, clickable=True, may_be_absent=may_be_absent).click()
+        row.dirty = True
+        test.log(f"✓ Clicked: {test.parse_locator(locator)[1]}")
+
+    @staticmethod
+    def check_contains(test, row, snapshot, text):
+        """Check that some cell of a snapshot contains the text"""
+        table = row.snapshots.get(snapshot)
+        if table is None or table.row_count == 0:
+            test.log(f"⚠ No rows matched '{text}'")
+        elif table.contains(text):
+            test.log(f"✓ '{text}' found in results")
+        else:
+            test.fail(f"'{text}' not visible in results")
+
+    @staticmethod
+    def check_sorted(test, row, snapshot, label):
+        """Check that the column a sort link is named after is ordered"""
+        by, column = test.parse_locator(label)
+        if by != By.LINK_TEXT:
+            return
+        table = row.snapshots.get(snapshot)
+        order = table.sort_order(column) if table else None
+        test.assertTrue(order, f"Column '{column}' does not appear to be sorted")
+        test.log(f"✓ Column '{column}' is sorted {order}")
+
+    @staticmethod
+    def verify_search(test, row, snapshot, text):
+        """Check that a snapshot holds exactly the rows the oracle predicts for a search"""
+        oracle = test.table_oracle()
+        test.assertIsNotNone(oracle, "No table model; add a model_table step after open_page")
+        check = oracle.verify_search(text, row.snapshots[snapshot])
+        test.assertTrue(check['ok'], f"Search for '{text}': {check['message']}")
+        test.log(f"✓ Results match the oracle: {check['message']}")
+
+    @staticmethod
+    def verify_sort(test, row, snapshot, label):
+        """Check that a snapshot holds the modelled rows in the order a sort link gives"""
+        by, column = test.parse_locator(label)
+        if by != By.LINK_TEXT:
+            return
+        oracle = test.table_oracle()
+        test.assertIsNotNone(oracle, "No table model; add a model_table step after open_page")
+        check = oracle.verify_sort(column, row.snapshots[snapshot])
+        test.assertTrue(check['ok'], f"Sort by '{column}': {check['message']}")
+        test.log(f"✓ Sort matches the oracle: {check['message']}")
+
+    @staticmethod
+    def check_fewer_rows(test, row, before, after):
+        """Check that the table lost rows between two snapshots"""
+        initial = row.snapshots[before].row_count if row.snapshots.get(before) else 0
+        final = row.snapshots[after].row_count if row.snapshots.get(after) else 0
+        if final >= initial:
+            test.fail(f"Row count unchanged or increased (was {initial}, now {final})")
+        test.log(f"✓ Removed {initial - final} row(s)")
+
+    @staticmethod
+    def _settle(test, row):
+        """Wait for the UI once after a run of actions, not after each one"""
+        if row.dirty:
+            test.wait_for_ui_stable()
+            row.dirty = False
+
+
+KEYWORDS = {
+    'open_page': Keywords.open_page,
+    'restore_fixture': Keywords.restore_fixture,
+    'snapshot': Keywords.snapshot,
+    'model_table': Keywords.model_table,
+    'expect_element': Keywords.expect_element,
+    'expect_absent': Keywords.expect_absent,
+    'clear': Keywords.clear,
+    'type': Keywords.type,
+    'click': Keywords.click,
+    'check_contains': Keywords.check_contains,
+    'check_sorted': Keywords.check_sorted,
+    'verify_search': Keywords.verify_search,
+    'verify_sort': Keywords.verify_sort,
+    'check_fewer_rows': Keywords.check_fewer_rows,
+}
+
+
+class KeywordExecutor:
+    """Runs planned rows through their step definitions on a BaseDataDrivenTest"""
+
+    def __init__(self, test):
+        """
+        Args:
+            test (BaseDataDrivenTest): Test whose browser and helpers run the keywords
+        """
+        self.test = test
+
+    def run(self, definitions):
+        """
+        Plan and run every row of the definitions
+
+        Args:
+            definitions (list): StepDefinition objects
+        """
+        sources = [(definition, self.test.iter_csv_rows(definition.csv, schema=definition.schema,
+                                                        suite=definition.suite))
+                   for definition in definitions]
+        isolated = self.test.isolate_fixture_state
+        for definition, index, data in RowPlanner.plan(sources, isolated=isolated):
+            # Rows were read up front, so sample between executed rows here
+            self.test.check_browser_health()
+            self.run_row(definition, index, data)
+            if not definition.read_only:
+                self.test.invalidate_table_oracle()
+            if isolated and not definition.read_only:
+                # Later read-only rows on this page must not see the change
+                try:
+                    self.test.restore_fixture_state()
+                except Exception as e:
+                    self.test.log(f"⚠ Could not restore customer store: {str(e)}")
+
+    def run_row(self, definition, index, data):
+        """
+        Run one row as a subTest reported under the definition's suite
+
+        Args:
+            definition (StepDefinition): How to run the row
+            index (int): Row index in its CSV
+            data (dict): Row data
+        """
+        test = self.test
+        # The planner reads rows ahead; failure artifacts need this row's data
+        test._row_data = data
+        params = {name: StepDefinition.render(template, data, test)
+                  for name, template in definition.subtest.items()}
+        with test.subTest(test_case=index, suite=definition.suite, **params):
+            try:
+                test.print_test_header(index)
+                for template in definition.log:
+                    test.log(StepDefinition.render(template, data, test))
+                row = RowState(data)
+                for step in definition.steps:
+                    self.run_step(step, row)
+                test.print_test_result(index, passed=True,
+                                       message=StepDefinition.render(definition.message, data, test))
+            except AssertionError as e:
+                test.print_test_result(index, passed=False, message=str(e))
+                raise
+            except Exception as e:
+                test.print_test_result(index, passed=False, message=f"Unexpected error: {str(e)}")
+                test.fail(f"Unexpected error: {str(e)}")
+
+    def run_step(self, step, row):
+        """
+        Run one keyword
+
+        Args:
+            step (dict): Step from the definition
+            row (RowState): State of the current row
+        """
+        test = self.test
+        arguments = {name: StepDefinition.render(value, row.data, test)
+                     for name, value in step.items() if name not in ('keyword', 'soft', 'error')}
+        try:
+            KEYWORDS[step['keyword']](test, row, **arguments)
+        except Exception as e:
+            if step.get('soft'):
+                # Selenium messages carry a stack trace after the first line
+                message = str(e).strip()
+                test.log(f"⚠ {step['keyword']}: {message.splitlines()[0] if message else type(e).__name__}")
+                return
+            if step.get('error'):
+                test.log(f"✗ {step['keyword']} failed: {str(e)}")
+                test.fail(StepDefinition.render(step['error'], row.data, test))
+            raise
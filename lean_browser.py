@@ -0,0 +1,266 @@
+"""
+Lean Browser Profile
+Headless Chrome with a fixed viewport, images disabled and ads, trackers and
+heavy assets blocked through DevTools Network.setBlockedURLs, plus
+per-page-load network accounting from Chrome's performance log
+"""
+
+import json
+import os
+
+from reporter import get_reporter
+
+# Third-party ad and tracker hosts the Banking Project page pulls in;
+# none of the assertions depend on them
+BLOCKED_URL_PATTERNS = [
+    '*doubleclick.net*',
+    '*googlesyndication.com*',
+    '*googleadservices.com*',
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*googletagservices.com*',
+    '*adservice.google.*',
+    '*amazon-adsystem.com*',
+    '*adnxs.com*',
+    '*criteo.*',
+    '*taboola.com*',
+    '*outbrain.com*',
+    '*facebook.net*',
+    '*hotjar.com*',
+    '*fonts.googleapis.com*',
+    '*fonts.gstatic.com*',
+]
+
+# Network.setBlockedURLs only matches URLs, so resource types are blocked
+# by their file extensions
+BLOCKED_RESOURCE_TYPES = {
+    'Image': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico*'],
+    'Font': ['*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*'],
+    'Media': ['*.mp4*', '*.webm*', '*.mp3*', '*.ogg*'],
+}
+
+
+class LeanProfile:
+    """Chrome options and DevTools setup for lean runs"""
+
+    @staticmethod
+    def apply_options(chrome_options, window_size=(1366, 768)):
+        """
+        Make Chrome headless with a fixed viewport and no images
+
+        Args:
+            chrome_options (Options): Options to update
+            window_size (tuple): Viewport (width, height)
+
+        Returns:
+            Options: The same options, for chaining
+        """
+        if "--headless=new" not in chrome_options.arguments:
+            chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_experimental_option(
+            'prefs', {'profile.managed_default_content_settings.images': 2})
+        return chrome_options
+
+    @staticmethod
+    def enable_network_log(chrome_options):
+        """
+        Ask chromedriver to keep Network.* events in the 'performance' log
+
+        Args:
+            chrome_options (Options): Options to update
+        """
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    @staticmethod
+    def blocked_patterns(resource_types=('Image', 'Font', 'Media'), extra_patterns=()):
+        """
+        URL patterns for Network.setBlockedURLs
+
+        Args:
+            resource_types (tuple): Keys of BLOCKED_RESOURCE_TYPES to block
+            extra_patterns (tuple): Additional wildcard URL patterns
+
+        Returns:
+            list: Wildcard URL patterns
+        """
+        patterns = list(BLOCKED_URL_PATTERNS)
+        for resource_type in resource_types:
+            patterns.extend(BLOCKED_RESOURCE_TYPES[resource_type])
+        patterns.extend(extra_patterns)
+        return patterns
+
+    @staticmethod
+    def block_urls(driver, patterns):
+        """
+        Block matching requests for every later navigation of the driver's tab
+
+        Args:
+            driver (WebDriver): Chrome driver
+            patterns (list): Wildcard URL patterns
+
+        Returns:
+            bool: True if blocking is active, False if the browser has no CDP
+        """
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': list(patterns)})
+        except Exception as e:
+            get_reporter().notice(f"⚠ Could not enable request blocking: {str(e)}", 'LeanProfile')
+            return False
+        return True
+
+
+class NetworkUsage:
+    """Requests and bytes of one or more page loads"""
+
+    def __init__(self, requests=0, transferred=0, blocked=0, loads=1):
+        """
+        Args:
+            requests (int): Requests sent
+            transferred (int): Encoded bytes received
+            blocked (int): Requests blocked by Network.setBlockedURLs
+            loads (int): Page loads covered
+        """
+        self.requests = requests
+        self.transferred = transferred
+        self.blocked = blocked
+        self.loads = loads
+
+    @classmethod
+    def from_performance_log(cls, entries):
+        """
+        Sum up Network events from driver.get_log('performance')
+
+        Args:
+            entries (list): Performance log entries
+
+        Returns:
+            NetworkUsage: Usage of the requests in the log
+        """
+        requests = set()
+        received = 0
+        blocked = 0
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            method, params = message.get('method'), message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                requests.add(params.get('requestId'))
+            elif method == 'Network.loadingFinished':
+                received += int(params.get('encodedDataLength', 0))
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                blocked += 1
+        return cls(requests=len(requests) - blocked, transferred=received, blocked=blocked)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build usage from to_dict() output"""
+        return cls(data['requests'], data['bytes'], data.get('blocked', 0), data.get('loads', 1))
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: 'requests', 'bytes', 'blocked' and 'loads'
+        """
+        return {'requests': self.requests, 'bytes': self.transferred, 'blocked': self.blocked,
+                'loads': self.loads}
+
+    def add(self, other):
+        """Accumulate another page load into this total"""
+        self.requests += other.requests
+        self.transferred += other.transferred
+        self.blocked += other.blocked
+        self.loads += other.loads
+
+    def describe(self, reference=None):
+        """
+        One-line summary, with savings against a full (non-lean) page load
+
+        Args:
+            reference (NetworkUsage): Usage of the same page loaded without the lean profile
+
+        Returns:
+            str: e.g. '12 requests, 84.1 KB (7 blocked; saved 9 requests, 1.2 MB)'
+        """
+        text = f"{self.requests} requests, {format_bytes(self.transferred)} ({self.blocked} blocked"
+        if reference is not None:
+            saved_requests = reference.requests / reference.loads * self.loads - self.requests
+            saved_bytes = reference.transferred / reference.loads * self.loads - self.transferred
+            text += f"; saved {saved_requests:.0f} requests, {format_bytes(saved_bytes)}"
+        return text + ")"
+
+
+def format_bytes(count):
+    """Format a byte count as B/KB/MB"""
+    if abs(count) < 1024:
+        return f"{count:.0f} B"
+    if abs(count) < 1048576:
+        return f"{count / 1024.0:.1f} KB"
+    return f"{count / 1048576.0:.2f} MB"
+
+
+class PageWeightBaseline:
+    """
+    Per-URL network usage of full (non-lean) page loads, kept in a JSON file
+
+    Blocked requests never reach the network, so the bytes they would have
+    cost are only known from a run without the lean profile.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): JSON file, e.g. page_weight_baseline.json
+        """
+        self.path = path
+        self.pages = self._read(path) if os.path.exists(path) else {}
+
+    @staticmethod
+    def page_key(url):
+        """URL without its fragment (the hash route does not change the load)"""
+        return url.split('#', 1)[0]
+
+    def get(self, url):
+        """
+        Args:
+            url (str): Page URL
+
+        Returns:
+            NetworkUsage: Usage of one full load, or None if not recorded
+        """
+        data = self.pages.get(self.page_key(url))
+        return NetworkUsage.from_dict(data) if data else None
+
+    def record(self, url, usage):
+        """
+        Remember the usage of a full page load
+
+        Args:
+            url (str): Page URL
+            usage (NetworkUsage): Usage of one page load
+        """
+        self.pages[self.page_key(url)] = usage.to_dict()
+
+    def save(self):
+        """Merge with the file on disk (other workers may have written it) and save"""
+        merged = self._read(self.path) if os.path.exists(self.path) else {}
+        merged.update(self.pages)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(merged, file, indent=2)
+        os.replace(temporary, self.path)
+
+    @staticmethod
+    def _read(path):
+        """Load a baseline file, treating a truncated or corrupt file as empty"""
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                pages = json.load(file)
+        except (OSError, ValueError) as e:
+            get_reporter().notice(f"⚠ Ignoring unreadable page weight baseline {path}: {str(e)}",
+                                  'PageWeightBaseline')
+            return {}
+        return pages if isinstance(pages, dict) else {}
@@ -0,0 +1,352 @@
+"""
+Local Banking Project Stand-in
+Serves an offline copy of the Banking Project customer list (same table,
+search input, sort links and Delete buttons) from seedable fixture data,
+with configurable response latency
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+
+
+APP_PATH = '/angularJs-protractor/BankingProject/'
+
+# The customers the real app ships with; the CSV files reference them
+DEFAULT_CUSTOMERS = [
+    ('Hermoine', 'Granger', 'E859AB'),
+    ('Harry', 'Potter', 'E725JB'),
+    ('Ron', 'Weasly', 'E55656'),
+    ('Albus', 'Dumbledore', 'E55555'),
+    ('Neville', 'Longbottom', 'E89898'),
+]
+
+FIRST_NAMES = ['Luna', 'Ginny', 'Draco', 'Cedric', 'Cho', 'Seamus', 'Dean', 'Padma',
+               'Parvati', 'Fred', 'George', 'Percy', 'Oliver', 'Katie', 'Lee', 'Hannah']
+LAST_NAMES = ['Lovegood', 'Weasley', 'Malfoy', 'Diggory', 'Chang', 'Finnigan', 'Thomas',
+              'Patil', 'Wood', 'Bell', 'Jordan', 'Abbott', 'Bones', 'Boot', 'Brown', 'Creevey']
+POST_CODE_CHARS = 'ABCDEFGHJKLMNPRSTUVWXYZ0123456789'
+ACCOUNTS_PER_CUSTOMER = 3
+FIRST_ACCOUNT_NUMBER = 1001
+
+
+def build_fixture(rows=len(DEFAULT_CUSTOMERS), seed=0):
+    """
+    Build the customer store in the same shape the Banking Project keeps in localStorage
+
+    The first customers are always the app's defaults, so the existing CSV
+    rows keep working; extra rows are generated deterministically from the seed.
+
+    Args:
+        rows (int): Number of customers
+        seed (int): Random seed for generated customers
+
+    Returns:
+        dict: {'User': {id: customer}, 'Account': {accountNo: account}}
+    """
+    rng = random.Random(seed)
+    users = {}
+    accounts = {}
+    next_account = FIRST_ACCOUNT_NUMBER
+
+    for user_id in range(1, rows + 1):
+        if user_id <= len(DEFAULT_CUSTOMERS):
+            first_name, last_name, post_code = DEFAULT_CUSTOMERS[user_id - 1]
+        else:
+            first_name = rng.choice(FIRST_NAMES)
+            last_name = rng.choice(LAST_NAMES)
+            post_code = 'E' + ''.join(rng.choice(POST_CODE_CHARS) for _ in range(5))
+
+        account_numbers = list(range(next_account, next_account + ACCOUNTS_PER_CUSTOMER))
+        next_account += ACCOUNTS_PER_CUSTOMER
+        users[str(user_id)] = {
+            'fName': first_name,
+            'lName': last_name,
+            'id': user_id,
+            'postCd': post_code,
+            'accountNo': account_numbers,
+        }
+        for account_number in account_numbers:
+            accounts[str(account_number)] = {
+                'accountNo': account_number,
+                'currency': 'Dollar',
+                'userId': user_id,
+                'amount': 0,
+            }
+
+    return {'User': users, 'Account': accounts}
+
+
+PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>XYZ Bank</title>
+<style>
+  body { font-family: sans-serif; }
+  table { border-collapse: collapse; margin-top: 10px; }
+  td { border: 1px solid #ccc; padding: 4px 8px; }
+</style>
+</head>
+<body>
+<div class="box mainhdr"><strong class="mainHeading">XYZ Bank</strong></div>
+<div class="center">
+  <button class="btn btn-lg tab" data-route="#/manager/addCust">Add Customer</button>
+  <button class="btn btn-lg tab" data-route="#/manager/openAccount">Open Account</button>
+  <button class="btn btn-lg tab" data-route="#/manager/list">Customers</button>
+</div>
+<div id="view"></div>
+<script>
+(function () {
+  var view = document.getElementById('view');
+  var state = {search: '', sortType: null, sortReverse: false};
+  var columns = [['fName', 'First Name'], ['lName', 'Last Name'], ['postCd', 'Post Code']];
+
+  function load() {
+    return {User: JSON.parse(localStorage.getItem('User') || '{}'),
+            Account: JSON.parse(localStorage.getItem('Account') || '{}')};
+  }
+
+  function save(store) {
+    localStorage.setItem('User', JSON.stringify(store.User));
+    localStorage.setItem('Account', JSON.stringify(store.Account));
+  }
+
+  function matches(customer, query) {
+    // Like AngularJS "filter": any primitive value contains the query
+    if (!query) { return true; }
+    var values = [customer.fName, customer.lName, customer.postCd, customer.id].concat(customer.accountNo);
+    for (var i = 0; i < values.length; i++) {
+      if (String(values[i]).toLowerCase().indexOf(query) !== -1) { return true; }
+    }
+    return false;
+  }
+
+  function visibleCustomers(store) {
+    var query = state.search.toLowerCase();
+    var list = Object.keys(store.User).map(function (id) { return store.User[id]; })
+      .filter(function (customer) { return matches(customer, query); });
+    if (state.sortType) {
+      var key = state.sortType, direction = state.sortReverse ? -1 : 1;
+      list.sort(function (a, b) {
+        var x = String(a[key]).toLowerCase(), y = String(b[key]).toLowerCase();
+        return x < y ? -direction : (x > y ? direction : 0);
+      });
+    }
+    return list;
+  }
+
+  function deleteCustomer(id) {
+    var store = load();
+    (store.User[id].accountNo || []).forEach(function (accountNo) { delete store.Account[accountNo]; });
+    delete store.User[id];
+    save(store);
+    renderRows();
+  }
+
+  function renderRows() {
+    var tbody = document.getElementById('customers');
+    if (!tbody) { return; }
+    var html = visibleCustomers(load()).map(function (customer) {
+      return '<tr class="ng-scope">' +
+        '<td class="ng-binding">' + customer.fName + '</td>' +
+        '<td class="ng-binding">' + customer.lName + '</td>' +
+        '<td class="ng-binding">' + customer.postCd + '</td>' +
+        '<td class="ng-binding">' + customer.accountNo.map(function (n) {
+          return '<span class="ng-binding ng-scope">' + n + ' </span>';
+        }).join('') + '</td>' +
+        '<td><button class="btn" data-delete="' + customer.id + '">Delete</button></td>' +
+        '</tr>';
+    }).join('');
+    tbody.innerHTML = html;
+  }
+
+  function renderList() {
+    var header = columns.map(function (column) {
+      return '<td><a href="" data-sort="' + column[0] + '">' + column[1] + '</a></td>';
+    }).join('');
+    view.innerHTML =
+      '<form><div class="input-group">' +
+      '<input type="text" class="form-control" placeholder="Search Customer" id="searchCustomer">' +
+      '</div></form>' +
+      '<table class="table table-bordered table-striped">' +
+      '<thead><tr>' + header + '<td>Account Number</td><td>Delete Customer</td></tr></thead>' +
+      '<tbody id="customers"></tbody></table>';
+    var input = document.getElementById('searchCustomer');
+    input.value = state.search;
+    input.addEventListener('input', function () {
+      state.search = input.value;
+      renderRows();
+    });
+    renderRows();
+  }
+
+  function route() {
+    if (location.hash === '#/manager/list') {
+      renderList();
+    } else {
+      view.innerHTML = '<div class="form-group">' + location.hash + '</div>';
+    }
+  }
+
+  document.addEventListener('click', function (event) {
+    var target = event.target;
+    if (target.getAttribute('data-sort')) {
+      event.preventDefault();
+      state.sortType = target.getAttribute('data-sort');
+      state.sortReverse = !state.sortReverse;
+      renderRows();
+    } else if (target.getAttribute('data-delete')) {
+      deleteCustomer(target.getAttribute('data-delete'));
+    } else if (target.getAttribute('data-route')) {
+      location.hash = target.getAttribute('data-route');
+    }
+  });
+  window.addEventListener('hashchange', route);
+
+  if (localStorage.getItem('User')) {
+    route();
+  } else {
+    // First visit: seed the store from the server's fixture data
+    var request = new XMLHttpRequest();
+    request.open('GET', '/api/customers');
+    request.onload = function () {
+      save(JSON.parse(request.responseText));
+      route();
+    };
+    request.send();
+  }
+})();
+</script>
+</body>
+</html>
+"""
+
+
+class BankingRequestHandler(BaseHTTPRequestHandler):
+    """Serves the customer list page and its fixture data"""
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path in ('/', APP_PATH, APP_PATH.rstrip('/'), APP_PATH + 'index.html'):
+            self._respond(200, 'text/html; charset=utf-8', PAGE_HTML.encode('utf-8'))
+        elif path == '/api/customers':
+            self._respond(200, 'application/json', self.server.fixture_json)
+        else:
+            self._respond(404, 'text/plain; charset=utf-8', b'Not found')
+
+    def _respond(self, status, content_type, body):
+        """Send a response after the configured latency"""
+        delay = self.server.next_delay()
+        if delay > 0:
+            time.sleep(delay)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep test output clean
+        pass
+
+
+class LocalBankingServer(ThreadingHTTPServer):
+    """HTTP server for the local Banking Project stand-in"""
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, rows=len(DEFAULT_CUSTOMERS), seed=0,
+                 latency=0.0, jitter=0.0):
+        """
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+            rows (int): Number of customers in the fixture
+            seed (int): Seed for generated customers and latency jitter
+            latency (float): Seconds added to every response
+            jitter (float): Maximum extra random seconds per response
+        """
+        super().__init__((host, port), BankingRequestHandler)
+        self.rows = rows
+        self.seed = seed
+        self.latency = latency
+        self.jitter = jitter
+        self.fixture_json = json.dumps(build_fixture(rows, seed)).encode('utf-8')
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """Origin of the server, e.g. http://127.0.0.1:8765"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def fingerprint(self):
+        """Hash of the served page and fixture data (an app-version fingerprint)"""
+        return hashlib.sha256(PAGE_HTML.encode('utf-8') + self.fixture_json).hexdigest()[:16]
+
+    @property
+    def list_url(self):
+        """URL of the manager's customer list page"""
+        return f"{self.base_url}{APP_PATH}#/manager/list"
+
+    def next_delay(self):
+        """Seconds to wait before the next response"""
+        if not self.jitter:
+            return self.latency
+        with self._rng_lock:
+            return self.latency + self._rng.uniform(0, self.jitter)
+
+    def start(self):
+        """
+        Serve requests on a background thread
+
+        Returns:
+            LocalBankingServer: self, for chaining
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self.shutdown()
+        self.server_close()
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Serve an offline Banking Project customer list")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to bind")
+    parser.add_argument("--rows", type=int, default=len(DEFAULT_CUSTOMERS),
+                        help="Number of customers in the fixture data")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for generated customers")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Milliseconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Maximum extra random milliseconds per response")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    server = LocalBankingServer(args.host, args.port, rows=args.rows, seed=args.seed,
+                                latency=args.latency / 1000.0, jitter=args.jitter / 1000.0)
+    print(f"✓ Serving {args.rows} customers at {server.list_url}")
+    print(f"  Use --site-url {server.base_url} with CustomerManage.py to run against it")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,167 @@
+"""
+Parallel Test Runner
+Splits CSV rows across a process pool; each worker drives its own headless Chrome
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import util as multiprocessing_util
+import sys
+import traceback
+import unittest
+
+from reporter import close_reporter, get_reporter
+from session_pool import close_shared_pool
+
+
+class RowResultCollector(unittest.TestResult):
+    """Test result that records every subTest outcome as a plain dictionary"""
+
+    def __init__(self, suite_name=None):
+        super().__init__()
+        self.suite_name = suite_name
+        self.records = []
+
+    def _record(self, test, outcome, err=None, params=None):
+        """Append one picklable result record"""
+        params = dict(params or {})
+        record = {
+            'suite': params.pop('suite', None) or self.suite_name or type(test).__name__,
+            'test': getattr(test, '_testMethodName', str(test)),
+            'test_case': params.pop('test_case', None),
+            'params': {key: str(value) for key, value in params.items()},
+            'outcome': outcome,
+            'message': '',
+            'traceback': '',
+        }
+        if err is not None:
+            record['message'] = str(err[1])
+            record['traceback'] = ''.join(traceback.format_exception(*err))
+        self.records.append(record)
+
+    def addSubTest(self, test, subtest, err):
+        super().addSubTest(test, subtest, err)
+        if err is None:
+            outcome = 'passed'
+        elif issubclass(err[0], test.failureException):
+            outcome = 'failed'
+        else:
+            outcome = 'error'
+        self._record(test, outcome, err, params=subtest.params)
+
+    def addError(self, test, err):
+        # Errors outside a subTest (e.g. setUpClass could not start Chrome)
+        super().addError(test, err)
+        self._record(test, 'error', err)
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._record(test, 'failed', err)
+
+
+def _close_if_imported(module_name, function_name):
+    """Call a module's cleanup function, unless the module was never imported (nothing to close)"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        getattr(module, function_name)()
+
+
+def _init_worker():
+    """Quit pooled browsers and flush reports when the worker process shuts down"""
+    # Forked pool workers exit without running atexit handlers, but they do
+    # run multiprocessing finalizers
+    multiprocessing_util.Finalize(None, close_shared_pool, exitpriority=10)
+    # Pooled CDP tabs close before their browser does; the CDP backend and
+    # artifact store are imported only by runs that use them
+    multiprocessing_util.Finalize(None, _close_if_imported, args=('cdp_driver', 'close_cdp_browsers'),
+                                  exitpriority=5)
+    multiprocessing_util.Finalize(None, close_reporter, exitpriority=10)
+    # Queued artifact writes finish before the worker exits
+    multiprocessing_util.Finalize(None, _close_if_imported, args=('failure_artifacts', 'close_artifact_stores'),
+                                  exitpriority=10)
+
+
+def run_shard(test_class, shard_index, shard_count, class_config=None):
+    """
+    Run one shard of a test class in the current process
+
+    Executed inside a pool worker, so the class attributes set here only
+    affect this worker's copy of the class. Shards that land on the same
+    worker share its pooled browser.
+
+    Args:
+        test_class (type): BaseDataDrivenTest subclass to run
+        shard_index (int): Shard assigned to this worker
+        shard_count (int): Total number of shards
+        class_config (dict): Extra class attributes to set (e.g. site_url_base)
+
+    Returns:
+        list: Result records for every row in the shard
+    """
+    for name, value in (class_config or {}).items():
+        setattr(test_class, name, value)
+    test_class.headless = True
+    
+    # Workers only write event files; the parent owns the console and JUnit
+    test_class.verbose_console = False
+    get_reporter(report_dir=test_class.report_dir, verbose=False, progress=False, junit=False)
+    test_class.shard_index = shard_index
+    test_class.shard_count = shard_count
+
+    suite = unittest.TestLoader().loadTestsFromTestCase(test_class)
+    result = RowResultCollector(suite_name=test_class.__name__)
+    suite.run(result)
+    # Rows skipped by --incremental never reach the test result
+    for suite, test_case in getattr(test_class, 'cached_rows', []):
+        result.records.append({
+            'suite': suite,
+            'test': '',
+            'test_case': test_case,
+            'params': {},
+            'outcome': 'cached',
+            'message': '',
+            'traceback': '',
+        })
+    return result.records
+
+
+def run_parallel(test_classes, workers, class_config=None):
+    """
+    Run test classes with their CSV rows split across a process pool
+
+    Every class is cut into `workers` shards, so the pool stays busy even
+    when one class has far more rows than the others.
+
+    Args:
+        test_classes (list): BaseDataDrivenTest subclasses to run
+        workers (int): Number of worker processes
+        class_config (dict): Extra class attributes to set in every worker
+
+    Returns:
+        list: Merged result records sorted by suite and row index
+    """
+    records = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {
+            executor.submit(run_shard, test_class, shard_index, workers, class_config): (test_class, shard_index)
+            for test_class in test_classes
+            for shard_index in range(workers)
+        }
+        for future in as_completed(futures):
+            test_class, shard_index = futures[future]
+            try:
+                records.extend(future.result())
+            except Exception as e:
+                # The worker process itself died (e.g. crashed browser)
+                records.append({
+                    'suite': test_class.__name__,
+                    'test': f'shard {shard_index + 1}/{workers}',
+                    'test_case': None,
+                    'params': {},
+                    'outcome': 'error',
+                    'message': f"Worker failed: {str(e)}",
+                    'traceback': '',
+                })
+
+    records.sort(key=lambda r: (r['suite'], r['test_case'] is None, r['test_case'] or 0))
+    return records
+
@@ -0,0 +1,394 @@
+"""
+Buffered Result Reporter
+Collects test step events in a bounded in-memory buffer (emitters wait for
+a flush when it is full, so no event is dropped); a background thread
+flushes them to JSON Lines and keeps a one-line console progress display,
+and the final row results are written as JUnit XML
+"""
+
+from collections import deque
+from xml.etree import ElementTree
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+
+
+class Reporter:
+    """Structured, non-blocking reporter for data-driven test rows"""
+
+    LEVELS = {'✓': 'info', '⚠': 'warning', '✗': 'error'}
+
+    def __init__(self, report_dir=None, verbose=False, progress=True, junit=True, capacity=8192,
+                 flush_interval=0.25, stream=None):
+        """
+        Args:
+            report_dir (str): Directory for events-<pid>.jsonl and junit-<pid>.xml (optional)
+            verbose (bool): Print every event synchronously, like plain print() output
+            progress (bool): Show a compact progress line on the console
+            junit (bool): Write JUnit XML on close (when report_dir is set)
+            capacity (int): Events buffered before emitters wait for a flush
+            flush_interval (float): Seconds between background flushes
+            stream (file): Console stream (defaults to sys.stdout)
+        """
+        self.report_dir = report_dir
+        self.verbose = verbose
+        self.progress = progress and not verbose
+        self._options = {'report_dir': report_dir, 'verbose': verbose, 'progress': progress, 'junit': junit,
+                         'capacity': capacity, 'flush_interval': flush_interval, 'stream': stream}
+        self.junit = junit
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.stream = stream or sys.stdout
+        self.pid = os.getpid()
+        self.rows = {}           # (suite, test_case) -> row result
+        self.passed = 0
+        self.failed = 0
+        self.cached = 0
+
+        self._buffer = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._events_file = None
+        self._progress_width = 0
+        self._is_tty = hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self._thread = threading.Thread(target=self._run, name='reporter-flush', daemon=True)
+        self._thread.start()
+
+    def configure(self, **options):
+        """
+        Change settings of the live reporter; only options that differ are applied
+
+        Args:
+            **options: Any of the constructor's arguments
+
+        Raises:
+            TypeError: If an option is not a Reporter argument
+        """
+        unknown = set(options) - set(self._options)
+        if unknown:
+            raise TypeError(f"Unknown reporter option(s): {', '.join(sorted(unknown))}")
+        changed = {name: value for name, value in options.items() if self._options[name] != value}
+        if not changed:
+            return
+        with self._condition:
+            self._clear_progress()
+            self._options.update(changed)
+            if 'report_dir' in changed:
+                if self._events_file:
+                    # The next flush opens the events file in the new directory
+                    self._events_file.close()
+                    self._events_file = None
+                self.report_dir = self._options['report_dir']
+            if 'stream' in changed:
+                self.stream = self._options['stream'] or sys.stdout
+                self._is_tty = hasattr(self.stream, 'isatty') and self.stream.isatty()
+            self.verbose = self._options['verbose']
+            self.progress = self._options['progress'] and not self.verbose
+            self.junit = self._options['junit']
+            self.capacity = self._options['capacity']
+            self.flush_interval = self._options['flush_interval']
+            self._condition.notify_all()
+
+    def emit(self, kind, message='', suite=None, test_case=None, **fields):
+        """
+        Queue one event; blocks only if the buffer is full
+
+        Args:
+            kind (str): Event kind ('log', 'row_started', 'row_finished', ...)
+            message (str): Human readable message
+            suite (str): Test class name
+            test_case (int): Row index
+            **fields: Extra JSON-serializable fields
+        """
+        event = {'ts': time.time(), 'kind': kind, 'suite': suite, 'test_case': test_case,
+                 'message': message}
+        event.update(fields)
+        if self.verbose:
+            self._print_verbose(event)
+        with self._condition:
+            while len(self._buffer) >= self.capacity and not self._closed:
+                self._condition.notify_all()
+                self._condition.wait()
+            self._buffer.append(event)
+            if len(self._buffer) >= self.capacity // 2:
+                self._condition.notify_all()
+
+    def log(self, suite, test_case, message):
+        """
+        Record a step message such as '✓ Page loaded successfully'
+
+        Args:
+            suite (str): Test class name
+            test_case (int): Row index
+            message (str): Message; a leading ✓/⚠/✗ sets the level
+        """
+        level = self.LEVELS.get(message[:1], 'info')
+        self.emit('log', message, suite=suite, test_case=test_case, level=level)
+
+    def row_started(self, suite, test_case, title="Test Case"):
+        """Mark the start of a row"""
+        self.rows[(suite, test_case)] = {'suite': suite, 'test_case': test_case, 'title': title,
+                                         'started': time.time(), 'passed': None,
+                                         'message': '', 'duration': None}
+        self.emit('row_started', title, suite=suite, test_case=test_case)
+
+    def row_finished(self, suite, test_case, passed, message=''):
+        """
+        Mark the end of a row
+
+        Args:
+            suite (str): Test class name
+            test_case (int): Row index
+            passed (bool): Row outcome
+            message (str): Success message or error text
+        """
+        row = self.rows.setdefault((suite, test_case), {'suite': suite, 'test_case': test_case,
+                                                        'title': "Test Case", 'started': None})
+        # A row reported twice (e.g. failed after an earlier pass) counts once
+        if row.get('passed') is True:
+            self.passed -= 1
+        elif row.get('passed') is False:
+            self.failed -= 1
+        row['passed'] = passed
+        row['message'] = message
+        row['duration'] = time.time() - row['started'] if row.get('started') else None
+        if passed:
+            self.passed += 1
+        else:
+            self.failed += 1
+        self.emit('row_finished', message, suite=suite, test_case=test_case, passed=passed,
+                  duration=row['duration'])
+
+    def row_cached(self, suite, test_case, message="cached result still valid"):
+        """
+        Record a row skipped because its previous passing result still applies
+
+        Args:
+            suite (str): Test class name
+            test_case (int): Row index
+            message (str): Reason shown in reports
+        """
+        previous = self.rows.get((suite, test_case), {})
+        if previous.get('passed') is True:
+            self.passed -= 1
+        elif previous.get('passed') is False:
+            self.failed -= 1
+        if not previous.get('cached'):
+            self.cached += 1
+        self.rows[(suite, test_case)] = {'suite': suite, 'test_case': test_case, 'title': "Test Case",
+                                         'started': None, 'passed': None, 'cached': True,
+                                         'message': message, 'duration': None}
+        self.emit('row_cached', message, suite=suite, test_case=test_case)
+
+    def record_row(self, suite, test_case, passed, message='', duration=None):
+        """
+        Record a row that ran elsewhere (e.g. in a parallel worker)
+
+        Args:
+            suite (str): Test class name
+            test_case (int): Row index
+            passed (bool): Row outcome
+            message (str): Error text for failed rows
+            duration (float): Row duration in seconds, if known
+        """
+        self.row_finished(suite, test_case, passed, message)
+        self.rows[(suite, test_case)]['duration'] = duration
+
+    def echo(self, text):
+        """Print text immediately, keeping the progress line intact"""
+        with self._condition:
+            self._clear_progress()
+            print(text, file=self.stream)
+
+    def notice(self, message, suite=None):
+        """
+        Record a message outside any row and always show it on the console
+
+        Args:
+            message (str): Message; a leading ✓/⚠/✗ sets the level
+            suite (str): Test class or component name (optional)
+        """
+        self.log(suite, None, message)
+        if not self.verbose:
+            # Verbose mode already printed it
+            self.echo(message)
+
+    def summary(self):
+        """
+        Row counts overall and per suite
+
+        Returns:
+            dict: {'total', 'passed', 'failed', 'cached',
+                   'suites': {suite: {'total', 'passed', 'failed', 'cached'}}}
+        """
+        suites = {}
+        for row in self.rows.values():
+            if row.get('cached'):
+                outcome = 'cached'
+            elif row.get('passed') is None:
+                continue
+            else:
+                outcome = 'passed' if row['passed'] else 'failed'
+            counts = suites.setdefault(row['suite'], {'total': 0, 'passed': 0, 'failed': 0, 'cached': 0})
+            counts['total'] += 1
+            counts[outcome] += 1
+        return {'total': self.passed + self.failed + self.cached, 'passed': self.passed,
+                'failed': self.failed, 'cached': self.cached, 'suites': suites}
+
+    def close(self):
+        """Flush remaining events, write JUnit XML and stop the flush thread"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        with self._condition:
+            self._clear_progress()
+        if self._events_file:
+            self._events_file.close()
+        if self.report_dir and self.junit:
+            self.write_junit(os.path.join(self.report_dir, f"junit-{self.pid}.xml"))
+
+    def write_junit(self, path):
+        """
+        Write finished rows as JUnit XML, one testcase per row
+
+        Args:
+            path (str): Output file
+        """
+        root = ElementTree.Element('testsuites')
+        by_suite = {}
+        for row in self.rows.values():
+            if row.get('passed') is not None or row.get('cached'):
+                by_suite.setdefault(row['suite'], []).append(row)
+        for suite, rows in by_suite.items():
+            rows.sort(key=lambda row: (row['test_case'] is None, row['test_case'] or 0))
+            failures = sum(1 for row in rows if row['passed'] is False)
+            skipped = sum(1 for row in rows if row.get('cached'))
+            total_time = sum(row['duration'] or 0 for row in rows)
+            suite_element = ElementTree.SubElement(root, 'testsuite', name=str(suite), tests=str(len(rows)),
+                                                   failures=str(failures), skipped=str(skipped),
+                                                   time=f"{total_time:.3f}")
+            for row in rows:
+                case = ElementTree.SubElement(suite_element, 'testcase', classname=str(suite),
+                                              name=f"row {row['test_case']}",
+                                              time=f"{row['duration'] or 0:.3f}")
+                if row.get('cached'):
+                    ElementTree.SubElement(case, 'skipped', message=row['message'])
+                elif not row['passed']:
+                    failure = ElementTree.SubElement(case, 'failure', message=row['message'])
+                    failure.text = row['message']
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        ElementTree.ElementTree(root).write(path, encoding='utf-8', xml_declaration=True)
+
+    def _run(self):
+        """Background loop: drain the buffer to disk and refresh progress"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or len(self._buffer) >= self.capacity // 2,
+                    timeout=self.flush_interval)
+                batch = list(self._buffer)
+                self._buffer.clear()
+                closed = self._closed
+                self._condition.notify_all()
+            if batch:
+                self._write_events(batch)
+            if self.progress:
+                self._show_progress(batch)
+            if closed:
+                return
+
+    def _write_events(self, batch):
+        """Append events to the JSON Lines file"""
+        if not self.report_dir:
+            return
+        if self._events_file is None:
+            os.makedirs(self.report_dir, exist_ok=True)
+            path = os.path.join(self.report_dir, f"events-{self.pid}.jsonl")
+            self._events_file = open(path, 'a', encoding='utf-8')
+        self._events_file.write(''.join(json.dumps(event, default=str) + '\n' for event in batch))
+        self._events_file.flush()
+
+    def _show_progress(self, batch):
+        """Redraw the one-line progress display"""
+        if not self._is_tty:
+            return
+        suite = next((event['suite'] for event in reversed(batch) if event['suite']), None)
+        line = f"[{suite or 'tests'}] rows: {self.passed + self.failed}  ✓ {self.passed}  ✗ {self.failed}"
+        if self.cached:
+            line += f"  cached {self.cached}"
+        with self._condition:
+            padding = ' ' * max(self._progress_width - len(line), 0)
+            self.stream.write('\r' + line + padding)
+            self.stream.flush()
+            self._progress_width = len(line)
+
+    def _clear_progress(self):
+        """Erase the progress line (caller holds the lock)"""
+        if self._progress_width:
+            self.stream.write('\r' + ' ' * self._progress_width + '\r')
+            self.stream.flush()
+            self._progress_width = 0
+
+    def _print_verbose(self, event):
+        """Print an event the way the suites used to print it"""
+        kind = event['kind']
+        if kind == 'row_started':
+            print(f"\n{'='*60}\n{event['message']} {event['test_case']}\n{'='*60}", file=self.stream)
+        elif kind == 'row_finished':
+            print('=' * 60, file=self.stream)
+            if event['passed']:
+                print(f"✓✓✓ Test Case {event['test_case']} PASSED ✓✓✓", file=self.stream)
+                if event['message']:
+                    print(f"    {event['message']}", file=self.stream)
+            else:
+                print(f"✗✗✗ Test Case {event['test_case']} FAILED ✗✗✗", file=self.stream)
+                if event['message']:
+                    print(f"    Error: {event['message']}", file=self.stream)
+            print('=' * 60, file=self.stream)
+        elif kind == 'row_cached':
+            print(f"✓ Test Case {event['test_case']} skipped ({event['message']})", file=self.stream)
+        else:
+            print(event['message'], file=self.stream)
+
+
+_reporter = None
+_reporter_lock = threading.Lock()
+
+
+def get_reporter(**options):
+    """
+    Get this process's reporter, creating it on first use
+
+    A forked worker gets its own reporter (and flush thread) instead of
+    the copy inherited from its parent. Options passed once the reporter
+    exists reconfigure it (see Reporter.configure).
+
+    Args:
+        **options: Reporter arguments
+
+    Returns:
+        Reporter: Reporter for this process
+    """
+    global _reporter
+    with _reporter_lock:
+        if _reporter is None or _reporter.pid != os.getpid():
+            _reporter = Reporter(**options)
+            atexit.register(close_reporter)
+        elif options:
+            _reporter.configure(**options)
+        return _reporter
+
+
+def close_reporter():
+    """Flush and close this process's reporter, if any"""
+    global _reporter
+    with _reporter_lock:
+        reporter, _reporter = _reporter, None
+    if reporter is not None and reporter.pid == os.getpid():
+        reporter.close()
@@ -0,0 +1,158 @@
+"""
+Incremental Row Result Cache
+Remembers each CSV row's last result under a key built from the row
+content, the test-module source and an app-version fingerprint, so
+unchanged rows that passed can be skipped on the next run
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class ResultCache:
+    """Row results keyed by row content, test source and app version"""
+
+    def __init__(self, path, max_entries=20000):
+        """
+        Args:
+            path (str): JSON file holding the cached results
+            max_entries (int): Most recent results kept in the file
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.results = self._read(path) if os.path.exists(path) else {}
+        self._updated = {}
+        self._source_hashes = {}
+        self._lock = threading.Lock()
+
+    def source_hash(self, test_class):
+        """
+        Hash of the source files a test class runs
+
+        Covers the modules of the class and its bases, plus any project files
+        listed in the class's CACHE_SOURCES (e.g. step definitions).
+
+        Args:
+            test_class (type): Test class
+
+        Returns:
+            str: Hex digest
+        """
+        if test_class not in self._source_hashes:
+            digest = hashlib.sha256()
+            paths = {getattr(sys.modules.get(klass.__module__), '__file__', None)
+                     for klass in test_class.__mro__}
+            paths.update(os.path.join(PROJECT_DIR, path)
+                         for path in getattr(test_class, 'CACHE_SOURCES', ()))
+            # Only project files; unittest itself does not change between runs
+            for path in sorted(os.path.abspath(path) for path in paths if path):
+                if not path.startswith(PROJECT_DIR + os.sep):
+                    continue
+                with open(path, 'rb') as file:
+                    digest.update(os.path.basename(path).encode('utf-8'))
+                    digest.update(file.read())
+            self._source_hashes[test_class] = digest.hexdigest()
+        return self._source_hashes[test_class]
+
+    def row_key(self, test_class, row, app_version=''):
+        """
+        Cache key for one CSV row
+
+        Args:
+            test_class (type): Test class running the row
+            row (dict): Row data as read from the CSV, before any siteUrl
+                        rewrite (app_version identifies the target instead)
+            app_version (str): Fingerprint of the application under test
+
+        Returns:
+            str: Hex digest
+        """
+        digest = hashlib.sha256()
+        digest.update(test_class.__name__.encode('utf-8'))
+        digest.update(self.source_hash(test_class).encode('ascii'))
+        digest.update(str(app_version).encode('utf-8'))
+        digest.update(json.dumps(row, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def passed(self, key):
+        """
+        Whether the row last passed with exactly this key
+
+        Args:
+            key (str): Key from row_key()
+
+        Returns:
+            bool: True if the cached result can be reused
+        """
+        with self._lock:
+            result = self._updated.get(key) or self.results.get(key)
+        return bool(result and result['passed'])
+
+    def record(self, key, passed, suite=None, test_case=None):
+        """
+        Store a row's result
+
+        Args:
+            key (str): Key from row_key()
+            passed (bool): Row outcome
+            suite (str): Test class name (for readability of the file)
+            test_case (int): Row index
+        """
+        with self._lock:
+            self._updated[key] = {'passed': passed, 'suite': suite, 'test_case': test_case,
+                                  'ts': time.time()}
+
+    def save(self):
+        """Merge this process's results into the file (other workers may share it)"""
+        with self._lock:
+            updated, self._updated = self._updated, {}
+        if not updated:
+            return
+        merged = self._read(self.path) if os.path.exists(self.path) else {}
+        merged.update(updated)
+        if len(merged) > self.max_entries:
+            newest = sorted(merged.items(), key=lambda item: item[1].get('ts', 0))[-self.max_entries:]
+            merged = dict(newest)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(merged, file)
+        os.replace(temporary, self.path)
+        with self._lock:
+            self.results.update(updated)
+
+    @staticmethod
+    def _read(path):
+        """Load a cache file, treating a corrupt file as empty"""
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache(path):
+    """
+    Get this process's ResultCache for a file
+
+    Args:
+        path (str): JSON cache file
+
+    Returns:
+        ResultCache: Cache for the file
+    """
+    key = os.path.abspath(path)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ResultCache(key)
+        return _caches[key]
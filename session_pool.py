@@ -0,0 +1,187 @@
+"""
+WebDriver Session Pool
+Leases warm browser sessions to test classes so a long suite only pays
+browser and chromedriver startup a few times
+"""
+
+import atexit
+import threading
+
+from reporter import get_reporter
+
+
+class SessionPool:
+    """Bounded pool of reusable WebDriver sessions"""
+
+    def __init__(self, max_size=2):
+        """
+        Args:
+            max_size (int): Maximum number of live browser sessions
+        """
+        self.max_size = max_size
+        self._lock = threading.Condition()
+        self._idle = []          # [(key, driver)] ready to be leased
+        self._keys = {}          # id(driver) -> key, for every live driver
+        self._starting = 0       # sessions being launched outside the lock
+        self.created = 0
+        self.reused = 0
+
+    @property
+    def size(self):
+        """Number of live sessions (leased and idle)"""
+        return len(self._keys) + self._starting
+
+    def acquire(self, factory, key=None):
+        """
+        Lease a driver, reusing an idle session created with the same key
+
+        Args:
+            factory (callable): Creates a new driver when none can be reused
+            key (hashable): Session configuration (e.g. Chrome arguments);
+                            only sessions with an equal key are reused
+
+        Returns:
+            WebDriver: Leased driver; hand it back with release()
+        """
+        with self._lock:
+            while True:
+                for position, (idle_key, driver) in enumerate(self._idle):
+                    if idle_key == key:
+                        del self._idle[position]
+                        self.reused += 1
+                        return driver
+
+                if self.size < self.max_size:
+                    # Reserve the slot before launching outside the lock
+                    self._starting += 1
+                    break
+
+                if self._idle:
+                    # Pool is full of sessions with another configuration
+                    _, stale = self._idle.pop(0)
+                    self._discard(stale)
+                    continue
+
+                self._lock.wait()
+
+        try:
+            driver = factory()
+        except Exception:
+            with self._lock:
+                self._starting -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self._starting -= 1
+            self._keys[id(driver)] = key
+            self.created += 1
+        return driver
+
+    def release(self, driver):
+        """
+        Return a leased driver to the pool after resetting its state
+
+        Drivers that cannot be reset (crashed tab, dead chromedriver) are
+        quit and dropped so the next lease starts a fresh session.
+
+        Args:
+            driver (WebDriver): Driver obtained from acquire()
+        """
+        try:
+            self.reset(driver)
+        except Exception as e:
+            get_reporter().notice(f"⚠ Could not reset browser session, discarding it: {str(e)}", 'SessionPool')
+            with self._lock:
+                self._discard(driver)
+                self._lock.notify()
+            return
+
+        with self._lock:
+            self._idle.append((self._keys.get(id(driver)), driver))
+            self._lock.notify()
+
+    @staticmethod
+    def reset(driver):
+        """
+        Clear cookies, web storage and extra windows, then park on about:blank
+
+        Args:
+            driver (WebDriver): Driver to reset
+        """
+        # Close any windows a test left open, keeping the first one
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        # Storage is per origin, so clear it before leaving the app's page
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            # about:blank and data: pages have no accessible storage
+            pass
+
+        try:
+            # Clears cookies for every domain, not just the current one
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        except Exception:
+            driver.delete_all_cookies()
+
+        driver.get('about:blank')
+
+    def discard(self, driver):
+        """
+        Quit a leased driver instead of returning it to the pool
+
+        Args:
+            driver (WebDriver): Driver obtained from acquire() that should not
+                                be reused (e.g. a bloated or unresponsive browser)
+        """
+        with self._lock:
+            self._discard(driver)
+            self._lock.notify()
+
+    def close(self):
+        """Quit every idle session"""
+        with self._lock:
+            while self._idle:
+                _, driver = self._idle.pop()
+                self._discard(driver)
+
+    def _discard(self, driver):
+        """Quit a driver and forget it (caller holds the lock)"""
+        self._keys.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_pool(max_size=2):
+    """
+    Get the process-wide session pool, creating it on first use
+
+    Args:
+        max_size (int): Pool size used when the pool is first created
+
+    Returns:
+        SessionPool: Shared pool for this process
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = SessionPool(max_size=max_size)
+            atexit.register(_shared_pool.close)
+        return _shared_pool
+
+
+def close_shared_pool():
+    """Quit all idle sessions in the process-wide pool"""
+    if _shared_pool is not None:
+        _shared_pool.close()
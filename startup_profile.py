@@ -0,0 +1,71 @@
+"""
+Startup Profile
+Records how long a run spends importing modules and resolving and
+launching browsers before its first row, for --startup-profile
+"""
+
+from contextlib import contextmanager
+import threading
+import time
+
+
+class StartupProfile:
+    """Timed startup phases of this process"""
+
+    def __init__(self):
+        self.phases = []
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, detail=''):
+        """
+        Add one timed phase
+
+        Args:
+            name (str): Phase, e.g. 'browser launch'
+            seconds (float): Wall-clock duration
+            detail (str): What the phase covered, e.g. a module or class name
+        """
+        with self._lock:
+            self.phases.append((name, seconds, detail))
+
+    @contextmanager
+    def phase(self, name, detail=''):
+        """Time the enclosed block as one phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started, detail)
+
+    def format(self):
+        """
+        Phase table, one line per phase plus a total per phase name
+
+        Returns:
+            str: Multi-line text, or '' if nothing was recorded
+        """
+        with self._lock:
+            phases = list(self.phases)
+        if not phases:
+            return ''
+        lines = ["Startup profile:"]
+        lines.extend(f"  {name:<20} {seconds * 1000:>9.1f} ms  {detail}".rstrip()
+                     for name, seconds, detail in phases)
+        totals = {}
+        for name, seconds, _ in phases:
+            totals[name] = totals.get(name, 0.0) + seconds
+        lines.append("  " + ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in totals.items()))
+        return "\n".join(lines)
+
+
+_profile = StartupProfile()
+
+
+def get_startup_profile():
+    """
+    Get this process's StartupProfile
+
+    Returns:
+        StartupProfile: Shared profile
+    """
+    return _profile
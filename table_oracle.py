@@ -0,0 +1,178 @@
+"""
+Search and Sort Oracle
+Models the customer table in Python from one snapshot per page load and
+predicts what each search text and sort label must show, so a row is
+verified with a single table read
+"""
+
+from collections import Counter
+
+# Separates a row's values in its search blob; never part of a search text
+VALUE_SEPARATOR = '\x00'
+
+
+class TableOracle:
+    """Expected search and sort results for a table, computed from a baseline snapshot"""
+
+    def __init__(self, snapshot, multi_value_columns=('Account Number',),
+                 ignore_columns=('Delete Customer',)):
+        """
+        Args:
+            snapshot (TableSnapshot): Unfiltered table right after the page loaded
+            multi_value_columns (tuple): Columns rendering a list of values separated by
+                                         spaces (AngularJS filter matches each value on its own)
+            ignore_columns (tuple): Columns that are not model data (e.g. button captions)
+        """
+        self.header = list(snapshot.header)
+        self.rows = [tuple(row) for row in snapshot.rows]
+        self._row_counts = Counter(self.rows)
+        self._sorted_keys = {}
+
+        labels = [label.lower() for label in self.header]
+        ignored = {label.lower() for label in ignore_columns}
+        multi = {label.lower() for label in multi_value_columns}
+        searchable = [(index, label in multi) for index, label in enumerate(labels) if label not in ignored]
+        # One lowercase blob per row, built once: a search is then a C-level
+        # substring test per row instead of a loop over its cells
+        self._blobs = [VALUE_SEPARATOR.join(self._values(row, searchable)).lower() for row in self.rows]
+
+    @staticmethod
+    def _values(row, searchable):
+        """Model values of a row: one per cell, or one per token in multi-value cells"""
+        values = []
+        for index, split in searchable:
+            cell = row[index] if index < len(row) else ''
+            values.extend(cell.split() if split else [cell])
+        return values
+
+    @property
+    def row_count(self):
+        """Number of rows in the baseline"""
+        return len(self.rows)
+
+    def search(self, text):
+        """
+        Rows AngularJS's `filter` keeps for a search text
+
+        The text is one substring matched case-insensitively against each
+        value, not a list of tokens: '1007 1008 1009' matches no customer,
+        because every account number is a separate value. A leading '!'
+        keeps the rows that do not match.
+
+        Args:
+            text (str): Search text
+
+        Returns:
+            list: Expected rows (tuples of cell text), in baseline order
+        """
+        needle = (text or '').lower()
+        negate = needle.startswith('!')
+        if negate:
+            needle = needle[1:]
+        if not needle:
+            return list(self.rows)
+        return [row for row, blob in zip(self.rows, self._blobs) if (needle in blob) != negate]
+
+    def verify_search(self, text, snapshot):
+        """
+        Compare a filtered table with the expected search result
+
+        Rows are compared as a multiset, so the current sort order does
+        not matter. The customer id is filtered on but not shown, so a
+        numeric text may also keep rows the oracle cannot see; those extra
+        rows are reported but tolerated.
+
+        Args:
+            text (str): Search text
+            snapshot (TableSnapshot): Table after the search settled
+
+        Returns:
+            dict: 'ok' (bool), 'expected' and 'actual' row counts, and 'message'
+        """
+        expected = Counter(self.search(text))
+        actual = Counter(tuple(row) for row in snapshot.rows)
+        missing = expected - actual
+        extra = actual - expected
+        tolerated = bool(extra) and not missing and text.strip().isdigit() and not (extra - self._row_counts)
+        ok = not missing and (not extra or tolerated)
+        message = f"expected {sum(expected.values())} row(s), got {sum(actual.values())}"
+        if missing:
+            message += f"; missing {self._describe(missing)}"
+        if extra:
+            message += f"; unexpected {self._describe(extra)}"
+            if tolerated:
+                message += " (may match the hidden customer id)"
+        return {'ok': ok, 'expected': sum(expected.values()), 'actual': sum(actual.values()),
+                'message': message}
+
+    def sorted_keys(self, label):
+        """
+        Ascending sort keys of a column, compared like AngularJS orderBy
+
+        Args:
+            label (str): Header label, e.g. 'First Name'
+
+        Returns:
+            list: Keys in ascending order, or None if the column does not exist
+        """
+        if label not in self._sorted_keys:
+            index = self._column_index(label)
+            self._sorted_keys[label] = None if index is None else \
+                sorted(self._sort_key(row[index] if index < len(row) else '') for row in self.rows)
+        return self._sorted_keys[label]
+
+    def verify_sort(self, label, snapshot):
+        """
+        Check that a sorted table holds the baseline rows ordered by a column
+
+        Args:
+            label (str): Header label of the sorted column
+            snapshot (TableSnapshot): Table after the sort settled
+
+        Returns:
+            dict: 'ok' (bool), 'order' ('ascending', 'descending' or None) and 'message'
+        """
+        ascending = self.sorted_keys(label)
+        index = self._column_index(label)
+        if ascending is None:
+            return {'ok': False, 'order': None, 'message': f"column '{label}' not found"}
+        actual_rows = Counter(tuple(row) for row in snapshot.rows)
+        if actual_rows != self._row_counts:
+            missing, extra = self._row_counts - actual_rows, actual_rows - self._row_counts
+            return {'ok': False, 'order': None,
+                    'message': f"sorting changed the rows (missing {self._describe(missing) or 'none'}, "
+                               f"unexpected {self._describe(extra) or 'none'})"}
+        keys = [self._sort_key(row[index] if index < len(row) else '') for row in snapshot.rows]
+        if keys == ascending:
+            order = 'ascending'
+        elif keys == ascending[::-1]:
+            order = 'descending'
+        else:
+            return {'ok': False, 'order': None, 'message': f"column '{label}' is not in sorted order"}
+        return {'ok': True, 'order': order,
+                'message': f"{len(keys)} row(s) sorted {order} by '{label}'"}
+
+    def _column_index(self, label):
+        """Index of a header label (case-insensitive), or None"""
+        label = label.strip().lower()
+        for index, cell in enumerate(self.header):
+            if cell.lower() == label:
+                return index
+        return None
+
+    @staticmethod
+    def _sort_key(value):
+        """Numbers before strings, numbers by value and strings lowercased, like orderBy"""
+        try:
+            return (0, float(value), '')
+        except ValueError:
+            return (1, 0.0, value.lower())
+
+    @staticmethod
+    def _describe(rows, limit=3):
+        """Short text naming a few rows of a Counter"""
+        names = [' '.join(row[:2]) for row in rows.elements()]
+        text = ', '.join(names[:limit])
+        if len(names) > limit:
+            text += f" and {len(names) - limit} more"
+        return text
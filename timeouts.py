@@ -0,0 +1,195 @@
+"""
+Adaptive Timeout Manager
+Keeps a per-step history of successful wait latencies on disk and derives
+each wait's deadline from the observed p99 plus a margin, so hung steps
+fail fast and nothing waits a fixed 10 seconds; a wait that hits its
+deadline doubles it and restarts the step's history
+"""
+
+from collections import deque
+from contextlib import contextmanager
+import json
+import os
+import threading
+import time
+
+from instrumentation import percentile
+
+
+class TimeoutManager:
+    """Per-step wait deadlines learned from historical latencies"""
+
+    def __init__(self, history_file=None, default=10.0, margin_factor=1.5, margin_seconds=0.5,
+                 minimum=0.5, maximum=30.0, min_samples=20, max_samples=500, lock_timeout=30.0):
+        """
+        Args:
+            history_file (str): JSON file holding the latency history (optional)
+            default (float): Seconds used until a step has min_samples observations
+            margin_factor (float): Multiplier applied to the observed p99
+            margin_seconds (float): Seconds added on top of the scaled p99
+            minimum (float): Lower bound for any learned deadline
+            maximum (float): Upper bound for any learned deadline
+            min_samples (int): Observations needed before a deadline is learned
+            max_samples (int): Most recent observations kept per step
+            lock_timeout (float): Seconds after which a leftover history lock is considered stale
+        """
+        self.history_file = history_file
+        self.default = default
+        self.margin_factor = margin_factor
+        self.margin_seconds = margin_seconds
+        self.minimum = minimum
+        self.maximum = maximum
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.lock_timeout = lock_timeout
+        self.history = {}        # step -> deque of seconds
+        self.escalated = {}      # step -> deadline raised after a timeout
+        self._new_samples = {}   # step -> samples recorded since load
+        self._reset_steps = set()
+        self._lock = threading.Lock()
+        if history_file and os.path.exists(history_file):
+            self.history = {step: deque(samples, maxlen=max_samples)
+                            for step, samples in self._read(history_file).items()}
+
+    def timeout(self, step):
+        """
+        Deadline for a wait
+
+        Args:
+            step (str): Step name, e.g. 'SearchDataDrivenTest:wait_for_element'
+
+        Returns:
+            float: Seconds: p99 * margin_factor + margin_seconds, clamped to
+                   [minimum, maximum], or the default without enough history;
+                   never below a deadline raised by record_timeout()
+        """
+        with self._lock:
+            samples = list(self.history.get(step, ()))
+            escalated = self.escalated.get(step, 0.0)
+        if len(samples) < self.min_samples:
+            return max(self.default, escalated)
+        learned = percentile(samples, 99) * self.margin_factor + self.margin_seconds
+        return min(max(learned, self.minimum, escalated), self.maximum)
+
+    def record(self, step, seconds):
+        """
+        Add the latency of a wait that succeeded
+
+        Args:
+            step (str): Step name
+            seconds (float): Time the wait took
+        """
+        with self._lock:
+            samples = self.history.setdefault(step, deque(maxlen=self.max_samples))
+            samples.append(round(seconds, 4))
+            self._new_samples.setdefault(step, []).append(round(seconds, 4))
+            if step in self.escalated and len(samples) >= self.min_samples:
+                # Relearned from latencies seen since the timeout
+                del self.escalated[step]
+
+    def record_timeout(self, step, deadline):
+        """
+        Note that a wait ran into its deadline
+
+        The history evidently no longer fits the step (e.g. it was learned
+        against a faster target), so it is dropped and the deadline doubles,
+        up to maximum, until min_samples new latencies have been recorded.
+
+        Args:
+            step (str): Step name
+            deadline (float): Deadline the wait ran into
+        """
+        with self._lock:
+            self.escalated[step] = min(max(deadline * 2, self.escalated.get(step, 0.0)), self.maximum)
+            self.history[step] = deque(maxlen=self.max_samples)
+            self._new_samples[step] = []
+            self._reset_steps.add(step)
+
+    def save(self):
+        """Append this process's new samples to the history file (other workers may share it)"""
+        if not self.history_file:
+            return
+        with self._lock:
+            new_samples, self._new_samples = self._new_samples, {}
+            reset_steps, self._reset_steps = self._reset_steps, set()
+        if not new_samples:
+            return
+        directory = os.path.dirname(os.path.abspath(self.history_file))
+        os.makedirs(directory, exist_ok=True)
+        # Read-merge-write under the lock so concurrent workers keep each other's samples
+        with self._file_lock():
+            merged = self._read(self.history_file) if os.path.exists(self.history_file) else {}
+            for step, samples in new_samples.items():
+                previous = [] if step in reset_steps else merged.get(step, [])
+                merged[step] = (previous + samples)[-self.max_samples:]
+            temporary = f"{self.history_file}.{os.getpid()}.tmp"
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump(merged, file)
+            os.replace(temporary, self.history_file)
+
+    @contextmanager
+    def _file_lock(self):
+        """Cross-process lock on the history file (a lock file created exclusively)"""
+        lock_path = f"{self.history_file}.lock"
+        while True:
+            try:
+                handle = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > self.lock_timeout:
+                        # Left behind by a worker that crashed mid save
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    continue
+                time.sleep(0.05)
+        try:
+            os.write(handle, str(os.getpid()).encode('ascii'))
+            yield
+        finally:
+            os.close(handle)
+            os.remove(lock_path)
+
+    def describe(self):
+        """
+        Current deadline per step
+
+        Returns:
+            dict: Step name -> (deadline seconds, sample count)
+        """
+        with self._lock:
+            steps = {step: len(samples) for step, samples in self.history.items()}
+        return {step: (self.timeout(step), count) for step, count in sorted(steps.items())}
+
+    @staticmethod
+    def _read(path):
+        """Load a history file, treating a corrupt file as empty"""
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return {step: [float(value) for value in samples] for step, samples in data.items()}
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_timeout_manager(history_file=None, **options):
+    """
+    Get this process's TimeoutManager for a history file
+
+    Args:
+        history_file (str): JSON history file, or None for an in-memory history
+        **options: TimeoutManager arguments used when the manager is created
+
+    Returns:
+        TimeoutManager: Manager for the file
+    """
+    key = os.path.abspath(history_file) if history_file else None
+    with _managers_lock:
+        if key not in _managers:
+            _managers[key] = TimeoutManager(key, **options)
+        return _managers[key]